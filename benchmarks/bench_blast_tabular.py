@@ -0,0 +1,73 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Compare ways of filtering BLAST+ tabular output"""
+
+import random
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from itaxotools.blastax.tabular import iter_blast_columns, iter_blast_records
+from itaxotools.taxi2.handlers import FileHandler
+
+OUTFMT = "6 qseqid sseqid pident bitscore length staxids"
+
+
+def write_table(path: Path, rows: int, queries: int = 10_000):
+    with open(path, "w") as file:
+        for i in range(rows):
+            pident = random.uniform(50, 100)
+            bitscore = random.uniform(10, 500)
+            length = random.randint(20, 600)
+            file.write(f"query_{random.randrange(queries)}\tsubject_{i}\t{pident:.3f}\t{bitscore:.1f}\t{length}\t9606\n")
+
+
+def filter_by_tabfile(path: Path) -> set[str]:
+    """The strategy used before the shared reader: split and convert every row by hand"""
+    ids = set()
+    with FileHandler.Tabfile(path) as file:
+        for line in file:
+            if float(line[2]) >= 90 and float(line[3]) >= 200 and float(line[4]) >= 300:
+                ids.add(line[0])
+    return ids
+
+
+def filter_by_records(path: Path) -> set[str]:
+    ids = set()
+    usecols = ["qseqid", "pident", "bitscore", "length"]
+    for qseqid, pident, bitscore, length in iter_blast_records(path, OUTFMT, usecols):
+        if pident >= 90 and bitscore >= 200 and length >= 300:
+            ids.add(qseqid)
+    return ids
+
+
+def filter_by_columns(path: Path) -> set[str]:
+    ids = set()
+    usecols = ["qseqid", "pident", "bitscore", "length"]
+    for batch in iter_blast_columns(path, OUTFMT, usecols):
+        mask = (batch["pident"] >= 90) & (batch["bitscore"] >= 200) & (batch["length"] >= 300)
+        ids.update(batch["qseqid"][mask])
+    return ids
+
+
+def main():
+    random.seed(0)
+    strategies = [filter_by_tabfile, filter_by_records, filter_by_columns]
+    print(f"{'rows':>10} " + " ".join(f"{strategy.__name__:>20}" for strategy in strategies))
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in [100_000, 1_000_000]:
+            path = Path(tmp) / f"blast_{rows}.tsv"
+            write_table(path, rows)
+            timings = []
+            results = []
+            for strategy in strategies:
+                ts = perf_counter()
+                results.append(strategy(path))
+                timings.append(perf_counter() - ts)
+            assert all(result == results[0] for result in results)
+            print(f"{rows:>10} " + " ".join(f"{timing:>19.3f}s" for timing in timings))
+
+
+if __name__ == "__main__":
+    main()
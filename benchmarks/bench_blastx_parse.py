@@ -0,0 +1,68 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Compare nucleotide lookup strategies used by blastx_parse"""
+
+import random
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from itaxotools.blastax.core import NucleotideIndex
+
+
+def write_nucleotides(path: Path, records: int, length: int = 300) -> list[str]:
+    ids = []
+    with open(path, "w") as file:
+        for i in range(records):
+            id = f"TRINITY_DN{i}_c0_g1_i1 len {length}"
+            seq = "".join(random.choice("ACGT") for _ in range(length))
+            file.write(f">{id}\n{seq}\n")
+            ids.append(id.replace(" ", "_"))
+    return ids
+
+
+def lookup_by_rescanning(path: Path, ids: list[str]) -> int:
+    """The lookup strategy used before indexing: one scan of the file per hit"""
+    found = 0
+    for id in ids:
+        with open(path) as file:
+            for line in file:
+                if id in line.replace(" ", "_"):
+                    file.readline()
+                    found += 1
+    return found
+
+
+def lookup_by_index(path: Path, ids: list[str], in_memory: bool) -> int:
+    index = NucleotideIndex(path, in_memory=in_memory)
+    return sum(index.get(id) is not None for id in ids)
+
+
+def main(hits: int = 200):
+    random.seed(0)
+    print(f"{'records':>8} {'hits':>6} {'rescan (s)':>11} {'memory (s)':>11} {'disk (s)':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for records in [1_000, 5_000, 20_000]:
+            path = Path(tmp) / f"nucleotides_{records}.fas"
+            ids = write_nucleotides(path, records)
+            queries = random.choices(ids, k=hits)
+
+            ts = perf_counter()
+            lookup_by_rescanning(path, queries)
+            rescan = perf_counter() - ts
+
+            ts = perf_counter()
+            lookup_by_index(path, queries, in_memory=True)
+            memory = perf_counter() - ts
+
+            ts = perf_counter()
+            lookup_by_index(path, queries, in_memory=False)
+            disk = perf_counter() - ts
+
+            print(f"{records:>8} {hits:>6} {rescan:>11.3f} {memory:>11.3f} {disk:>9.3f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
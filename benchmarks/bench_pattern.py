@@ -0,0 +1,68 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Compare the tree walking and compiled matchers of fastutils.Pattern"""
+
+import random
+import sys
+from time import perf_counter
+from typing import Any
+
+from itaxotools.blastax.fastutils import Pattern, rePattern
+
+PATTERNS = [
+    '"sample_7"',
+    '"sample_1" or "sample_2" or "sample_3" or "sample_4"',
+    '("lane_1" and "sample_1") or not "ACGTACGT"',
+    '"sample_1" or ("lane_2" and not "sample_2") or "sample_3"',
+]
+
+
+def match_by_walking(pattern: Any, line: str) -> bool:
+    """The matching strategy used before compiling: walk the parsed tree for every line"""
+    if isinstance(pattern, rePattern):
+        return bool(pattern.search(line))
+    if pattern == []:
+        return True
+    elif pattern[0] == "not":
+        return not match_by_walking(pattern[1], line)
+    elif pattern[0] == "and":
+        return all(match_by_walking(subpattern, line) for subpattern in pattern[1:])
+    else:
+        return any(match_by_walking(subpattern, line) for subpattern in pattern[1:])
+
+
+def make_seqids(count: int) -> list[str]:
+    return [
+        f"@read_{i}_lane_{random.randint(1, 4)}_sample_{random.randint(1, 99)} "
+        + "".join(random.choice("ACGT") for _ in range(16))
+        for i in range(count)
+    ]
+
+
+def main(lines: int = 200_000):
+    random.seed(0)
+    seqids = make_seqids(lines)
+    seqids_bytes = [seqid.encode() for seqid in seqids]
+    print(f"{'walk (s)':>9} {'str (s)':>8} {'bytes (s)':>9}  pattern")
+    for text in PATTERNS:
+        pattern = Pattern(text)
+
+        ts = perf_counter()
+        walked = sum(match_by_walking(pattern.pattern, seqid) for seqid in seqids)
+        walk = perf_counter() - ts
+
+        ts = perf_counter()
+        matched = sum(pattern.match(seqid) for seqid in seqids)
+        compiled = perf_counter() - ts
+
+        ts = perf_counter()
+        matched_bytes = sum(pattern.match_bytes(seqid) for seqid in seqids_bytes)
+        compiled_bytes = perf_counter() - ts
+
+        assert walked == matched == matched_bytes
+        print(f"{walk:>9.3f} {compiled:>8.3f} {compiled_bytes:>9.3f}  {text}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
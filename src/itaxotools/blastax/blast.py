@@ -3,10 +3,15 @@ import platform
 import re
 import shlex
 import shutil
+import signal
 import subprocess
 import sys
+import threading
+from collections import deque
 from hashlib import sha256
 from pathlib import Path
+from time import perf_counter, sleep
+from typing import IO, Callable, NamedTuple
 
 from platformdirs import user_config_dir, user_data_dir
 
@@ -125,7 +130,96 @@ def get_blast_version() -> str | None:
         raise Exception("Version number not found in output!")
 
 
-def execute_blast_command(args: list[str], blastdb_path: Path | str | None = None, debug=False):
+class BlastCancelled(Exception):
+    pass
+
+
+class BlastProcessResult(NamedTuple):
+    stdout: bytes | None
+    returncode: int
+    seconds_taken: float
+    peak_rss: int | None
+
+
+def _kill_process_tree(p: subprocess.Popen) -> None:
+    if p.poll() is not None:
+        return
+    if platform.system() == "Windows":
+        subprocess.run(
+            ["taskkill", "/F", "/T", "/PID", str(p.pid)],
+            capture_output=True,
+            creationflags=subprocess.CREATE_NO_WINDOW,
+        )
+    else:
+        try:
+            os.killpg(p.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+
+def _wait_process(p: subprocess.Popen, timeout: float) -> tuple[int | None, int | None]:
+    """Wait up to `timeout` seconds, then return the exit code and peak RSS in bytes if finished"""
+    if not hasattr(os, "wait4"):
+        try:
+            return p.wait(timeout), None
+        except subprocess.TimeoutExpired:
+            return None, None
+
+    deadline = perf_counter() + timeout
+    while True:
+        pid, status, rusage = os.wait4(p.pid, os.WNOHANG)
+        if pid:
+            p.returncode = os.waitstatus_to_exitcode(status)
+            # ru_maxrss is reported in kilobytes, except for macOS where it is in bytes
+            scale = 1 if platform.system() == "Darwin" else 1024
+            return p.returncode, rusage.ru_maxrss * scale
+        if perf_counter() >= deadline:
+            return None, None
+        sleep(0.01)
+
+
+def _pump_stdout(
+    stream: IO[bytes], sink: Callable[[bytes], object], errors: list[BaseException], chunk_size: int = 1024**2
+) -> None:
+    try:
+        while chunk := stream.read1(chunk_size):
+            sink(chunk)
+    except BaseException as e:
+        # stop reading, the caller kills the process and raises the error
+        errors.append(e)
+
+
+def _pump_stderr(stream: IO[bytes], lines: deque[str], handler: Callable[[str], None] | None) -> None:
+    for raw in stream:
+        line = raw.decode("utf-8", errors="replace").rstrip()
+        if not line:
+            continue
+        lines.append(line)
+        if handler is not None:
+            handler(line)
+
+
+def run_blast_process(
+    args: list[str],
+    blastdb_path: Path | str | None = None,
+    stdout_path: Path | str | None = None,
+    stdout_consumer: Callable[[bytes], object] | None = None,
+    stderr_handler: Callable[[str], None] | None = None,
+    cancel_event: threading.Event | None = None,
+    poll_interval: float = 0.1,
+    debug: bool = False,
+) -> BlastProcessResult:
+    """
+    Run a BLAST+ binary without blocking on its pipes.
+
+    Standard output is streamed to `stdout_path` or passed in chunks to
+    `stdout_consumer`, otherwise it is collected and returned. Lines from
+    standard error are forwarded to `stderr_handler` as soon as they arrive.
+    Setting `cancel_event` kills the process tree and raises BlastCancelled.
+    If writing the output or the consumer fails, the process tree is killed
+    and the error is raised here.
+    The result includes the wall time and, where available, the peak RSS.
+    """
     if debug:
         print("Executing BLAST+ with args: ", args)
     kwargs = {}
@@ -133,18 +227,75 @@ def execute_blast_command(args: list[str], blastdb_path: Path | str | None = Non
     blast_env = set_blastdb_path(blast_env, blastdb_path)
     if platform.system() == "Windows":
         kwargs = dict(creationflags=subprocess.CREATE_NO_WINDOW)
-    p = subprocess.Popen(
-        args,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        env=blast_env,
-        **kwargs,
-    )
-    p.wait()
-    stdout, stderr = p.communicate()
-    if p.returncode != 0:
+    else:
+        kwargs = dict(start_new_session=True)
+
+    chunks: list[bytes] = []
+    stdout_file = open(stdout_path, "wb") if stdout_path is not None else None
+    if stdout_file is not None:
+        sink = stdout_file.write
+    elif stdout_consumer is not None:
+        sink = stdout_consumer
+    else:
+        sink = chunks.append
+
+    stderr_lines: deque[str] = deque(maxlen=100)
+    stdout_errors: list[BaseException] = []
+    ts = perf_counter()
+    try:
+        p = subprocess.Popen(
+            args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=blast_env,
+            **kwargs,
+        )
+        readers = [
+            threading.Thread(target=_pump_stdout, args=(p.stdout, sink, stdout_errors), daemon=True),
+            threading.Thread(target=_pump_stderr, args=(p.stderr, stderr_lines, stderr_handler), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+
+        try:
+            while True:
+                if cancel_event is not None and cancel_event.is_set():
+                    _kill_process_tree(p)
+                    raise BlastCancelled(f"{Path(args[0]).stem} was cancelled")
+                if stdout_errors:
+                    raise stdout_errors[0]
+                returncode, peak_rss = _wait_process(p, poll_interval)
+                if returncode is not None:
+                    break
+        except BaseException:
+            _kill_process_tree(p)
+            p.wait()
+            raise
+        finally:
+            for reader in readers:
+                reader.join()
+            p.stdout.close()
+            p.stderr.close()
+        if stdout_errors:
+            raise stdout_errors[0]
+    finally:
+        if stdout_file is not None:
+            stdout_file.close()
+    tf = perf_counter()
+
+    if debug:
+        rss = f"{peak_rss / 1024**2:.1f} MiB" if peak_rss is not None else "unknown"
+        print(f"BLAST+ finished in {tf - ts:.2f}s with peak RSS: {rss}")
+
+    if returncode != 0:
         binary = Path(args[0]).stem
-        lines = stderr.decode("utf-8").strip().splitlines()
-        error = lines[-1] if lines else "silently"
+        error = stderr_lines[-1] if stderr_lines else "silently"
         raise Exception(f"{binary} failed: {error}")
-    return stdout
+
+    stdout = b"".join(chunks) if stdout_file is None and stdout_consumer is None else None
+    return BlastProcessResult(stdout, returncode, tf - ts, peak_rss)
+
+
+def execute_blast_command(args: list[str], blastdb_path: Path | str | None = None, debug=False):
+    result = run_blast_process(args, blastdb_path=blastdb_path, debug=debug)
+    return result.stdout
@@ -0,0 +1,174 @@
+import os
+import shutil
+import tempfile
+from hashlib import sha256
+from pathlib import Path
+
+from platformdirs import user_cache_dir
+
+DEFAULT_CACHE_SIZE = 2 * 1024**3
+
+
+def get_user_cache_path() -> Path:
+    return Path(user_cache_dir(appname="BlasTax", appauthor="iTaxoTools")) / "blast"
+
+
+def hash_file(path: Path | str, block_size: int = 1024**2) -> str:
+    hash = sha256()
+    with open(path, "rb") as file:
+        while block := file.read(block_size):
+            hash.update(block)
+    return hash.hexdigest()
+
+
+def get_database_fingerprint(database_path: Path | str) -> str:
+    """Identify a BLAST database by its reported info and the size and mtime of its files"""
+    from .core import get_database_info
+
+    # BLAST+ accepts a space separated list of databases
+    database_paths = str(database_path).split()
+    if len(database_paths) > 1:
+        fingerprints = [get_database_fingerprint(path) for path in database_paths]
+        return sha256(" ".join(fingerprints).encode()).hexdigest()
+
+    database_path = Path(database_path)
+    # volume paths depend on where the database was staged, so leave them out
+    info = get_database_info(str(database_path)).split(b"Volumes:")[0]
+    hash = sha256()
+    hash.update(info)
+    for path in sorted(database_path.parent.glob(f"{database_path.name}.*")):
+        stat = path.stat()
+        suffix = path.name[len(database_path.name) :]
+        hash.update(f"{suffix}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return hash.hexdigest()
+
+
+def get_taxdb_fingerprint(blastdb_path: Path | str | None) -> str:
+    if blastdb_path is None:
+        return ""
+    hash = sha256()
+    for path in sorted(Path(blastdb_path).glob("taxdb.*")):
+        stat = path.stat()
+        hash.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return hash.hexdigest()
+
+
+class FileCache:
+    """
+    Content-addressed on-disk cache for output files.
+
+    Subclasses define how entries are keyed. The total size of the cache is bounded,
+    and the least recently used entries are evicted first.
+    Access times are tracked through file mtimes.
+    """
+
+    suffix = ".out"
+
+    def __init__(self, path: Path | None = None, max_size: int = DEFAULT_CACHE_SIZE):
+        self.path = Path(path) if path is not None else get_user_cache_path()
+        self.max_size = max_size
+
+    def get(self, key: str, output_path: Path | str) -> bool:
+        """Copy the cached output to `output_path` and return True on a hit"""
+        entry = self.path / f"{key}{self.suffix}"
+        try:
+            shutil.copyfile(entry, output_path)
+            os.utime(entry)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def put(self, key: str, output_path: Path | str) -> None:
+        """Store a copy of `output_path` under `key`, then evict stale entries.
+        Files larger than the whole cache are not stored, as they would evict everything else."""
+        if os.path.getsize(output_path) > self.max_size:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        entry = self.path / f"{key}{self.suffix}"
+        with tempfile.NamedTemporaryFile(dir=self.path, suffix=".tmp", delete=False) as file:
+            with open(output_path, "rb") as source:
+                shutil.copyfileobj(source, file)
+        os.replace(file.name, entry)
+        self.evict()
+
+    def evict(self) -> None:
+        entries = []
+        for entry in self.path.glob(f"*{self.suffix}"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry))
+        entries.sort()
+
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, entry in entries:
+            if size <= self.max_size:
+                break
+            try:
+                entry.unlink()
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+
+    def clear(self) -> None:
+        for entry in self.path.glob(f"*{self.suffix}"):
+            entry.unlink(missing_ok=True)
+
+
+class BlastCache(FileCache):
+    """
+    Cache for BLAST+ output files.
+
+    Entries are keyed by a hash of everything that affects the search results:
+    the query contents, the database fingerprint, the binary and its options,
+    as well as how the query was sharded between BLAST+ processes.
+    """
+
+    def key(
+        self,
+        blast_binary: str,
+        query_path: Path | str,
+        database_path: Path | str,
+        evalue: str,
+        outfmt: str,
+        other: str,
+        blastdb_path: Path | str | None = None,
+        shards: int = 1,
+        shard_by: str = "records",
+    ) -> str:
+        parts = [
+            blast_binary,
+            hash_file(query_path),
+            get_database_fingerprint(database_path),
+            str(evalue),
+            " ".join(outfmt.split()),
+            " ".join(other.split()),
+            get_taxdb_fingerprint(blastdb_path),
+            f"{shards} {shard_by}" if shards > 1 else "",
+        ]
+        return sha256("\0".join(parts).encode()).hexdigest()
+
+
+class QueryCache(FileCache):
+    """Cache for normalized query files, keyed by the contents of the original query"""
+
+    suffix = ".fasta"
+
+    def __init__(self, path: Path | None = None, max_size: int = DEFAULT_CACHE_SIZE):
+        super().__init__(path if path is not None else get_user_cache_path().with_name("queries"), max_size)
+
+    def key(self, query_path: Path | str) -> str:
+        return sha256(f"query\0{hash_file(query_path)}".encode()).hexdigest()
+
+
+class AccessionCache(FileCache):
+    """Cache for the accession lists of BLAST databases, keyed by the database fingerprint"""
+
+    suffix = ".txt"
+
+    def __init__(self, path: Path | None = None, max_size: int = DEFAULT_CACHE_SIZE):
+        super().__init__(path if path is not None else get_user_cache_path().with_name("accessions"), max_size)
+
+    def key(self, database_path: Path | str) -> str:
+        return sha256(f"accessions\0{get_database_fingerprint(database_path)}".encode()).hexdigest()
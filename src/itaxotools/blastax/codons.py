@@ -1,7 +1,21 @@
-from itertools import islice
+import re
+from functools import lru_cache
+from itertools import islice, product
 from typing import Literal
 
+import numpy as np
 from Bio.Data import CodonTable
+from Bio.Data.CodonTable import TranslationError
+from Bio.Seq import translate as translate_codon
+
+NUCLEOTIDE_CODES = "ACGTURYSWKMBDHVNX"
+
+GAP_OR_RESIDUE_RUNS = re.compile(r"-+|[^-]+")
+
+COMPLEMENT_TABLE = str.maketrans(
+    "ACGTURYSWKMBDHVNacgturyswkmbdhvn",
+    "TGCAAYRSWMKVHDBNtgcaayrswmkvhdbn",
+)
 
 
 def batched(sequence: str, n: int = 3):
@@ -28,15 +42,197 @@ def get_stop_codons_for_table(id: int) -> list[str]:
     return CodonTable.unambiguous_dna_by_id[id].stop_codons
 
 
+def get_codon_table_id(table: int | str) -> int:
+    """Accepts a codon table id or name, as Biopython does."""
+    try:
+        return int(table)
+    except ValueError:
+        return CodonTable.unambiguous_dna_by_name[table].id
+
+
+def reverse_complement(sequence: str) -> str:
+    return sequence.translate(COMPLEMENT_TABLE)[::-1]
+
+
+class CodonTranslator:
+    """
+    Translates nucleotide sequences through a precomputed codon lookup table.
+
+    Every codon over the accepted alphabet is translated once with Biopython
+    when the translator is created. Sequences are then translated in bulk by
+    encoding their bytes and indexing the lookup table with NumPy.
+    Codons that Biopython cannot translate become the unknown symbol,
+    or raise a TranslationError as in Biopython when translating strictly.
+    If a gap character is given, codons of three gaps are translated to a gap,
+    as for Biopython sequences.
+    """
+
+    def __init__(
+        self,
+        table: int | str = 1,
+        stop_symbol: str = "*",
+        unknown_symbol: str = "X",
+        ambiguous: bool = True,
+        ignore_case: bool = True,
+        gap: str | None = None,
+    ):
+        table_id = get_codon_table_id(table)
+        alphabet = NUCLEOTIDE_CODES if ambiguous else "ACGT"
+        symbols = alphabet + (gap or "")
+        invalid = len(symbols)
+        radix = len(symbols) + 1
+
+        encoding = bytearray([invalid] * 256)
+        for code, nucleotide in enumerate(symbols):
+            encoding[ord(nucleotide)] = code
+            if ignore_case:
+                encoding[ord(nucleotide.lower())] = code
+
+        lookup = bytearray(unknown_symbol.encode("ascii") * radix**3)
+        valid = np.zeros(radix**3, dtype=bool)
+        for codes in product(range(len(alphabet)), repeat=3):
+            codon = "".join(alphabet[code] for code in codes)
+            try:
+                amino = translate_codon(codon, table=table_id, stop_symbol=stop_symbol)
+            except TranslationError:
+                continue
+            index = (codes[0] * radix + codes[1]) * radix + codes[2]
+            lookup[index] = ord(amino)
+            valid[index] = True
+
+        if gap:
+            code = symbols.index(gap)
+            index = (code * radix + code) * radix + code
+            lookup[index] = ord(gap)
+            valid[index] = True
+
+        self.table_id = table_id
+        self._radix = radix
+        self._encoding = bytes(encoding)
+        self._lookup = np.frombuffer(bytes(lookup), dtype=np.uint8)
+        self._valid = valid
+
+    def translate(self, sequence: str, strict: bool = False) -> str:
+        """
+        Translate all complete codons, ignoring any trailing partial codon.
+        If strict, raise a TranslationError on the first codon that cannot be translated,
+        such as a codon with gaps, instead of using the unknown symbol.
+        """
+        count = len(sequence) // 3
+        if not count:
+            return ""
+        data = sequence.encode("ascii", "replace").translate(self._encoding)
+        codes = np.frombuffer(data, dtype=np.uint8, count=count * 3).reshape(count, 3).astype(np.uint16)
+        indices = (codes[:, 0] * self._radix + codes[:, 1]) * self._radix + codes[:, 2]
+        if strict:
+            valid = self._valid[indices]
+            if not valid.all():
+                pos = int(valid.argmin()) * 3
+                codon = sequence[pos : pos + 3].upper()
+                raise TranslationError(f"Codon '{codon}' is invalid")
+        return self._lookup[indices].tobytes().decode("ascii")
+
+    def translate_frames(self, sequence: str) -> list[str]:
+        """Translate frames 1, 2, 3 of the forward strand and 4, 5, 6 of the reverse complement."""
+        reverse = reverse_complement(sequence)
+        forward_frames = [self.translate(sequence[offset:]) for offset in range(3)]
+        reverse_frames = [self.translate(reverse[offset:]) for offset in range(3)]
+        return forward_frames + reverse_frames
+
+
+@lru_cache(maxsize=None)
+def get_codon_translator(
+    table: int | str = 1,
+    stop_symbol: str = "*",
+    unknown_symbol: str = "X",
+    ambiguous: bool = True,
+    ignore_case: bool = True,
+    gap: str | None = None,
+) -> CodonTranslator:
+    return CodonTranslator(table, stop_symbol, unknown_symbol, ambiguous, ignore_case, gap)
+
+
+class StopCodonScanner:
+    """
+    Finds the stop codons of a codon table in all reading frames at once.
+
+    Sequences are encoded as bytes, so that every overlapping 3-mer becomes
+    an index into a precomputed table of stop codons. Matching is case-insensitive
+    and codons with any character other than ACGT never match.
+    """
+
+    def __init__(self, table: int | str = 1):
+        table_id = get_codon_table_id(table)
+        alphabet = "ACGT"
+        invalid = len(alphabet)
+        radix = len(alphabet) + 1
+
+        encoding = bytearray([invalid] * 256)
+        for code, nucleotide in enumerate(alphabet):
+            encoding[ord(nucleotide)] = code
+            encoding[ord(nucleotide.lower())] = code
+
+        stops = np.zeros(radix**3, dtype=bool)
+        for codon in get_stop_codons_for_table(table_id):
+            codes = [alphabet.index(nucleotide) for nucleotide in codon]
+            stops[(codes[0] * radix + codes[1]) * radix + codes[2]] = True
+
+        self.table_id = table_id
+        self._radix = radix
+        self._encoding = bytes(encoding)
+        self._stops = stops
+
+    def _encode(self, sequence: str) -> np.ndarray:
+        data = sequence.encode("ascii", "replace").translate(self._encoding)
+        return np.frombuffer(data, dtype=np.uint8)
+
+    def _is_stop(self, first: np.ndarray, second: np.ndarray, third: np.ndarray) -> np.ndarray:
+        return self._stops[(first * self._radix + second) * self._radix + third]
+
+    def find_stop_positions(self, sequence: str) -> np.ndarray:
+        """Returns the start positions of all stop codons, in any reading frame."""
+        codes = self._encode(sequence)
+        if len(codes) < 3:
+            return np.zeros(0, dtype=np.intp)
+        return np.flatnonzero(self._is_stop(codes[:-2], codes[1:-1], codes[2:]))
+
+    def find_first_stop(self, sequence: str, reading_frame: Literal[1, 2, 3] = 1) -> int:
+        """Returns the position of the first stop codon in the given reading frame, or -1 if none were found."""
+        offset = reading_frame - 1
+        codes = self._encode(sequence)[offset:]
+        count = len(codes) // 3
+        if not count:
+            return -1
+        codons = codes[: count * 3].reshape(count, 3)
+        is_stop = self._is_stop(codons[:, 0], codons[:, 1], codons[:, 2])
+        pos = int(is_stop.argmax())
+        if not is_stop[pos]:
+            return -1
+        return pos * 3 + offset
+
+    def count_stops(self, sequence: str) -> tuple[tuple[int, int, int], tuple[int, int, int]]:
+        """
+        Returns the number of stop codons for reading frames 1, 2, and 3 respectively,
+        as well as the first stop codon position for each frame.
+        """
+        positions = self.find_stop_positions(sequence)
+        frames = positions % 3
+        counts = np.bincount(frames, minlength=3)
+        firsts = [-1, -1, -1]
+        for frame in range(3):
+            if counts[frame]:
+                firsts[frame] = int(positions[(frames == frame).argmax()])
+        return tuple(int(count) for count in counts), tuple(firsts)
+
+
+@lru_cache(maxsize=None)
+def get_stop_codon_scanner(table: int | str = 1) -> StopCodonScanner:
+    return StopCodonScanner(table)
+
+
 def find_stop_codon_in_sequence(sequence: str, table_id: int, reading_frame: Literal[1, 2, 3] = 1) -> int:
     """Returns the position of the first encountered stop codon, or -1 if none were found."""
-    sequence = sequence.upper()
-    sequence = sequence[reading_frame - 1 :]
-    stop_codons = get_stop_codons_for_table(table_id)
-    for pos, batch in enumerate(batched(sequence)):
-        if batch in stop_codons:
-            return pos * 3 + reading_frame - 1
-    return -1
+    return get_stop_codon_scanner(table_id).find_first_stop(sequence, reading_frame)
 
 
 def count_stop_codons_for_all_frames_in_sequence(
@@ -46,19 +242,28 @@ def count_stop_codons_for_all_frames_in_sequence(
     Returns the number of stop codons detected for reading frames 1, 2, and 3 respectively,
     as well as the first encountered stop codon position for each frame.
     """
-    sequence = sequence.upper()
-    stop_codons = get_stop_codons_for_table(table_id)
-    triplets = zip(sequence, sequence[1:], sequence[2:])
-    codons = ("".join(nucleotides) for nucleotides in triplets)
-    counts = [0, 0, 0]
-    positions = [-1, -1, -1]
-    for pos, codon in enumerate(codons):
-        if codon in stop_codons:
-            frame = pos % 3
-            counts[frame] += 1
-            if positions[frame] == -1:
-                positions[frame] = pos
-    return tuple(counts), tuple(positions)
+    return get_stop_codon_scanner(table_id).count_stops(sequence)
+
+
+def back_translate(aligned: str, nucleotides: str) -> str:
+    """
+    Returns the nucleotide alignment for an aligned amino acid sequence, by replacing
+    each residue with the next codon of 'nucleotides' and each gap with a gap codon.
+    Runs of residues are copied as a single slice of codons.
+    """
+    parts = []
+    position = 0
+    for run in GAP_OR_RESIDUE_RUNS.finditer(aligned):
+        length = run.end() - run.start()
+        if aligned[run.start()] == "-":
+            parts.append("---" * length)
+            continue
+        end = position + length * 3
+        if end - 3 >= len(nucleotides):
+            raise ValueError("Aligned sequence has more residues than the nucleotide sequence has codons")
+        parts.append(nucleotides[position:end])
+        position = end
+    return "".join(parts)
 
 
 def are_counts_ambiguous(counts: tuple[int, int, int]) -> bool:
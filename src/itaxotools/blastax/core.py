@@ -1,16 +1,25 @@
 import re
 import shutil
 import string
+from bisect import bisect_left
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Literal
+from tempfile import TemporaryDirectory
+from threading import Event
+from typing import Callable, Literal
+
+import numpy as np
 
 from itaxotools.taxi2.handlers import FileHandler
 from itaxotools.taxi2.sequences import Sequence, SequenceHandler
 
-from .blast import command_to_args, execute_blast_command, get_blast_binary
-from .utils import complement, string_trimmer, translate
+from .blast import command_to_args, execute_blast_command, get_blast_binary, run_blast_process
+from .cache import AccessionCache, BlastCache
+from .fastutils import fasta_iter_chunks
+from .tabular import iter_batch_rows, iter_blast_columns, iter_blast_records, parse_outfmt_columns
+from .utils import complement, get_string_trimmer, translate
 
 
 def make_database(
@@ -52,6 +61,8 @@ def run_blast_export(
     blastdb_path: str | None = None,
     outfmt: str = ">%a\n%s\n",
     debug: bool = False,
+    stdout_consumer: Callable[[bytes], object] | None = None,
+    cancel_event: Event | None = None,
 ):
     args = [
         get_blast_binary("blastdbcmd"),
@@ -67,7 +78,14 @@ def run_blast_export(
             "-out",
             output_path,
         ]
-    return execute_blast_command(args, blastdb_path=blastdb_path, debug=debug)
+    result = run_blast_process(
+        args,
+        blastdb_path=blastdb_path,
+        stdout_consumer=stdout_consumer,
+        cancel_event=cancel_event,
+        debug=debug,
+    )
+    return result.stdout
 
 
 def get_database_info(
@@ -83,6 +101,64 @@ def get_database_info(
     return execute_blast_command(args, debug=debug)
 
 
+# Formats whose outputs can be concatenated as they are. Format 7 is left out,
+# as it would repeat its comment header blocks once per shard.
+SHARDABLE_BLAST_OUTFMTS = ["6", "10"]
+
+
+def split_query_shards(
+    query_path: Path | str,
+    output_dir: Path | str,
+    shards: int,
+    shard_by: Literal["records", "residues"] = "records",
+) -> list[Path]:
+    """
+    Split a FASTA query into up to `shards` consecutive chunks of similar size,
+    balanced either by record count or by residue count. Input order is kept,
+    so concatenating the chunks gives back the original file. Chunks that would
+    end up empty are not written. Returns the paths of all written chunks.
+    """
+    query_path = Path(query_path)
+    output_dir = Path(output_dir)
+
+    with open(query_path) as file:
+        if shard_by == "records":
+            weights = [1 for _ in fasta_iter_chunks(file)]
+        elif shard_by == "residues":
+            weights = [max(1, sum(len(line.strip()) for line in chunk[1:])) for chunk in fasta_iter_chunks(file)]
+        else:
+            raise ValueError(f"Unknown shard mode: {shard_by}")
+
+    total = sum(weights)
+    shards = min(shards, len(weights))
+    paths: list[Path] = []
+    if not shards:
+        return paths
+
+    current = -1
+    outfile = None
+    cumulative = 0
+    try:
+        with open(query_path) as file:
+            for weight, chunk in zip(weights, fasta_iter_chunks(file)):
+                index = cumulative * shards // total
+                cumulative += weight
+                if index != current:
+                    if outfile is not None:
+                        outfile.close()
+                    current = index
+                    path = output_dir / f"{query_path.stem}_shard_{index}.fasta"
+                    outfile = open(path, "w")
+                    paths.append(path)
+                outfile.writelines(chunk)
+                if not chunk[-1].endswith("\n"):
+                    outfile.write("\n")
+    finally:
+        if outfile is not None:
+            outfile.close()
+    return paths
+
+
 def run_blast(
     blast_binary: str,
     query_path: Path | str,
@@ -94,7 +170,49 @@ def run_blast(
     other: str,
     blastdb_path: Path | str | None = None,
     debug: bool = False,
+    shards: int = 1,
+    shard_by: Literal["records", "residues"] = "records",
+    cache: BlastCache | None = None,
 ):
+    if cache is not None:
+        key = cache.key(blast_binary, query_path, database_path, evalue, outfmt, other, blastdb_path, shards, shard_by)
+        if cache.get(key, output_path):
+            if debug:
+                print(f"Reusing cached BLAST+ results for: {query_path}")
+            return b""
+        stdout = run_blast(
+            blast_binary=blast_binary,
+            query_path=query_path,
+            database_path=database_path,
+            output_path=output_path,
+            evalue=evalue,
+            num_threads=num_threads,
+            outfmt=outfmt,
+            other=other,
+            blastdb_path=blastdb_path,
+            debug=debug,
+            shards=shards,
+            shard_by=shard_by,
+        )
+        cache.put(key, output_path)
+        return stdout
+    # only tabular outputs without comments are sharded, other formats run as a single process
+    format = outfmt.split()[0] if outfmt.split() else ""
+    if shards > 1 and format in SHARDABLE_BLAST_OUTFMTS:
+        return _run_blast_sharded(
+            blast_binary=blast_binary,
+            query_path=query_path,
+            database_path=database_path,
+            output_path=output_path,
+            evalue=evalue,
+            num_threads=num_threads,
+            outfmt=outfmt,
+            other=other,
+            blastdb_path=blastdb_path,
+            debug=debug,
+            shards=shards,
+            shard_by=shard_by,
+        )
     command = (
         f"'{get_blast_binary(blast_binary)}' -query '{str(query_path)}' -db '{str(database_path)}' -out '{str(output_path)}' "
         f"-evalue {evalue} -num_threads {num_threads} -outfmt '{outfmt}' {other}"
@@ -103,6 +221,56 @@ def run_blast(
     return execute_blast_command(args, blastdb_path=blastdb_path, debug=debug)
 
 
+def _run_blast_sharded(
+    query_path: Path | str,
+    output_path: Path | str,
+    num_threads: int,
+    outfmt: str,
+    shards: int,
+    shard_by: Literal["records", "residues"],
+    **kwargs,
+):
+    """
+    Split the query and run one BLAST+ process per shard against the same database.
+    The threads are divided between the processes, and the tabular outputs
+    are concatenated in input order. Called by run_blast for SHARDABLE_BLAST_OUTFMTS only.
+    """
+    output_path = Path(output_path)
+    with TemporaryDirectory(dir=output_path.parent, prefix="shards_") as shard_dir:
+        query_shards = split_query_shards(query_path, shard_dir, shards, shard_by)
+        if len(query_shards) <= 1:
+            return run_blast(
+                query_path=query_path,
+                output_path=output_path,
+                num_threads=num_threads,
+                outfmt=outfmt,
+                **kwargs,
+            )
+
+        output_shards = [path.with_suffix(".out") for path in query_shards]
+        threads_per_shard = max(1, num_threads // len(query_shards))
+        with ThreadPoolExecutor(max_workers=len(query_shards)) as executor:
+            futures = [
+                executor.submit(
+                    run_blast,
+                    query_path=query_shard,
+                    output_path=output_shard,
+                    num_threads=threads_per_shard,
+                    outfmt=outfmt,
+                    **kwargs,
+                )
+                for query_shard, output_shard in zip(query_shards, output_shards)
+            ]
+            stdout = b"".join(future.result() for future in futures)
+
+        with open(output_path, "wb") as outfile:
+            for output_shard in output_shards:
+                with open(output_shard, "rb") as infile:
+                    shutil.copyfileobj(infile, outfile)
+
+    return stdout
+
+
 def run_blast_align(
     blast_binary: str,
     query_path: Path | str,
@@ -110,6 +278,9 @@ def run_blast_align(
     output_path: Path | str,
     evalue: str,
     num_threads: int,
+    shards: int = 1,
+    shard_by: Literal["records", "residues"] = "records",
+    cache: BlastCache | None = None,
 ):
     return run_blast(
         blast_binary=blast_binary,
@@ -120,6 +291,9 @@ def run_blast_align(
         num_threads=num_threads,
         outfmt="6 length pident qseqid sseqid sseq qframe sframe",
         other="",
+        shards=shards,
+        shard_by=shard_by,
+        cache=cache,
     )
 
 
@@ -130,6 +304,9 @@ def run_blast_decont(
     output_path: Path | str,
     evalue: str,
     num_threads: int,
+    shards: int = 1,
+    shard_by: Literal["records", "residues"] = "records",
+    cache: BlastCache | None = None,
 ):
     return run_blast(
         blast_binary=blast_binary,
@@ -140,9 +317,207 @@ def run_blast_decont(
         num_threads=num_threads,
         outfmt="6 qseqid sseqid pident bitscore length",
         other="",
+        shards=shards,
+        shard_by=shard_by,
+        cache=cache,
     )
 
 
+def get_database_accessions(
+    database_path: Path | str, debug: bool = False, cache: AccessionCache | None = None
+) -> set[str]:
+    """
+    Get the accessions of every sequence in the database. Dumping them takes a while
+    for large databases, so if a cache is given they are only read once per database.
+    """
+    if cache is None:
+        output = run_blast_export(str(database_path), None, outfmt="%a", debug=debug)
+        return set(output.decode("utf-8").split())
+
+    key = cache.key(database_path)
+    with TemporaryDirectory(prefix="accessions_") as accessions_dir:
+        accessions_path = Path(accessions_dir) / "accessions.txt"
+        if not cache.get(key, accessions_path):
+            accessions_path.write_bytes(run_blast_export(str(database_path), None, outfmt="%a", debug=debug))
+            cache.put(key, accessions_path)
+        return set(accessions_path.read_text().split())
+
+
+def run_blast_decont_combined(
+    blast_binary: str,
+    query_path: Path | str,
+    ingroup_database_path: Path | str,
+    outgroup_database_path: Path | str,
+    ingroup_accessions: set[str],
+    blasted_ingroup_path: Path | str,
+    blasted_outgroup_path: Path | str,
+    evalue: str,
+    num_threads: int,
+    shards: int = 1,
+    shard_by: Literal["records", "residues"] = "records",
+    cache: BlastCache | None = None,
+):
+    """
+    Search the ingroup and outgroup databases with a single BLAST+ run,
+    then split the hits into the same tables that run_blast_decont would write.
+    The subject accession of each hit tells which database it came from,
+    so the two databases must not share any accessions.
+    E-values are computed against the size of both databases combined.
+    BLAST+ also keeps at most max_target_seqs hits per query (500 by default)
+    over both databases, so for queries with many matches, the hits of one
+    database may crowd out those of the other.
+    """
+    blasted_ingroup_path = Path(blasted_ingroup_path)
+    blasted_combined_path = blasted_ingroup_path.with_name(blasted_ingroup_path.stem + "_combined.tsv")
+    columns = DECONT_OUTFMT_COLUMNS + ["sacc"]
+
+    try:
+        run_blast(
+            blast_binary=blast_binary,
+            query_path=query_path,
+            database_path=f"{ingroup_database_path} {outgroup_database_path}",
+            output_path=blasted_combined_path,
+            evalue=evalue,
+            num_threads=num_threads,
+            outfmt="6 " + " ".join(columns),
+            other="",
+            shards=shards,
+            shard_by=shard_by,
+            cache=cache,
+        )
+
+        with (
+            open(blasted_combined_path) as combined_file,
+            open(blasted_ingroup_path, "w") as ingroup_file,
+            open(blasted_outgroup_path, "w") as outgroup_file,
+        ):
+            for line in combined_file:
+                row, _, sacc = line.rstrip("\n").rpartition("\t")
+                if not row:
+                    continue
+                file = ingroup_file if sacc in ingroup_accessions else outgroup_file
+                file.write(row + "\n")
+    finally:
+        blasted_combined_path.unlink(missing_ok=True)
+
+
+class NucleotideIndex:
+    """Lookup of FASTA sequences by identifier, built in a single pass.
+
+    Identifiers have their spaces replaced by underscores, matching how
+    they appear in BLAST+ output. A lookup first tries the full identifier,
+    then its first word, then falls back to the last identifier that starts
+    with the key, since BLAST+ may truncate long subject identifiers.
+
+    When in_memory is False, only file offsets are kept and sequences are
+    read back from disk on demand, for files that do not fit in memory.
+    """
+
+    def __init__(self, path: Path | str, in_memory: bool = True):
+        self._path = Path(path)
+        self._in_memory = in_memory
+        self._entries: dict[str, int] = {}
+        self._words: dict[str, int] = {}
+        self._records: list[str | tuple[int, int]] = []
+        self._build()
+        self._sorted_ids = sorted(self._entries)
+
+    def _build(self):
+        with open(self._path, "rb") as file:
+            offset = 0
+            start = None
+            lines: list[bytes] = []
+            for line in file:
+                if line.startswith(b">"):
+                    if start is not None:
+                        self._add_record(lines, start, offset)
+                    self._add_header(line)
+                    start = offset + len(line)
+                    lines = []
+                elif start is not None and self._in_memory:
+                    lines.append(line)
+                offset += len(line)
+            if start is not None:
+                self._add_record(lines, start, offset)
+
+    def _add_header(self, line: bytes):
+        header = line[1:].decode(errors="replace").strip("\r\n")
+        index = len(self._records)
+        self._entries[header.replace(" ", "_")] = index
+        words = header.split()
+        if words:
+            self._words[words[0]] = index
+
+    def _add_record(self, lines: list[bytes], start: int, end: int):
+        if self._in_memory:
+            self._records.append(self._join_lines(lines))
+        else:
+            self._records.append((start, end))
+
+    @staticmethod
+    def _join_lines(lines: list[bytes]) -> str:
+        return "".join(line.decode(errors="replace").strip("\r\n") for line in lines) + "\n"
+
+    def _get_record(self, index: int) -> str:
+        record = self._records[index]
+        if self._in_memory:
+            return record
+        start, end = record
+        with open(self._path, "rb") as file:
+            file.seek(start)
+            return self._join_lines(file.read(end - start).splitlines())
+
+    def _find_index(self, id: str) -> int | None:
+        if id in self._entries:
+            return self._entries[id]
+        if id in self._words:
+            return self._words[id]
+        found = None
+        position = bisect_left(self._sorted_ids, id)
+        while position < len(self._sorted_ids) and self._sorted_ids[position].startswith(id):
+            index = self._entries[self._sorted_ids[position]]
+            if found is None or index > found:
+                found = index
+            position += 1
+        return found
+
+    def get(self, id: str) -> str | None:
+        """Returns the sequence for the given identifier, with a trailing newline."""
+        if not id:
+            return None
+        index = self._find_index(id)
+        if index is None:
+            return None
+        return self._get_record(index)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+def _get_header_pident(header: str) -> float:
+    return float(header.split("_")[-1].rstrip())
+
+
+def _keep_best_blastx_hit(
+    hits: dict[tuple[str, str, str], tuple[str, str]],
+    key: tuple[str, str, str],
+    header: str,
+    sequence: str,
+):
+    """Keep the longest sequence per key, or the highest pident for equal lengths.
+    Replaced hits are moved to the end, preserving the order they were accepted in."""
+    existing = hits.get(key)
+    if existing is not None:
+        old_header, old_sequence = existing
+        if len(sequence) < len(old_sequence):
+            return
+        if len(sequence) == len(old_sequence):
+            if _get_header_pident(header) <= _get_header_pident(old_header):
+                return
+        del hits[key]
+    hits[key] = (header, sequence)
+
+
 def blastx_parse(
     input_path: Path | str,
     blast_result_path: Path | str,
@@ -153,174 +528,84 @@ def blastx_parse(
     pident_arg: float = 70.0,
     length_arg: int = 100,
     user_spec_name: str = None,
+    in_memory_index: bool = True,
+    debug: bool = False,
 ):
-    infile = open(input_path, "r")
-    infile2 = open(extra_nucleotide_path, "r")
-    resultfile = open(blast_result_path, "r")
-    outfile = open(output_path, "w")
+    nucleotides = NucleotideIndex(extra_nucleotide_path, in_memory=in_memory_index)
 
     # modify the user_spec_name
     if user_spec_name is not None:
         if not user_spec_name.startswith(">"):
             user_spec_name = ">" + user_spec_name
 
-    # Query-Sequences into output file
-    for line in infile:
-        outfile.write(line)
-
-    sseqid_list = []
-    for line in resultfile:
-        splitti = line.split("\t")
-        sseqid_list.append(splitti[3])
-    name_list = []
-    for eintrag in sseqid_list:
-        # elem=eintrag.split('|')
-        # print(elem[2])
-        name_list.append(eintrag)
-    ns_list = []
-    labels = []
-    for nam in name_list:
-        nam_split = nam.split("_")
-        if nam_split[0] in ns_list:
-            labels.append(nam_split[0])
-        ns_list.append(nam_split[0])
-
-    resultfile.close()
-    resultfile = open(blast_result_path, "r")
-
-    infile.close()
-    infile = open(input_path, "a")
-    # de-duplication
-    dict_53_added = {}
-    dict_35_added = {}
-    # good hits are appended to the query sequences
-    for line in resultfile:
-        #        print("BLAST OUTPUT LINE: ", line)
-        splitti = line.split("\t")
-        pident = splitti[1]
-        #        print("SPLITTI 3: ", splitti[3])
-        if (float(pident) >= pident_arg) and (int(splitti[0]) >= length_arg):
-            infile2 = open(extra_nucleotide_path, "r")
-            for line2 in infile2:
-                # Added. needed to be checked
-                line2 = line2.replace(" ", "_")
-                #                print("ADDITIONAL FILE LINE: ", line2)
-                if splitti[3] in line2:
-                    seq = infile2.readline()
-                    print(seq)
-            infile2.close()
-            #            outfile.write('>' + db_name + '_' + splitti[3] + '_' + 'pident' + '_' + pident[:-2] + '\n')
-            #            outfile.write(seq + '\n')
-            if (len(seq) % 3) != 0:
+    # hits are keyed by database, subject and strand: "53" is forward, "35" is reverse
+    hits: dict[tuple, tuple[str, str]] = {}
+
+    def add_hit(strand: str, sseqid: str, header: str, sequence: str):
+        if all_matches:
+            # include all hitted sequences, unique by header
+            hits[(database_name, sseqid, strand, header)] = (header, sequence)
+        else:
+            _keep_best_blastx_hit(hits, (database_name, sseqid, strand), header, sequence)
+
+    with open(blast_result_path, "r") as resultfile:
+        for line in resultfile:
+            splitti = line.split("\t")
+            pident = splitti[1]
+            sseqid = splitti[3]
+            sseq = splitti[4]
+            if not ((float(pident) >= pident_arg) and (int(splitti[0]) >= length_arg)):
+                continue
+
+            seq = nucleotides.get(sseqid)
+            if seq is None:
+                if debug:
+                    print("missing", sseqid)
+                continue
+            if debug and (len(seq) % 3) != 0:
                 print("len", len(seq), seq)
+
             erg = translate(seq)
             r53 = erg[0:3]
             r35 = erg[3:]
-            print("auftei", erg)
-            print("auftei", r53, r35)
+            if debug:
+                print("auftei", r53, r35)
+
+            header = f">{database_name}_{sseqid}_pident_{pident[:-2]}\n"
+            fragment_length = len(sseq) * 3
 
             for orient in r53:
-                index = orient.find(splitti[4])
-                print("ori", len(orient), len(splitti[4]), orient, index, splitti[4])
+                index = orient.find(sseq)
+                if debug:
+                    print("ori", len(orient), len(sseq), orient, index, sseq)
                 if index >= 0:
-                    # Determine the offset based on index
                     offset = index * 3 if index == 0 else (index * 3) + 1
+                    add_hit("53", sseqid, header, seq[offset : fragment_length + offset] + "\n")
 
-                    # Prepare unique keys for dict_53_added
-                    shorter_pident = f">{database_name}_{splitti[3]}_pident_"
-                    head_pident53_added = f">{database_name}_{splitti[3]}_pident_{pident[:-2]}\n"
-                    head_seq53_added = seq[offset : ((len(splitti[4]) * 3) + offset)] + "\n"
-                    any_key_starting_with_prefix = next(
-                        (key for key in dict_53_added if key.startswith(shorter_pident)),
-                        None,
-                    )
-                    #                    print("HEADER SHORT: ", shorter_pident)
-                    #                    print("HEADER: ", head_pident53_added)
-                    #                    print("SEQUENCE: ", head_seq53_added)
-                    #                    print("HEADER FROM DICT: ", any_key_starting_with_prefix)
-                    if all_matches:
-                        # Include all hitted sequences in dict_53_added
-                        dict_53_added[head_pident53_added] = head_seq53_added
-                    else:
-                        if any_key_starting_with_prefix:
-                            existing_seq_length = len(dict_53_added[any_key_starting_with_prefix])
-                            new_seq_length = len(head_seq53_added)
-                            #                        print("SEQ LENGTHS: ", existing_seq_length, "\t", new_seq_length)
-                            if new_seq_length > existing_seq_length:
-                                dict_53_added.pop(any_key_starting_with_prefix, None)
-                                dict_53_added[head_pident53_added] = head_seq53_added
-                            elif new_seq_length == existing_seq_length:
-                                old_pident53 = float(any_key_starting_with_prefix.split("_")[-1].rstrip())
-                                new_pident53 = float(head_pident53_added.split("_")[-1].rstrip())
-                                #                            print("OLD PIDENT: ", old_pident53)
-                                #                            print("NEW PIDENT: ", new_pident53)
-                                if new_pident53 > old_pident53:
-                                    dict_53_added.pop(any_key_starting_with_prefix, None)
-                                    dict_53_added[head_pident53_added] = head_seq53_added
-                            else:
-                                continue
-                        else:
-                            dict_53_added[head_pident53_added] = head_seq53_added
-
+            compiseq = None
             for orient in r35:
-                index = orient.find(splitti[4])
-                print("ori", len(orient), len(splitti[4]), orient, index, splitti[4])
-                if index > 0:
-                    offset = (index * 3) + 1
-                elif index == 0:
-                    offset = index * 3
+                index = orient.find(sseq)
+                if debug:
+                    print("ori", len(orient), len(sseq), orient, index, sseq)
                 if index >= 0:
-                    compiseq = complement(seq)
-                    fragment = compiseq[offset : ((len(splitti[4]) * 3) + offset)]
-                    revcompseq = fragment[::-1]
-                    # deduplication
-                    shorter_pident = f">{database_name}_{splitti[3]}_pident_"
-                    head_pident35_added = f">{database_name}_{splitti[3]}_pident_{pident[:-2]}\n"
-                    head_seq35_added = revcompseq + "\n"
-                    any_key_starting_with_prefix = next(
-                        (key for key in dict_35_added if key.startswith(shorter_pident)),
-                        None,
-                    )
-                    if all_matches:
-                        # Include all hitted sequences in dict_35_added
-                        dict_35_added[head_pident35_added] = head_seq35_added
-                    else:
-                        if any_key_starting_with_prefix:
-                            existing_seq_length = len(dict_35_added[any_key_starting_with_prefix])
-                            new_seq_length = len(head_seq35_added)
-                            #                        print("SEQ LENGTHS: ", existing_seq_length, "\t", new_seq_length)
-                            if new_seq_length > existing_seq_length:
-                                dict_35_added.pop(any_key_starting_with_prefix, None)
-                                #                            print("The sequence was removed: ", removed_value)
-                                dict_35_added[head_pident35_added] = head_seq35_added
-                            elif new_seq_length == existing_seq_length:
-                                old_pident35 = float(any_key_starting_with_prefix.split("_")[-1].rstrip())
-                                new_pident35 = float(head_pident35_added.split("_")[-1].rstrip())
-                                #                            print("OLD PIDENT: ", old_pident53)
-                                #                            print("NEW PIDENT: ", new_pident53)
-                                if new_pident35 > old_pident35:
-                                    dict_35_added.pop(any_key_starting_with_prefix, None)
-                                    #                                print("The sequence was removed: ", removed_value)
-                                    dict_35_added[head_pident35_added] = head_seq35_added
-                            else:
-                                continue
-                        else:
-                            dict_35_added[head_pident35_added] = head_seq35_added
-
-    for header, sequence in dict_53_added.items():
-        if user_spec_name is not None:
-            outfile.write(f"{user_spec_name}\n{sequence}")
-        else:
-            outfile.write(f"{header}{sequence}")
-    for header, sequence in dict_35_added.items():
-        if user_spec_name is not None:
-            outfile.write(f"{user_spec_name}\n{sequence}")
-        else:
-            outfile.write(f"{header}{sequence}")
-
-    infile.close()
-    outfile.close()
-    resultfile.close()
+                    offset = index * 3 if index == 0 else (index * 3) + 1
+                    if compiseq is None:
+                        compiseq = complement(seq)
+                    fragment = compiseq[offset : fragment_length + offset]
+                    add_hit("35", sseqid, header, fragment[::-1] + "\n")
+
+    with open(output_path, "w") as outfile:
+        # Query-Sequences into output file
+        with open(input_path, "r") as infile:
+            shutil.copyfileobj(infile, outfile)
+        for strand in ["53", "35"]:
+            for key, (header, sequence) in hits.items():
+                if key[2] != strand:
+                    continue
+                if user_spec_name is not None:
+                    outfile.write(f"{user_spec_name}\n{sequence}")
+                else:
+                    outfile.write(f"{header}{sequence}")
 
 
 def blast_parse(
@@ -415,6 +700,11 @@ def blast_parse(
     blastfile.close()
 
 
+MUSEO_OUTFMT_COLUMNS = ["qseqid", "sseqid", "sacc", "stitle", "pident", "qseq"]
+TAXO_OUTFMT_COLUMNS = ["qseqid", "length", "pident", "staxids", "sscinames"]
+DECONT_OUTFMT_COLUMNS = ["qseqid", "sseqid", "pident", "bitscore", "length"]
+
+
 def museoscript(
     blast_path: Path | str,
     output_path: Path | str,
@@ -425,34 +715,25 @@ def museoscript(
     sequences: dict[str, dict[str, str]] = defaultdict(dict)
     pidents: dict[str, dict[str, str]] = defaultdict(dict)
 
-    with FileHandler.Tabfile(blast_path) as blast_file:
-        for line in blast_file:
-            query_id = line[0]
-            reference_id = line[1]
-            pident = float(line[4])
-            sequence = line[5]
-            if pident >= pident_threshold:
-                if deduplicate and sequences[query_id]:
-                    old_sequence = next(iter(sequences[query_id].values()))
-                    old_pident = next(iter(pidents[query_id].values()))
-                    if len(sequence) < len(old_sequence):
+    usecols = ["qseqid", "sseqid", "pident", "qseq"]
+    for batch in iter_blast_columns(blast_path, MUSEO_OUTFMT_COLUMNS, usecols):
+        mask = batch["pident"] >= pident_threshold
+        for query_id, reference_id, pident, sequence in iter_batch_rows(batch, mask):
+            if deduplicate and sequences[query_id]:
+                old_sequence = next(iter(sequences[query_id].values()))
+                old_pident = next(iter(pidents[query_id].values()))
+                if len(sequence) < len(old_sequence):
+                    continue
+                if len(sequence) == len(old_sequence):
+                    if pident <= old_pident:
                         continue
-                    if len(sequence) == len(old_sequence):
-                        if pident <= old_pident:
-                            continue
-                    sequences[query_id] = {}
-                    pidents[query_id] = {}
-                sequences[query_id][reference_id] = sequence
-                pidents[query_id][reference_id] = pident
+                sequences[query_id] = {}
+                pidents[query_id] = {}
+            sequences[query_id][reference_id] = sequence
+            pidents[query_id][reference_id] = pident
 
     if original_reads_path is not None:
-        with SequenceHandler.Fasta(original_reads_path) as original_file:
-            for original in original_file:
-                for query_id in sequences:
-                    if original.id.startswith(query_id):
-                        for reference_id in sequences[query_id]:
-                            sequences[query_id][reference_id] = original.seq
-                        break
+        _recover_original_reads(sequences, original_reads_path)
 
     with SequenceHandler.Fasta(output_path, "w", line_width=0) as museo_file:
         for query_id in sequences:
@@ -463,6 +744,37 @@ def museoscript(
                 museo_file.write(Sequence(header, sequence))
 
 
+def _recover_original_reads(sequences: dict[str, dict[str, str]], original_reads_path: Path):
+    """
+    Replace the aligned part of each hit with the full original read.
+    BLAST+ reports the first word of each header as the query id, so reads are
+    looked up by that word first. Ids that BLAST+ truncated are matched as prefixes
+    of the read header instead, trying one prefix per distinct query id length.
+    Exact matches take precedence, and reading stops once all hits have one.
+    """
+    pending = set(sequences)
+    lengths = sorted({len(query_id) for query_id in sequences}, reverse=True)
+
+    def assign(query_id: str, seq: str):
+        for reference_id in sequences[query_id]:
+            sequences[query_id][reference_id] = seq
+
+    with SequenceHandler.Fasta(original_reads_path) as original_file:
+        for original in original_file:
+            if not pending:
+                break
+            words = original.id.split(maxsplit=1)
+            if words and words[0] in pending:
+                assign(words[0], original.seq)
+                pending.discard(words[0])
+                continue
+            for length in lengths:
+                query_id = original.id[:length]
+                if query_id in pending:
+                    assign(query_id, original.seq)
+                    break
+
+
 def assign_taxonomy(
     query_path: Path | str,
     blast_path: Path | str,
@@ -470,32 +782,88 @@ def assign_taxonomy(
     min_length: int = 0,
     min_pident: float = 0.0,
 ):
-    lengths: dict[str, int] = defaultdict(lambda: 0)
-    pidents: dict[str, float] = defaultdict(lambda: 0.0)
-    staxids: dict[str, str] = defaultdict(lambda: "N/A")
-    sscinames: dict[str, str] = defaultdict(lambda: "N/A")
-
-    with FileHandler.Tabfile(blast_path) as blast_file:
-        for line in blast_file:
-            query_id = line[0]
-            length = int(line[1])
-            pident = float(line[2])
-            staxid = line[3]
-            ssciname = line[4]
-            if length < min_length or pident < min_pident:
-                continue
-            if length > lengths[query_id] and pident > pidents[query_id]:
-                lengths[query_id] = length
-                pidents[query_id] = pident
-                staxids[query_id] = staxid
-                sscinames[query_id] = ssciname
+    write_taxonomy_outputs(
+        blast_path=blast_path,
+        outfmt_columns=TAXO_OUTFMT_COLUMNS,
+        query_path=query_path,
+        output_path=output_path,
+        min_length=min_length,
+        min_pident=min_pident,
+    )
 
-    with SequenceHandler.Fasta(query_path) as query_file:
-        with SequenceHandler.Fasta(output_path, "w", line_width=0) as output_file:
-            for sequence in query_file:
-                seqid = sequence.id
-                new_seqid = f"{seqid} [pident={pidents[seqid]}] [taxid={staxids[seqid]}] [organism={sscinames[seqid]}]"
-                output_file.write(Sequence(new_seqid, sequence.seq))
+
+def write_taxonomy_outputs(
+    blast_path: Path | str,
+    outfmt_columns: list[str],
+    query_path: Path | str | None = None,
+    output_path: Path | str | None = None,
+    best_hits_report_path: Path | str | None = None,
+    organism_report_path: Path | str | None = None,
+    min_length: int = 0,
+    min_pident: float = 0.0,
+):
+    """
+    Stream the BLAST table once and write all requested outputs:
+    the query sequences tagged with their best taxonomy match,
+    a report of the best hit per query and a report of matched organisms.
+    """
+    columns = parse_outfmt_columns(outfmt_columns)
+    qseqid_col = columns.index("qseqid")
+    write_taxa = output_path is not None or organism_report_path is not None
+    if write_taxa:
+        staxids_col = columns.index("staxids")
+        sscinames_col = columns.index("sscinames")
+
+    best_taxa: dict[str, tuple[int, float, str, str]] = {}
+    best_hits: dict[str, tuple[int, float, list[str]]] = {}
+
+    for batch in iter_blast_columns(blast_path, columns, raw=True):
+        lengths = batch["length"].astype(np.int64)
+        pidents = batch["pident"].astype(np.float64)
+        survivors = np.flatnonzero((lengths >= min_length) & (pidents >= min_pident)).tolist()
+        lengths = lengths.tolist()
+        pidents = pidents.tolist()
+        fields = [array.tolist() for array in batch.values()]
+        query_ids = fields[qseqid_col]
+
+        for index in survivors:
+            query_id = query_ids[index]
+            length = lengths[index]
+            pident = pidents[index]
+            if write_taxa:
+                best_length, best_pident, _, _ = best_taxa.get(query_id, (0, 0.0, None, None))
+                if length > best_length and pident > best_pident:
+                    best_taxa[query_id] = (length, pident, fields[staxids_col][index], fields[sscinames_col][index])
+            if best_hits_report_path is not None:
+                prev = best_hits.get(query_id)
+                if prev is None or (length > prev[0] and pident > prev[1]):
+                    best_hits[query_id] = (length, pident, [column[index] for column in fields])
+
+    if output_path is not None:
+        with SequenceHandler.Fasta(query_path) as query_file:
+            with SequenceHandler.Fasta(output_path, "w", line_width=0) as output_file:
+                for sequence in query_file:
+                    seqid = sequence.id
+                    _, pident, staxid, ssciname = best_taxa.get(seqid, (0, 0.0, "N/A", "N/A"))
+                    new_seqid = f"{seqid} [pident={pident}] [taxid={staxid}] [organism={ssciname}]"
+                    output_file.write(Sequence(new_seqid, sequence.seq))
+
+    if best_hits_report_path is not None:
+        with FileHandler.Tabfile(best_hits_report_path, "w", columns=outfmt_columns) as output_file:
+            for _, _, row in best_hits.values():
+                output_file.write(row)
+
+    if organism_report_path is not None:
+        counts: dict[str, int] = defaultdict(lambda: 0)
+        taxid_names: dict[str, str] = {}
+        for _, _, taxid, name in best_taxa.values():
+            counts[taxid] += 1
+            taxid_names[taxid] = name
+
+        columns = ["Nmatches", "taxID", "organism"]
+        with FileHandler.Tabfile(organism_report_path, "w", columns=columns) as output_file:
+            for taxid, count in sorted(counts.items(), key=lambda x: x[1], reverse=True):
+                output_file.write([str(count), taxid, taxid_names[taxid]])
 
 
 def taxid_map_from_fasta(
@@ -540,26 +908,13 @@ def write_best_hits_report(
     min_length: int = 0,
     min_pident: float = 0.0,
 ):
-    qseqid_col = outfmt_columns.index("qseqid")
-    length_col = outfmt_columns.index("length")
-    pident_col = outfmt_columns.index("pident")
-
-    best_hits: dict[str, list[str]] = {}
-
-    with FileHandler.Tabfile(blast_path) as blast_file:
-        for line in blast_file:
-            query_id = line[qseqid_col]
-            length = int(line[length_col])
-            pident = float(line[pident_col])
-            if length < min_length or pident < min_pident:
-                continue
-            prev = best_hits.get(query_id)
-            if prev is None or (length > int(prev[length_col]) and pident > float(prev[pident_col])):
-                best_hits[query_id] = line
-
-    with FileHandler.Tabfile(report_path, "w", columns=outfmt_columns) as output_file:
-        for line in best_hits.values():
-            output_file.write(line)
+    write_taxonomy_outputs(
+        blast_path=blast_path,
+        outfmt_columns=outfmt_columns,
+        best_hits_report_path=report_path,
+        min_length=min_length,
+        min_pident=min_pident,
+    )
 
 
 def write_organism_report(
@@ -569,40 +924,13 @@ def write_organism_report(
     min_length: int = 0,
     min_pident: float = 0.0,
 ):
-    qseqid_col = outfmt_columns.index("qseqid")
-    length_col = outfmt_columns.index("length")
-    pident_col = outfmt_columns.index("pident")
-    staxids_col = outfmt_columns.index("staxids")
-    sscinames_col = outfmt_columns.index("sscinames")
-
-    best_taxids: dict[str, str] = {}
-    best_names: dict[str, str] = {}
-    best_lengths: dict[str, int] = defaultdict(lambda: 0)
-    best_pidents: dict[str, float] = defaultdict(lambda: 0.0)
-
-    with FileHandler.Tabfile(blast_path) as blast_file:
-        for line in blast_file:
-            query_id = line[qseqid_col]
-            length = int(line[length_col])
-            pident = float(line[pident_col])
-            if length < min_length or pident < min_pident:
-                continue
-            if length > best_lengths[query_id] and pident > best_pidents[query_id]:
-                best_lengths[query_id] = length
-                best_pidents[query_id] = pident
-                best_taxids[query_id] = line[staxids_col]
-                best_names[query_id] = line[sscinames_col]
-
-    counts: dict[str, int] = defaultdict(lambda: 0)
-    taxid_names: dict[str, str] = {}
-    for query_id, taxid in best_taxids.items():
-        counts[taxid] += 1
-        taxid_names[taxid] = best_names[query_id]
-
-    columns = ["Nmatches", "taxID", "organism"]
-    with FileHandler.Tabfile(report_path, "w", columns=columns) as output_file:
-        for taxid, count in sorted(counts.items(), key=lambda x: x[1], reverse=True):
-            output_file.write([str(count), taxid, taxid_names[taxid]])
+    write_taxonomy_outputs(
+        blast_path=blast_path,
+        outfmt_columns=outfmt_columns,
+        organism_report_path=report_path,
+        min_length=min_length,
+        min_pident=min_pident,
+    )
 
 
 def _get_decont_hits_dict(
@@ -610,12 +938,10 @@ def _get_decont_hits_dict(
     column: int,
 ) -> dict[str, float]:
     hits: dict[str, float] = {}
-    with FileHandler.Tabfile(path) as file:
-        for item in file:
-            id = item[0]
-            value = float(item[column])
-            if id not in hits or hits[id] < value:
-                hits[id] = value
+    usecols = ["qseqid", DECONT_OUTFMT_COLUMNS[column]]
+    for id, value in iter_blast_records(path, DECONT_OUTFMT_COLUMNS, usecols):
+        if id not in hits or hits[id] < value:
+            hits[id] = value
     return hits
 
 
@@ -842,8 +1168,31 @@ def fasta_name_modifier(
     if fixaliseparator:
         idtrans |= str.maketrans("@", "|")
 
+    trimmer = get_string_trimmer(
+        trim=trim,
+        add=add,
+        replace=replace,
+        sanitize=sanitize,
+        trimpos=trimposition,
+        trimmaxchar=trimmaxchar,
+        auto=renameauto,
+        letters_and_numbers=letters_and_numbers,
+        direc=direc,
+        addstring=addstring,
+        findstring=findstring,
+        replacestring=replacestring,
+    )
+
     counter = 1
-    sequence = ""
+    sequence: list[str] = []
+
+    def write_sequence():
+        chunks = "".join(sequence)
+        if seqtrans:
+            chunks = chunks.translate(seqtrans)
+        outfile.write(chunks)
+        outfile.write("\n")
+        sequence.clear()
 
     with open(input_name, "r", encoding="utf-8", errors="surrogateescape") as file:
         with open(output_name, "w", encoding="utf-8") as outfile:
@@ -851,37 +1200,19 @@ def fasta_name_modifier(
                 line = line.strip("\r\n")
                 if not line:
                     continue
-                elif line.startswith(";") or line.startswith("#"):
+                elif line[0] == ";" or line[0] == "#":
                     # ignore comment lines and ALI headers
                     continue
                 elif ">" in line:
                     if sequence:
-                        sequence = sequence.translate(seqtrans)
-                        outfile.write(sequence + "\n")
-                        sequence = ""
-                    identifier = string_trimmer(
-                        komm_zeile=line,
-                        counter=counter,
-                        trim=trim,
-                        add=add,
-                        replace=replace,
-                        sanitize=sanitize,
-                        trimpos=trimposition,
-                        trimmaxchar=trimmaxchar,
-                        auto=renameauto,
-                        letters_and_numbers=letters_and_numbers,
-                        direc=direc,
-                        addstring=addstring,
-                        findstring=findstring,
-                        replacestring=replacestring,
-                    )
-                    identifier = identifier.translate(idtrans)
-                    outfile.write(identifier + "\n")
+                        write_sequence()
+                    identifier = trimmer(line, counter)
+                    if idtrans:
+                        identifier = identifier.translate(idtrans)
+                    outfile.write(identifier)
+                    outfile.write("\n")
                     counter += 1
                 else:
-                    sequence += line
+                    sequence.append(line)
             if sequence:
-                sequence = sequence.translate(seqtrans)
-                outfile.write(sequence + "\n")
-
-    outfile.close()
+                write_sequence()
@@ -1,17 +1,19 @@
 #!/usr/bin/env python3
 
 import argparse
-import gzip
 import os
 import sys
 import warnings
-from typing import Callable, Iterable, Iterator, Optional, Set, TextIO, Union, cast
+from typing import BinaryIO, Callable, Iterable, Iterator, List, Optional, Set, TextIO, Union, cast
 
 from .fastutils import (
+    READER_BLOCK_SIZE,
     Pattern,
+    copy_file_range,
     ext_gz,
     fasta_iter,
     fastq_iter,
+    open_gzip,
     parse_pattern_optional,
 )
 
@@ -19,6 +21,8 @@ from .fastutils import (
 fasta_exts = {".fas", ".fasta"}
 # extensions of the fastq files
 fastq_exts = {".fq", ".fastq"}
+# number of lines collected by the filters before writing them at once
+write_batch_lines = 1 << 16
 
 
 def fastmerge(
@@ -38,14 +42,22 @@ def fastmerge(
         if seqid_pattern or sequence_pattern:
             if ".fas" in file_types:
                 fastmerge_fasta_filter(
-                    file_list, parse_pattern_optional(seqid_pattern), parse_pattern_optional(sequence_pattern), output
+                    file_list,
+                    parse_pattern_optional(seqid_pattern),
+                    parse_pattern_optional(sequence_pattern),
+                    output,
+                    progress_callback,
                 )
             else:
                 fastmerge_fastq_filter(
-                    file_list, parse_pattern_optional(seqid_pattern), parse_pattern_optional(sequence_pattern), output
+                    file_list,
+                    parse_pattern_optional(seqid_pattern),
+                    parse_pattern_optional(sequence_pattern),
+                    output,
+                    progress_callback,
                 )
         else:
-            fastmerge_type(file_list, file_types, output)
+            fastmerge_type(file_list, file_types, output, progress_callback)
 
 
 def list_files(file_list: Iterable[str]) -> Iterator[Union[str, os.DirEntry]]:
@@ -62,6 +74,62 @@ def list_files(file_list: Iterable[str]) -> Iterator[Union[str, os.DirEntry]]:
             yield filename
 
 
+def open_text(entry: Union[str, os.DirEntry]) -> TextIO:
+    """
+    Opens the file as archive or text file
+    """
+    if os.path.splitext(entry)[1] == ".gz":
+        return cast(TextIO, open_gzip(entry, mode="rt", errors="replace"))
+    return open(entry, errors="replace")
+
+
+def copy_whole_file(entry: Union[str, os.DirEntry], output: TextIO) -> None:
+    """
+    Copies the contents of the file to the output as they are, extracting gzip archives.
+    Bytes are copied directly to the binary buffer of the output when it has one.
+    A newline is added if the file doesn't end with one.
+    """
+    buffer = cast(Optional[BinaryIO], getattr(output, "buffer", None))
+    if buffer is None:
+        with open_text(entry) as file:
+            last = ""
+            while block := file.read(READER_BLOCK_SIZE):
+                output.write(block)
+                last = block[-1]
+        if last and last != "\n":
+            output.write("\n")
+        return
+
+    output.flush()
+    if os.path.splitext(entry)[1] == ".gz":
+        with open_gzip(entry, mode="rb") as file:
+            last = b""
+            while block := file.read(READER_BLOCK_SIZE):
+                buffer.write(block)
+                last = block[-1:]
+    else:
+        with open(entry, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            last = b""
+            if size:
+                file.seek(size - 1)
+                last = file.read(1)
+                copy_file_range(file, buffer, 0, size)
+    if last and last != b"\n":
+        buffer.write(b"\n")
+    buffer.flush()
+
+
+def write_lines(output: TextIO, lines: List[str]) -> None:
+    """
+    Writes the batch of lines to the output at once, then clears it
+    """
+    if lines:
+        lines.append("")
+        output.write("\n".join(lines))
+        lines.clear()
+
+
 def fastmerge_pure(
     file_list: Iterable[str], output: TextIO, progress_callback: Callable[[str, int, int], None] = None
 ) -> None:
@@ -71,15 +139,8 @@ def fastmerge_pure(
     for i, entry in enumerate(list_files(file_list)):
         if progress_callback:
             progress_callback(entry, i, len(file_list))
-        # open the file as archive or text file
-        if os.path.splitext(entry)[1] == ".gz":
-            file = cast(TextIO, gzip.open(entry, mode="rt", errors="replace"))
-        else:
-            file = open(entry, errors="replace")
-        # copy the lines to the output
-        with file:
-            for line in file:
-                print(line.rstrip(), file=output)
+        # copy the file to the output
+        copy_whole_file(entry, output)
 
 
 def fastmerge_type(
@@ -97,15 +158,8 @@ def fastmerge_type(
         # skip the files of the wrong type
         if ext_gz(entry) not in file_types:
             continue
-        # open the file as archive or text file
-        if os.path.splitext(entry)[1] == ".gz":
-            file = cast(TextIO, gzip.open(entry, mode="rt", errors="replace"))
-        else:
-            file = open(entry, errors="replace")
-        # copy the lines to the output
-        with file:
-            for line in file:
-                print(line.rstrip(), file=output)
+        # copy the file to the output
+        copy_whole_file(entry, output)
 
 
 def fastmerge_fasta_filter(
@@ -126,11 +180,8 @@ def fastmerge_fasta_filter(
         if ext_gz(entry) not in fasta_exts:
             continue
         # copy the lines to the output
-        if os.path.splitext(entry)[1] == ".gz":
-            file = cast(TextIO, gzip.open(entry, mode="rt", errors="replace"))
-        else:
-            file = open(entry, errors="replace")
-        with file:
+        lines: List[str] = []
+        with open_text(entry) as file:
             # warn about the line breaks
             line_breaks_warned = False
             for seqid, sequence in fasta_iter(file):
@@ -148,9 +199,11 @@ def fastmerge_fasta_filter(
                     if not any(map(sequence_pattern.match, sequence)):
                         continue
                 # copy the lines into the output
-                print(seqid.rstrip(), file=output)
-                for chunk in sequence:
-                    print(chunk.rstrip(), file=output)
+                lines.append(seqid.rstrip())
+                lines.extend(chunk.rstrip() for chunk in sequence)
+                if len(lines) >= write_batch_lines:
+                    write_lines(output, lines)
+        write_lines(output, lines)
 
 
 def fastmerge_fastq_filter(
@@ -171,11 +224,8 @@ def fastmerge_fastq_filter(
         if ext_gz(entry) not in fastq_exts:
             continue
         # copy the lines to the output
-        if os.path.splitext(entry)[1] == ".gz":
-            file = cast(TextIO, gzip.open(entry, mode="rt", errors="replace"))
-        else:
-            file = open(entry, errors="replace")
-        with file:
+        lines: List[str] = []
+        with open_text(entry) as file:
             for seqid, sequence, quality_score_seqid, quality_score in fastq_iter(file):
                 # skip sequences that don't match the seqid pattern
                 if seqid_pattern:
@@ -185,10 +235,13 @@ def fastmerge_fastq_filter(
                 if sequence_pattern:
                     if not sequence_pattern.match(sequence):
                         continue
-                print(seqid.rstrip(), file=output)
-                print(sequence.rstrip(), file=output)
-                print(quality_score_seqid.rstrip(), file=output)
-                print(quality_score.rstrip(), file=output)
+                lines.append(seqid.rstrip())
+                lines.append(sequence.rstrip())
+                lines.append(quality_score_seqid.rstrip())
+                lines.append(quality_score.rstrip())
+                if len(lines) >= write_batch_lines:
+                    write_lines(output, lines)
+        write_lines(output, lines)
 
 
 if __name__ == "__main__":
@@ -1,20 +1,25 @@
 #!/usr/bin/env python3
 
 import argparse
-import gzip
+import mmap
 import os
 import sys
 import warnings
-from typing import BinaryIO, Iterator, List, Optional, TextIO, cast
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Iterator, List, Optional, TextIO, Tuple, cast
 
 from .fastutils import (
     Pattern,
+    compress_file_range,
+    copy_file_range,
     fasta_iter,
     fasta_iter_chunks,
     fastq_iter,
     fastq_iter_chunks,
     make_template,
+    open_gzip,
     parse_pattern_optional,
+    template_filename,
     template_files,
 )
 
@@ -69,6 +74,126 @@ def write_maxsize(chunks: Iterator[List[str]], maxsize: int, compressed: bool, o
         pass
 
 
+# formats that write_maxsize_binary knows how to find record boundaries for
+BINARY_SPLIT_FORMATS = {"fasta", "fastq", "text"}
+
+# block size used when counting lines of a memory map
+LINE_COUNT_BLOCK_SIZE = 1 << 24
+
+
+def find_fasta_boundary(data: mmap.mmap, start: int, end: int) -> Tuple[int, int]:
+    """
+    Returns the last and the first position after 'start' where a FASTA record begins,
+    looking for the last one up to 'end'. Positions are -1 when not found.
+    """
+    last = data.rfind(b"\n>", start, end + 1)
+    if last >= 0:
+        return last + 1, -1
+    first = data.find(b"\n>", start)
+    return -1, (first + 1 if first >= 0 else -1)
+
+
+def find_line_boundary(data: mmap.mmap, start: int, end: int) -> Tuple[int, int]:
+    """
+    Returns the last and the first position after 'start' where a line begins,
+    looking for the last one up to 'end'. Positions are -1 when not found.
+    """
+    last = data.rfind(b"\n", start, end)
+    if last >= 0:
+        return last + 1, -1
+    first = data.find(b"\n", start)
+    return -1, (first + 1 if first >= 0 else -1)
+
+
+def find_fastq_boundary(data: mmap.mmap, start: int, end: int) -> Tuple[int, int]:
+    """
+    Returns the last and the first position after 'start' where a FastQ record begins,
+    looking for the last one up to 'end'. Positions are -1 when not found.
+    Records are groups of 4 lines, so 'start' must be the beginning of a record.
+    """
+    lines = 0
+    for block in range(start, end, LINE_COUNT_BLOCK_SIZE):
+        lines += data[block : min(block + LINE_COUNT_BLOCK_SIZE, end)].count(b"\n")
+    if lines >= 4:
+        # skip back over the lines of the incomplete record
+        position = end
+        for _ in range(lines % 4 + 1):
+            position = data.rfind(b"\n", start, position)
+        return position + 1, -1
+    position = start - 1
+    for _ in range(4):
+        position = data.find(b"\n", position + 1)
+        if position < 0:
+            return -1, -1
+    return -1, position + 1
+
+
+def iter_maxsize_ranges(data: mmap.mmap, file_format: str, maxsize: int) -> Iterator[Tuple[int, int]]:
+    """
+    Yields the byte ranges of the memory mapped input that go in each output file.
+    Each range contains whole records and is no bigger than maxsize,
+    unless it consists of a single record that is bigger than maxsize.
+    """
+    find_boundary = dict(
+        fasta=find_fasta_boundary,
+        fastq=find_fastq_boundary,
+        text=find_line_boundary,
+    )[file_format]
+    size = len(data)
+    start = 0
+    if file_format == "fasta" and data[:1] != b">":
+        # skip anything before the first record, or everything if there is none
+        start = data.find(b"\n>") + 1 or size
+    while start < size:
+        if size - start <= maxsize:
+            yield start, size
+            return
+        last, first = find_boundary(data, start, start + maxsize)
+        end = last if last > start else first
+        if end < 0:
+            end = size
+        yield start, end
+        start = end
+
+
+def write_maxsize_binary(
+    infile_path: str, file_format: str, maxsize: int, compressed: bool, output_template: str
+) -> None:
+    """
+    Splits the file to the files based on the output_template, each file will be no bigger than maxsize.
+    Records are kept whole, like in write_maxsize, but the input is never decoded:
+    record boundaries are located on a memory map and the byte ranges are copied as they are.
+    If 'compressed', the files are compressed with gzip independently on a thread pool,
+    which runs in parallel since zlib releases the GIL, even from daemonic worker processes.
+    """
+    with open(infile_path, "rb") as infile:
+        ranges: List[Tuple[int, int]] = []
+        if os.fstat(infile.fileno()).st_size:
+            with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                ranges = list(iter_maxsize_ranges(data, file_format, maxsize))
+        # the first file is always created, even if empty
+        ranges = ranges or [(0, 0)]
+        filenames = [template_filename(output_template, index) for index in range(len(ranges))]
+
+        if not compressed:
+            for filename, (start, end) in zip(filenames, ranges):
+                with open(filename, "wb") as outfile:
+                    copy_file_range(infile, outfile, start, end - start)
+            return
+
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        compress_file_range(infile_path, start, end - start, filenames[0])
+        return
+    with ThreadPoolExecutor(max_workers=min(len(ranges), os.cpu_count() or 1)) as executor:
+        futures = [
+            executor.submit(compress_file_range, infile_path, start, end - start, filename)
+            for filename, (start, end) in zip(filenames, ranges)
+        ]
+        for future in futures:
+            future.result()
+
+
 def fastsplit(
     file_format: str,
     split_n: Optional[int],
@@ -82,17 +207,27 @@ def fastsplit(
     if not infile_path:
         # raise error, if there is no input file
         raise ValueError("No input file")
+    # prepare a valid output template
+    if not outfile_template:
+        outfile_template = make_template(infile_path)
+    elif "#" not in outfile_template:
+        outfile_template = make_template(outfile_template)
+    if split_n and not maxsize:
+        # split by number of files
+        # get the size of the input
+        size = os.stat(infile_path).st_size
+        # if split_n == 6, size == 42 gives maxsize == 7, size == 43 gives maxsize == 8, size 48 gives maxsize 8
+        maxsize = max(1, (size - 1 + split_n) // split_n)
+    if maxsize and file_format in BINARY_SPLIT_FORMATS and not infile_path.endswith(".gz"):
+        # split by maximum size without decoding
+        write_maxsize_binary(infile_path, file_format, maxsize, compressed, outfile_template)
+        return
     if infile_path.endswith(".gz"):
-        infile = cast(TextIO, gzip.open(infile_path, mode="rt", errors="replace"))
+        infile = cast(TextIO, open_gzip(infile_path, mode="rt", errors="replace"))
     else:
         infile = open(infile_path, errors="replace")
     with infile:
-        # prepare a valid output template
-        if not outfile_template:
-            outfile_template = make_template(infile_path)
-        elif "#" not in outfile_template:
-            outfile_template = make_template(outfile_template)
-        if maxsize or split_n:
+        if maxsize:
             # initialize the input file reader
             if file_format == "fasta":
                 chunks = fasta_iter_chunks(infile)
@@ -109,14 +244,6 @@ def fastsplit(
             # split by maximum size
             assert chunks is not None
             write_maxsize(chunks, maxsize, compressed, outfile_template)
-        elif split_n:
-            # split by number of files
-            # get the size of the input
-            size = os.stat(infile_path).st_size
-            # if split_n == 6, size == 42 gives maxsize == 7, size == 43 gives maxsize == 8, size 48 gives maxsize 8
-            maxsize = (size - 1 + split_n) // split_n
-            assert chunks is not None
-            write_maxsize(chunks, maxsize, compressed, outfile_template)
         elif seqid_pattern or sequence_pattern:
             # split by patterns
             if file_format == "fasta":
@@ -153,7 +280,7 @@ def fastsplit_fasta_filter(
     if compressed:
 
         def opener(name: str) -> TextIO:
-            return cast(TextIO, gzip.open(name, mode="wt", errors="replace"))
+            return cast(TextIO, open_gzip(name, mode="wt", errors="replace"))
     else:
 
         def opener(name: str) -> TextIO:
@@ -186,6 +313,9 @@ def fastsplit_fasta_filter(
         output.write(seqid)
         for chunk in sequence:
             output.write(chunk)
+    # close the files
+    accepted_file.close()
+    rejected_file.close()
 
 
 def fastsplit_fastq_filter(
@@ -202,7 +332,7 @@ def fastsplit_fastq_filter(
     if compressed:
 
         def opener(name: str) -> TextIO:
-            return cast(TextIO, gzip.open(name, mode="wt", errors="replace"))
+            return cast(TextIO, open_gzip(name, mode="wt", errors="replace"))
     else:
 
         def opener(name: str) -> TextIO:
@@ -227,6 +357,9 @@ def fastsplit_fastq_filter(
         # write the record to the selected file
         for line in [seqid, sequence, *quality]:
             output.write(line)
+    # close the files
+    accepted_file.close()
+    rejected_file.close()
 
 
 if __name__ == "__main__":
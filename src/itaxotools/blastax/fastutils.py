@@ -1,11 +1,25 @@
 #!/usr/bin/env python3
 import gzip
+import io
 import os
+import queue
 import re
-from typing import IO, Any, Generator, Iterator, List, Optional, TextIO, Tuple, Union, cast
+import struct
+import threading
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import IO, Any, BinaryIO, Callable, Deque, Generator, Iterator, List, Optional, TextIO, Tuple, Union, cast
 
 rePattern = type(re.compile(""))
 
+# uncompressed size of each BGZF block, same as bgzip, so that compressed blocks fit in 64 KiB
+BGZF_BLOCK_SIZE = 0xFF00
+# the empty block that marks the end of a BGZF file
+BGZF_EOF = bytes.fromhex("1f8b08040000000000ff0600424302001b0003000000000000000000")
+# size of the decompressed blocks passed from the reader thread
+READER_BLOCK_SIZE = 1 << 20
+
 
 def ext_gz(path: Union[str, os.PathLike]) -> str:
     """
@@ -36,6 +50,207 @@ def make_template(filename: str) -> str:
     return filename + "#" + ext
 
 
+def bgzf_compress_block(data: bytes, compresslevel: int) -> bytes:
+    """
+    Compresses 'data' into a single BGZF block: a gzip member with the block size in its extra field
+    """
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, -zlib.MAX_WBITS)
+    deflated = compressor.compress(data) + compressor.flush()
+    header = struct.pack("<BBBBIBBHBBHH", 0x1F, 0x8B, 8, 4, 0, 0, 0xFF, 6, ord("B"), ord("C"), 2, len(deflated) + 25)
+    footer = struct.pack("<II", zlib.crc32(data), len(data))
+    return header + deflated + footer
+
+
+class BgzfWriter(io.RawIOBase):
+    """
+    Writes a BGZF file, compressing its blocks on a pool of threads.
+    The output is a valid multi-member gzip file that can also be indexed by bgzip tools.
+    """
+
+    def __init__(self, filename: str, compresslevel: int = 9, threads: Optional[int] = None):
+        self.name = filename
+        self.compresslevel = compresslevel
+        self.file = open(filename, "wb")
+        workers = threads or os.cpu_count() or 1
+        self.executor = ThreadPoolExecutor(workers)
+        self.max_pending = 4 * workers
+        self.pending: Deque[Future] = deque()
+        self.buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        self.buffer += data
+        while len(self.buffer) >= BGZF_BLOCK_SIZE:
+            self._submit(bytes(self.buffer[:BGZF_BLOCK_SIZE]))
+            del self.buffer[:BGZF_BLOCK_SIZE]
+        return len(data)
+
+    def _submit(self, block: bytes) -> None:
+        # blocks are written in order, as soon as they are compressed
+        self.pending.append(self.executor.submit(bgzf_compress_block, block, self.compresslevel))
+        while len(self.pending) > self.max_pending or (self.pending and self.pending[0].done()):
+            self.file.write(self.pending.popleft().result())
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            if self.buffer:
+                self._submit(bytes(self.buffer))
+                self.buffer.clear()
+            while self.pending:
+                self.file.write(self.pending.popleft().result())
+            self.file.write(BGZF_EOF)
+        finally:
+            self.executor.shutdown()
+            self.file.close()
+            super().close()
+
+
+class ThreadedReader(io.RawIOBase):
+    """
+    Reads a binary stream on a background thread, so that reading and decompressing
+    the next blocks overlaps with parsing the current one.
+    """
+
+    def __init__(self, file: BinaryIO, queue_size: int = 4):
+        self.file = file
+        self.queue: queue.Queue = queue.Queue(queue_size)
+        self.stopped = threading.Event()
+        self.block = memoryview(b"")
+        self.eof = False
+        self.thread = threading.Thread(target=self._read_blocks, daemon=True)
+        self.thread.start()
+
+    @property
+    def name(self) -> str:
+        return self.file.name
+
+    def _put(self, item: Union[bytes, BaseException]) -> bool:
+        while not self.stopped.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _read_blocks(self) -> None:
+        try:
+            while True:
+                block = self.file.read(READER_BLOCK_SIZE)
+                if not self._put(block) or not block:
+                    return
+        except BaseException as exception:
+            self._put(exception)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if not self.block:
+            if self.eof:
+                return 0
+            item = self.queue.get()
+            if isinstance(item, BaseException):
+                self.eof = True
+                raise item
+            if not item:
+                self.eof = True
+                return 0
+            self.block = memoryview(item)
+        size = min(len(buffer), len(self.block))
+        buffer[:size] = self.block[:size]
+        self.block = self.block[size:]
+        return size
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.stopped.set()
+        self.thread.join()
+        self.file.close()
+        super().close()
+
+
+def open_gzip(
+    filename: str,
+    mode: str = "rb",
+    errors: Optional[str] = None,
+    compresslevel: int = 9,
+    threads: Optional[int] = None,
+) -> IO[Any]:
+    """
+    Opens a gzip file like gzip.open, for reading or writing in binary or text 'mode'.
+    Reading decompresses on a background thread.
+    Writing produces BGZF, compressed by 'threads' threads, defaulting to one per CPU.
+    """
+    if "r" in mode:
+        raw: io.RawIOBase = ThreadedReader(cast(BinaryIO, gzip.open(filename, "rb")))
+        file: IO[bytes] = io.BufferedReader(raw, READER_BLOCK_SIZE)
+    else:
+        raw = BgzfWriter(filename, compresslevel, threads)
+        file = io.BufferedWriter(raw, BGZF_BLOCK_SIZE)
+    if "t" in mode:
+        return io.TextIOWrapper(file, errors=errors)
+    return file
+
+
+def copy_file_range(infile: BinaryIO, outfile: BinaryIO, offset: int, count: int) -> None:
+    """
+    Copies 'count' bytes of 'infile' starting at 'offset' to the current position of 'outfile'.
+    The copy is done by the kernel where possible, falling back to reading and writing.
+    """
+    outfile.flush()
+    try:
+        infd = infile.fileno()
+        outfd = outfile.fileno()
+        while count > 0:
+            if hasattr(os, "copy_file_range"):
+                copied = os.copy_file_range(infd, outfd, count, offset)
+            else:
+                copied = os.sendfile(outfd, infd, offset, count)
+            if not copied:
+                break
+            offset += copied
+            count -= copied
+    except (AttributeError, OSError):
+        # not supported on this platform or between these files
+        pass
+    infile.seek(offset)
+    while count > 0:
+        buffer = infile.read(min(count, READER_BLOCK_SIZE))
+        if not buffer:
+            break
+        outfile.write(buffer)
+        count -= len(buffer)
+
+
+def compress_file_range(infile_path: str, offset: int, count: int, outfile_path: str, compresslevel: int = 9) -> None:
+    """
+    Compresses 'count' bytes of the input starting at 'offset' into a new gzip file.
+    Independent ranges can be compressed in parallel, each by a single thread.
+    """
+    with open(infile_path, "rb") as infile, gzip.open(outfile_path, "wb", compresslevel=compresslevel) as outfile:
+        infile.seek(offset)
+        while count > 0:
+            buffer = infile.read(min(count, READER_BLOCK_SIZE))
+            if not buffer:
+                break
+            outfile.write(buffer)
+            count -= len(buffer)
+
+
+def template_filename(template: str, count: int) -> str:
+    """
+    Returns the name of the file with index 'count' for the given template
+    """
+    root, _, ext = template.partition("#")
+    return root + "_" + str(count) + ext
+
+
 def template_files(template: str, mode: str, compressed: bool) -> Generator[IO[Any], str, None]:
     """
     Generates files based on the given template.
@@ -43,17 +258,15 @@ def template_files(template: str, mode: str, compressed: bool) -> Generator[IO[A
     They are compressed if 'compressed'.
     Send 'stop' to finish iteration and close the last file.
     """
-    # destruct the template
-    root, _, ext = template.partition("#")
     # track the number of files
     count = 0
     while True:
         # generate new file name
-        filename = root + "_" + str(count) + ext
+        filename = template_filename(template, count)
         count += 1
         # open the file, possibly with gzip
         if compressed:
-            file = cast(TextIO, gzip.open(filename, mode=mode))
+            file = cast(TextIO, open_gzip(filename, mode=mode))
         else:
             file = open(filename, mode=mode)
         # yield the file
@@ -292,8 +505,78 @@ def parse_pattern_term(tokens: PatternTokens) -> Any:
         raise ValueError(peeked)
 
 
+def combine_pattern_terms(pattern: Any, binary: bool = False) -> Optional[rePattern]:
+    """
+    Returns a single regex equivalent to 'pattern' if it is a term or an 'or' of terms,
+    otherwise None. For binary patterns, the terms are encoded as UTF-8.
+    """
+    if isinstance(pattern, rePattern):
+        if binary:
+            return re.compile(pattern.pattern.encode(), re.IGNORECASE)
+        return pattern
+    if isinstance(pattern, list) and pattern and pattern[0] == "or":
+        terms = [combine_pattern_terms(subpattern, binary) for subpattern in pattern[1:]]
+        if all(term is not None for term in terms):
+            joiner = b"|" if binary else "|"
+            return re.compile(joiner.join(term.pattern for term in terms), re.IGNORECASE)
+    return None
+
+
+def compile_pattern(pattern: Any, binary: bool = False) -> Callable[[Any], bool]:
+    """
+    Compile a parsed pattern into a single function that matches a line.
+    Alternatives of plain terms are merged into one regex, so that they are searched in one pass.
+    Binary patterns match bytes, but then only ASCII letters are case-insensitive.
+    """
+    regex = combine_pattern_terms(pattern, binary)
+    if regex is not None:
+        search = regex.search
+        return lambda line: search(line) is not None
+    if not isinstance(pattern, list):
+        # somehow the invalid pattern was passed
+        raise ValueError(f"{pattern} is invalid")
+    if pattern == []:
+        # empty pattern matches everything
+        return lambda line: True
+    if pattern[0] == "not":
+        regex = combine_pattern_terms(pattern[1], binary)
+        if regex is not None:
+            search = regex.search
+            return lambda line: search(line) is None
+        inner = compile_pattern(pattern[1], binary)
+        return lambda line: not inner(line)
+    if pattern[0] not in ("and", "or"):
+        # somehow the invalid pattern was passed
+        raise ValueError(f"{pattern} is invalid")
+
+    subpatterns = pattern[1:]
+    if pattern[0] == "or":
+        # merge the plain terms into one regex, which is tried first
+        terms = [subpattern for subpattern in subpatterns if combine_pattern_terms(subpattern, binary) is not None]
+        others = [subpattern for subpattern in subpatterns if combine_pattern_terms(subpattern, binary) is None]
+        if len(terms) > 1:
+            subpatterns = [["or", *terms], *others]
+    matchers = tuple(compile_pattern(subpattern, binary) for subpattern in subpatterns)
+    if len(matchers) == 1:
+        return matchers[0]
+    if len(matchers) == 2:
+        first, second = matchers
+        if pattern[0] == "and":
+            return lambda line: first(line) and second(line)
+        return lambda line: first(line) or second(line)
+    if pattern[0] == "and":
+        return lambda line: all(matcher(line) for matcher in matchers)
+    return lambda line: any(matcher(line) for matcher in matchers)
+
+
 class Pattern:
-    """A parsed pattern"""
+    """
+    A parsed pattern, compiled once into the 'match' and 'match_bytes' functions,
+    which check if a line matches the pattern as text or as bytes respectively.
+    """
+
+    match: Callable[[str], bool]
+    match_bytes: Callable[[bytes], bool]
 
     def __init__(self, pattern: str):
         """Parse 'pattern' expression and return a Pattern"""
@@ -306,37 +589,8 @@ class Pattern:
                 raise ValueError(f"Pattern '{pattern}' ends unexpectedly.") from err
             else:
                 raise ValueError(f"Unexpected token: {err.args[0]}") from err
-
-    def match(self, line: str) -> bool:
-        """Checks if the 'line' matches the pattern"""
-        return Pattern._match(self.pattern, line)
-
-    @staticmethod
-    def _match(pattern: Any, line: str) -> bool:
-        """The internal matching algorithm"""
-        if isinstance(pattern, rePattern):
-            # pattern is a regex; simple match
-            return bool(pattern.search(line))
-        elif isinstance(pattern, list):
-            # pattern is an expression
-            if pattern == []:
-                # empty pattern matches everything
-                return True
-            elif pattern[0] == "not":
-                # 'not' negates the match
-                return not Pattern._match(pattern[1], line)
-            elif pattern[0] == "and":
-                # 'and' requires all subpatterns to match
-                return all(Pattern._match(subpattern, line) for subpattern in pattern[1:])
-            elif pattern[0] == "or":
-                # 'or' requires one of the subpatterns to match
-                return any(Pattern._match(subpattern, line) for subpattern in pattern[1:])
-            else:
-                # somehow the invalid pattern was passed
-                raise ValueError(f"{pattern} is invalid")
-        else:
-            # somehow the invalid pattern was passed
-            raise ValueError(f"{pattern} is invalid")
+        self.match = compile_pattern(self.pattern)
+        self.match_bytes = compile_pattern(self.pattern, binary=True)
 
 
 def parse_pattern_optional(pattern: Optional[str]) -> Optional[Pattern]:
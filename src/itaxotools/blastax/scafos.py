@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from enum import Enum, auto
 from itertools import groupby
@@ -8,9 +9,10 @@ from pathlib import Path
 from statistics import median
 from typing import Callable, Iterator, NamedTuple
 
+import numpy as np
+
 from itaxotools.taxi2.distances import Distance, DistanceHandler, DistanceMetric
 from itaxotools.taxi2.handlers import FileHandler
-from itaxotools.taxi2.pairs import SequencePair, SequencePairs
 from itaxotools.taxi2.sequences import Sequence, Sequences
 
 from .core import get_info_suffix, get_timestamp_suffix
@@ -43,6 +45,29 @@ AMBIGUITY_REVERSE_CODES = defaultdict(
     {v: k for k, v in AMBIGUITY_CODES.items()},
 )
 
+_UPPERCASE_TABLE = np.frombuffer(bytes(range(256)).upper(), dtype=np.uint8)
+
+
+def _get_nucleotide_mask_table() -> np.ndarray:
+    """Map each ambiguity code to a bitmask of the nucleotides it stands for"""
+    table = np.zeros(256, dtype=np.uint8)
+    for code, nucleotides in AMBIGUITY_CODES.items():
+        table[ord(code)] = sum(1 << "ACGT".index(nucleotide) for nucleotide in nucleotides)
+    return table
+
+
+def _get_ambiguity_mask_codes() -> np.ndarray:
+    """Map each bitmask of nucleotides back to its ambiguity code"""
+    codes = np.full(16, ord(GAP_CHARACTERS[0]), dtype=np.uint8)
+    for mask in range(1, 16):
+        key = "".join(nucleotide for i, nucleotide in enumerate("ACGT") if mask & (1 << i))
+        codes[mask] = ord(AMBIGUITY_REVERSE_CODES[key])
+    return codes
+
+
+_NUCLEOTIDE_MASK_TABLE = _get_nucleotide_mask_table()
+_AMBIGUITY_MASK_CODES = _get_ambiguity_mask_codes()
+
 
 class TagMethod(Enum):
     SpeciesAfterPipe = auto()
@@ -134,43 +159,217 @@ def select_by_max_length(sequences: Sequences) -> Sequences:
     return Sequences(list(species_dict.values()))
 
 
-def _drop_identical_pairs(pairs: Iterator[SequencePair]) -> Iterator[SequencePair]:
-    for pair in pairs:
-        if pair.x.id != pair.y.id:
-            yield pair
-
-
-def _calculate_distances(pairs: Iterator[SequencePair]) -> Iterator[Distance]:
-    metric = DistanceMetric.Uncorrected()
-    for x, y in pairs:
-        yield metric.calculate(x, y)
-
-
-def _report_distances(distances: Iterator[Distance], path: Path) -> Iterator[Distance]:
-    with DistanceHandler.Linear.WithExtras(path, "w") as file:
-        for distance in distances:
-            file.write(distance)
-            yield distance
-
+_NUCLEOTIDE_CHARACTERS = b"ACGTacgt"
+_MISSING_CHARACTERS = b"-?Nn"
+_DISTANCE_BLOCK_SIZE = 256
+
+_worker_matrix: np.ndarray | None = None
+
+
+def _encode_sequences(sequences: list[Sequence]) -> np.ndarray:
+    """Encode sequences as the rows of a byte matrix, padding shorter sequences with gaps"""
+    length = max((len(sequence.seq) for sequence in sequences), default=0)
+    matrix = np.full((len(sequences), length), ord("-"), dtype=np.uint8)
+    for i, sequence in enumerate(sequences):
+        seq = sequence.seq.encode("ascii", errors="replace")
+        matrix[i, : len(seq)] = np.frombuffer(seq, dtype=np.uint8)
+    return matrix
+
+
+def _calculate_uncorrected_block(matrix: np.ndarray, rows: np.ndarray, cols: np.ndarray | None = None) -> np.ndarray:
+    """
+    Uncorrected p-distances from some rows of an encoded alignment to the given columns,
+    or to all rows by default, as NaN where undefined.
+    Same as DistanceMetric.Uncorrected: positions are compared if both are nucleotides,
+    or if both hold the same character other than a gap or N, and any other
+    positions are ignored. Matching characters are counted through matrix products.
+    """
+    x = matrix[rows]
+    y = matrix if cols is None else matrix[cols]
+    dtype = np.float32 if matrix.shape[1] < 2**24 else np.float64
+
+    nucleotides = np.zeros(256, dtype=bool)
+    nucleotides[list(_NUCLEOTIDE_CHARACTERS)] = True
+    compared = nucleotides[x].astype(dtype) @ nucleotides[y].T.astype(dtype)
+    mismatches = compared.copy()
+
+    present = np.bincount(x.ravel(), minlength=256).astype(bool)
+    present &= np.bincount(y.ravel(), minlength=256).astype(bool)
+    for character in np.flatnonzero(present).tolist():
+        if character in _MISSING_CHARACTERS:
+            continue
+        matches = (x == character).astype(dtype) @ (y == character).T.astype(dtype)
+        if nucleotides[character]:
+            mismatches -= matches
+        else:
+            compared += matches
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return mismatches.astype(np.float64) / compared.astype(np.float64)
+
+
+def _initialize_distance_worker(matrix: np.ndarray):
+    global _worker_matrix
+    _worker_matrix = matrix
+
+
+def _calculate_uncorrected_block_in_worker(block: tuple[np.ndarray, np.ndarray | None]) -> np.ndarray:
+    return _calculate_uncorrected_block(_worker_matrix, *block)
+
+
+def _calculate_uncorrected_blocks(
+    matrix: np.ndarray, blocks: list[tuple[np.ndarray, np.ndarray | None]], num_processes: int = 1
+) -> Iterator[np.ndarray]:
+    """Calculate the distances for each block of rows and columns, optionally over a process pool"""
+    if num_processes <= 1 or len(blocks) <= 1:
+        for rows, cols in blocks:
+            yield _calculate_uncorrected_block(matrix, rows, cols)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=num_processes, initializer=_initialize_distance_worker, initargs=(matrix,)
+    ) as executor:
+        yield from executor.map(_calculate_uncorrected_block_in_worker, blocks)
+
+
+def _iter_distance_rows(
+    matrix: np.ndarray, groups: list[tuple[np.ndarray, np.ndarray | None]], num_processes: int = 1
+) -> Iterator[tuple[int, np.ndarray]]:
+    """
+    Yield the distances of each row to the columns of its group, or to all rows if those are None.
+    Rows of the same group are calculated in blocks against the same columns.
+    """
+    blocks = [
+        (rows[i : i + _DISTANCE_BLOCK_SIZE], cols)
+        for rows, cols in groups
+        for i in range(0, len(rows), _DISTANCE_BLOCK_SIZE)
+    ]
+    for (rows, _), block in zip(blocks, _calculate_uncorrected_blocks(matrix, blocks, num_processes)):
+        yield from zip(rows.tolist(), block)
+
+
+def _aggregate_row_distances(
+    sequence: Sequence,
+    distances: list[float],
+    species_positions: dict[str, list[int]],
+    drop_infinite: bool,
+) -> AggregatedDistances:
+    entries: list[tuple[int, str, list[float | None]]] = []
+    for species, positions in species_positions.items():
+        pairs = [(position, distances[position]) for position in positions]
+        pairs = [(position, None if value != value else value) for position, value in pairs]
+        if drop_infinite:
+            pairs = [(position, value) for position, value in pairs if value is not None]
+        if pairs:
+            entries.append((pairs[0][0], species, [value for _, value in pairs]))
+    # species are aggregated in the order their first distance is met, as for the report
+    entries.sort(key=lambda entry: entry[0])
+    return AggregatedDistances(sequence, {species: values for _, species, values in entries})
+
+
+def _merge_adjacent_duplicates(items: Iterator[AggregatedDistances]) -> Iterator[AggregatedDistances]:
+    """Consecutive sequences with the same identifier are aggregated together"""
+    for _, group in groupby(items, lambda item: item.sequence.id):
+        group = list(group)
+        if len(group) == 1:
+            yield group[0]
+            continue
+        distance_dict: dict[str, list[float | None]] = {}
+        for item in group:
+            for species, distances in item.species_distances.items():
+                distance_dict.setdefault(species, []).extend(distances)
+        yield AggregatedDistances(group[0].sequence, distance_dict)
 
-def _group_distances_by_left_id(distances: Iterator[Distance]) -> Iterator[DistanceGroups]:
-    keyfunc = lambda distance: distance.x.id
-    for left, group in groupby(distances, keyfunc):
-        yield DistanceGroups(left, list(group))
 
+def _aggregate_species_distances(
+    sequences: Sequences,
+    distance_report: Path | None = None,
+    drop_infinite: bool = True,
+    num_processes: int = 1,
+) -> Iterator[AggregatedDistances]:
+    """
+    Calculate the uncorrected distances of each sequence to all sequences with another
+    identifier, grouped by species. Sequences are encoded as a byte matrix and processed
+    in blocks of rows. Adjacent sequences with the same identifier are merged and only
+    the species of the first one is left out of the means, so distances to that species
+    are skipped, while distances to the species of the other merged sequences are kept.
+    Pairs of sequences are only visited one by one if they are needed for the distance report.
+    """
+    sequences = list(sequences)
+    matrix = _encode_sequences(sequences)
 
-def _aggregate_distance_groups(
-    groups: Iterator[DistanceGroups], drop_infinite: bool = True
+    if distance_report is not None:
+        with DistanceHandler.Linear.WithExtras(distance_report, "w") as file:
+            aggregated = _aggregate_all_distances(file, sequences, matrix, drop_infinite, num_processes)
+            yield from _merge_adjacent_duplicates(aggregated)
+        return
+
+    ids = [sequence.id for sequence in sequences]
+    species = np.array([sequence.extras["species"] for sequence in sequences], dtype=object)
+    indices = np.arange(len(sequences))
+
+    # sequences only paired with copies of themselves have no distances at all
+    id_counts = Counter(ids)
+    has_pairs = np.array([id_counts[id] < len(ids) for id in ids], dtype=bool)
+
+    # the species left out of the means, as merged by _merge_adjacent_duplicates
+    excluded = np.empty(len(sequences), dtype=object)
+    for _, group in groupby(indices.tolist(), lambda i: ids[i]):
+        group = list(group)
+        excluded[group] = species[group[0]]
+
+    # rows are grouped by their excluded species and only compared to the columns of other species
+    groups: list[tuple[np.ndarray, np.ndarray]] = []
+    group_positions: list[dict[str, list[int]]] = []
+    for key in dict.fromkeys(excluded.tolist()):
+        rows = indices[(excluded == key) & has_pairs]
+        if not len(rows):
+            continue
+        cols = indices[species != key]
+        col_species = species[cols]
+        groups.append((rows, cols))
+        group_positions.append(
+            {other: np.flatnonzero(col_species == other).tolist() for other in dict.fromkeys(col_species.tolist())}
+        )
+    group_of_row = {row: index for index, (rows, _) in enumerate(groups) for row in rows.tolist()}
+
+    aggregated: list[AggregatedDistances | None] = [None] * len(sequences)
+    for row, distances in _iter_distance_rows(matrix, groups, num_processes):
+        index = group_of_row[row]
+        positions = group_positions[index]
+        id = ids[row]
+        if id_counts[id] > 1:
+            cols = groups[index][1]
+            positions = {key: [pos for pos in poss if ids[cols[pos]] != id] for key, poss in positions.items()}
+        aggregated[row] = _aggregate_row_distances(sequences[row], distances.tolist(), positions, drop_infinite)
+
+    yield from _merge_adjacent_duplicates(item for item in aggregated if item is not None)
+
+
+def _aggregate_all_distances(
+    file: DistanceHandler,
+    sequences: list[Sequence],
+    matrix: np.ndarray,
+    drop_infinite: bool,
+    num_processes: int,
 ) -> Iterator[AggregatedDistances]:
-    for group in groups:
-        distance_dict: dict[str, list[float]] = defaultdict(list)
-        for distance in group.others:
-            if drop_infinite and distance.d is None:
-                continue
-            distance_dict[distance.y.extras["species"]].append(distance.d)
-        sequence = group.others[0].x
-        assert sequence.id == group.key
-        yield AggregatedDistances(sequence, distance_dict)
+    """Calculate the distances between all pairs of sequences and write them to the report"""
+    metric = DistanceMetric.Uncorrected()
+    species = [sequence.extras["species"] for sequence in sequences]
+    indices = np.arange(len(sequences))
+
+    for row, distances in _iter_distance_rows(matrix, [(indices, None)], num_processes):
+        x = sequences[row]
+        distances = distances.tolist()
+        cols = [col for col, y in enumerate(sequences) if y.id != x.id]
+        if not cols:
+            continue
+        species_positions: dict[str, list[int]] = defaultdict(list)
+        for col in cols:
+            d = distances[col]
+            file.write(Distance(metric, x, sequences[col], None if d != d else d))
+            species_positions[species[col]].append(col)
+        yield _aggregate_row_distances(x, distances, species_positions, drop_infinite)
 
 
 def _calculate_means(data: Iterator[AggregatedDistances]) -> Iterator[AggregatedMean]:
@@ -215,16 +414,9 @@ def select_by_minimum_distance(
     sequences: Sequences,
     distance_report: Path = None,
     mean_report: Path = None,
+    num_processes: int = 1,
 ) -> Sequences:
-    pairs = SequencePairs.fromProduct(sequences, sequences)
-    pairs = _drop_identical_pairs(pairs)
-    distances = _calculate_distances(pairs)
-
-    if distance_report is not None:
-        distances = _report_distances(distances, distance_report)
-
-    groups = _group_distances_by_left_id(distances)
-    aggregated = _aggregate_distance_groups(groups)
+    aggregated = _aggregate_species_distances(sequences, distance_report, num_processes=num_processes)
     means = _calculate_means(aggregated)
 
     if mean_report is not None:
@@ -266,12 +458,60 @@ def _get_ambiguity_character(characters: Iterator[str]) -> str:
     return AMBIGUITY_REVERSE_CODES[key.upper()]
 
 
+def _get_present_characters(profile: np.ndarray, chunk_size: int = 2**20) -> np.ndarray:
+    """Mask of the byte values found in the array, counted in chunks to bound the memory used"""
+    present = np.zeros(256, dtype=bool)
+    flat = profile.ravel()
+    for i in range(0, len(flat), chunk_size):
+        present |= np.bincount(flat[i : i + chunk_size], minlength=256).astype(bool)
+    return present
+
+
+def _get_most_common_characters(profile: np.ndarray) -> np.ndarray:
+    """Vectorized _get_most_common_character for each column of a 2D byte array"""
+    present = _get_present_characters(profile)
+    present[list(GAP_CHARACTERS.encode())] = False
+    alphabet = np.flatnonzero(present).astype(np.uint8)
+    if not len(alphabet):
+        return np.full(profile.shape[1], ord(GAP_CHARACTERS[0]), dtype=np.uint8)
+
+    counts = np.stack([(profile == character).sum(axis=0, dtype=np.int32) for character in alphabet])
+    most = counts.max(axis=0)
+    characters = alphabet[counts.argmax(axis=0)]
+    characters[most == 0] = ord(GAP_CHARACTERS[0])
+
+    # break ties by earliest occurrence, like Counter.most_common
+    winners = counts == most
+    tied = np.flatnonzero((np.count_nonzero(winners, axis=0) > 1) & (most > 0))
+    if len(tied):
+        table = np.full(256, len(alphabet), dtype=np.intp)
+        table[alphabet] = np.arange(len(alphabet))
+        winners = np.vstack([winners[:, tied], np.zeros((1, len(tied)), dtype=bool)])
+        columns = profile[:, tied]
+        is_winner = winners[table[columns], np.arange(len(tied))]
+        characters[tied] = columns[is_winner.argmax(axis=0), np.arange(len(tied))]
+    return characters
+
+
+def _get_ambiguity_characters(profile: np.ndarray) -> np.ndarray:
+    """Vectorized _get_ambiguity_character for each column of a 2D byte array"""
+    upper = _UPPERCASE_TABLE[profile]
+    masks = np.bitwise_or.reduce(_NUCLEOTIDE_MASK_TABLE[upper], axis=0)
+    characters = _AMBIGUITY_MASK_CODES[masks]
+    uniform = upper.min(axis=0) == upper.max(axis=0)
+    characters[uniform] = upper[0, uniform]
+    return characters
+
+
 def _assemble_sequence_from_most_common_characters(seqs: list[str], ambiguous: bool = False) -> str:
     if not all(len(s) == len(seqs[0]) for s in seqs):
         return None
-    func = _get_ambiguity_character if ambiguous else _get_most_common_character
-    sequence = "".join(func(characters) for characters in zip(*seqs))
-    return sequence
+    if not all(s.isascii() for s in seqs):
+        func = _get_ambiguity_character if ambiguous else _get_most_common_character
+        return "".join(func(characters) for characters in zip(*seqs))
+    profile = np.frombuffer("".join(seqs).encode("ascii"), dtype=np.uint8).reshape(len(seqs), len(seqs[0]))
+    func = _get_ambiguity_characters if ambiguous else _get_most_common_characters
+    return func(profile).tobytes().decode("ascii")
 
 
 def _aggregate_sequence_groups_by_filling_gaps(
@@ -318,16 +558,11 @@ def fuse_after_discarding_outliers(
     mean_report: Path = None,
     outlier_factor: float = 2.0,
     ambiguous: bool = False,
+    num_processes: int = 1,
 ) -> Sequences:
-    pairs = SequencePairs.fromProduct(sequences, sequences)
-    pairs = _drop_identical_pairs(pairs)
-    distances = _calculate_distances(pairs)
-
-    if distance_report is not None:
-        distances = _report_distances(distances, distance_report)
-
-    groups = _group_distances_by_left_id(distances)
-    aggregated = _aggregate_distance_groups(groups, drop_infinite=False)
+    aggregated = _aggregate_species_distances(
+        sequences, distance_report, drop_infinite=False, num_processes=num_processes
+    )
     means = _calculate_means(aggregated)
 
     if mean_report is not None:
@@ -0,0 +1,168 @@
+import warnings
+from collections import namedtuple
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+import numpy as np
+
+STANDARD_OUTFMT_COLUMNS = [
+    "qseqid",
+    "sseqid",
+    "pident",
+    "length",
+    "mismatch",
+    "gapopen",
+    "qstart",
+    "qend",
+    "sstart",
+    "send",
+    "evalue",
+    "bitscore",
+]
+
+INT_COLUMNS = {
+    "qlen",
+    "slen",
+    "qstart",
+    "qend",
+    "sstart",
+    "send",
+    "length",
+    "nident",
+    "mismatch",
+    "positive",
+    "gapopen",
+    "gaps",
+    "score",
+    "qframe",
+    "sframe",
+    "staxid",
+}
+
+FLOAT_COLUMNS = {
+    "evalue",
+    "bitscore",
+    "pident",
+    "ppos",
+    "qcovs",
+    "qcovhsp",
+    "qcovus",
+}
+
+
+def parse_outfmt_columns(outfmt: str | list[str]) -> list[str]:
+    """
+    Get the column names from a tabular outfmt specifier, such as "6 qseqid sseqid pident".
+    The leading format number is optional, and "std" expands to the standard columns.
+    """
+    parts = outfmt.split() if isinstance(outfmt, str) else list(outfmt)
+    if parts and parts[0].isdigit():
+        parts = parts[1:]
+    if not parts:
+        return list(STANDARD_OUTFMT_COLUMNS)
+    columns = []
+    for part in parts:
+        if part == "std":
+            columns += STANDARD_OUTFMT_COLUMNS
+        else:
+            columns.append(part)
+    return columns
+
+
+def get_column_type(column: str) -> type:
+    if column in INT_COLUMNS:
+        return int
+    if column in FLOAT_COLUMNS:
+        return float
+    return str
+
+
+@lru_cache(maxsize=None)
+def get_record_type(columns: tuple[str, ...]) -> type[NamedTuple]:
+    return namedtuple("BlastRecord", columns)
+
+
+def _get_selection(outfmt: str | list[str], usecols: list[str] | None) -> tuple[list[str], list[int]]:
+    columns = parse_outfmt_columns(outfmt)
+    if usecols is None:
+        return columns, list(range(len(columns)))
+    for column in usecols:
+        if column not in columns:
+            raise ValueError(f"Column {repr(column)} is not part of the BLAST output format: {' '.join(columns)}")
+    return list(usecols), [columns.index(column) for column in usecols]
+
+
+def iter_blast_rows(path: Path | str) -> Iterator[list[str]]:
+    """Stream the raw fields of each row in a BLAST+ tabular output file, skipping comments"""
+    with open(path, "r", encoding="utf-8", errors="surrogateescape") as file:
+        for line in file:
+            line = line.rstrip("\r\n")
+            if not line or line[0] == "#":
+                continue
+            yield line.split("\t")
+
+
+def iter_blast_records(
+    path: Path | str,
+    outfmt: str | list[str],
+    usecols: list[str] | None = None,
+) -> Iterator[NamedTuple]:
+    """
+    Stream typed records from a BLAST+ tabular output file (outfmt 6 or 7).
+    Records are named tuples with one field per column, converted to int or float
+    where applicable. Only the columns in `usecols` are converted and kept, if given.
+    Empty lines and comment lines are skipped.
+    """
+    names, _ = _get_selection(outfmt, usecols)
+    record_type = get_record_type(tuple(names))
+    make = tuple.__new__
+    for batch in iter_blast_columns(path, outfmt, usecols):
+        for values in iter_batch_rows(batch):
+            yield make(record_type, values)
+
+
+def iter_batch_rows(batch: dict[str, np.ndarray], mask: np.ndarray | None = None) -> Iterator[tuple]:
+    """Iterate over the rows of a column batch as plain tuples, optionally keeping only rows selected by `mask`"""
+    arrays = batch.values() if mask is None else (array[mask] for array in batch.values())
+    return zip(*(array.tolist() for array in arrays))
+
+
+def iter_blast_columns(
+    path: Path | str,
+    outfmt: str | list[str],
+    usecols: list[str] | None = None,
+    batch_size: int = 65536,
+    raw: bool = False,
+) -> Iterator[dict[str, np.ndarray]]:
+    """
+    Stream batches of rows from a BLAST+ tabular output file as columns.
+    Each batch maps column names to NumPy arrays of up to `batch_size` rows:
+    numeric columns are int64 or float64, all others are object arrays of strings.
+    This allows filtering large tables in bulk with boolean masks.
+    If `raw` is set, all columns are kept as the strings written by BLAST+.
+    """
+    names, indices = _get_selection(outfmt, usecols)
+    types = {int: np.int64, float: np.float64, str: object}
+    dtype = np.dtype([(name, object if raw else types[get_column_type(name)]) for name in names])
+
+    with open(path, "r", encoding="utf-8", errors="surrogateescape") as file:
+        # comment lines only appear in outfmt 7, where they also start the file
+        has_comments = file.read(1) == "#"
+        file.seek(0)
+        source = (line for line in file if line[0] != "#") if has_comments else file
+        while True:
+            with warnings.catch_warnings():
+                warnings.filterwarnings("ignore", ".*contained no data", UserWarning)
+                rows = np.loadtxt(
+                    source,
+                    dtype=dtype,
+                    delimiter="\t",
+                    comments=None,
+                    usecols=indices,
+                    max_rows=batch_size,
+                    ndmin=1,
+                )
+            if not len(rows):
+                break
+            yield {name: rows[name] for name in names}
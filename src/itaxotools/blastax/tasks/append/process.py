@@ -3,11 +3,9 @@ from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
 from time import perf_counter
-from traceback import print_exc
+from traceback import print_exception
 
-from itaxotools.blastax.utils import make_str_blast_safe
-
-from ..common.process import StagingArea
+from ..common.process import StagingArea, prepare_query, run_concurrent_jobs, split_thread_budget
 from ..common.types import BatchResults, Confirmation, DoubleBatchResults
 from .types import TargetPaths, TargetXPaths
 
@@ -34,6 +32,8 @@ def execute(
     specified_identifier: str | None,
     append_timestamp: bool,
     append_configuration: bool,
+    blast_num_shards: int = 1,
+    blast_use_cache: bool = False,
 ) -> BatchResults:
     print(f"{input_query_paths=}")
     print(f"{input_database_paths=}")
@@ -41,6 +41,8 @@ def execute(
     print(f"{blast_method=}")
     print(f"{blast_evalue=}")
     print(f"{blast_num_threads=}")
+    print(f"{blast_num_shards=}")
+    print(f"{blast_use_cache=}")
     print(f"{match_multiple=}")
     print(f"{match_pident=}")
     print(f"{match_length=}")
@@ -58,6 +60,8 @@ def execute(
             blast_method=blast_method,
             blast_evalue=blast_evalue,
             blast_num_threads=blast_num_threads,
+            blast_num_shards=blast_num_shards,
+            blast_use_cache=blast_use_cache,
             match_multiple=match_multiple,
             match_pident=match_pident,
             match_length=match_length,
@@ -76,6 +80,8 @@ def execute(
             blast_method=blast_method,
             blast_evalue=blast_evalue,
             blast_num_threads=blast_num_threads,
+            blast_num_shards=blast_num_shards,
+            blast_use_cache=blast_use_cache,
             match_multiple=match_multiple,
             match_pident=match_pident,
             match_length=match_length,
@@ -92,6 +98,8 @@ def execute(
         blast_method=blast_method,
         blast_evalue=blast_evalue,
         blast_num_threads=blast_num_threads,
+        blast_num_shards=blast_num_shards,
+        blast_use_cache=blast_use_cache,
         match_multiple=match_multiple,
         match_pident=match_pident,
         match_length=match_length,
@@ -115,15 +123,17 @@ def execute_batch_databases_single_query(
     specified_identifier: str | None,
     append_timestamp: bool,
     append_configuration: bool,
+    blast_num_shards: int = 1,
+    blast_use_cache: bool = False,
 ) -> BatchResults:
     from itaxotools import abort, get_feedback, progress_handler
+    from itaxotools.blastax.cache import QueryCache
     from itaxotools.blastax.core import get_append_filename
 
     blast_outfmt = 6
     blast_outfmt_options = "length pident qseqid sseqid sseq qframe sframe"
 
     total = len(input_database_paths) + 1
-    failed: list[Path] = []
 
     timestamp = datetime.now() if append_timestamp else None
     blast_options: dict[str, str] = {}
@@ -162,42 +172,71 @@ def execute_batch_databases_single_query(
 
     ts = perf_counter()
 
+    # the query is normalized once and shared by the jobs of all databases
     progress_handler(f"Copying query file: {input_query_path.name}", 0, 0, total)
-    shutil.copyfile(input_query_path, appended_output_path)
+    query_cache = QueryCache() if blast_use_cache else None
+    prepared_query = prepare_query(input_query_path, _make_job_dir(work_dir, "query"), query_cache)
+    shutil.copyfile(prepared_query[0], appended_output_path)
 
-    for i, (input_database_path, target) in enumerate(zip(input_database_paths, target_paths_list)):
-        staging = StagingArea(work_dir)
-        staging.add(db_paths=[input_database_path])
+    progress_handler("Staging databases", 0, 0, total)
+    database_staging = StagingArea(_make_job_dir(work_dir, "databases"))
+    database_staging.add(db_paths=input_database_paths)
+    database_staging.stage(verbose=True)
 
-        progress_handler(f"Staging database {i+1}/{total - 1}", i + 1, 0, total)
-        staging.stage(verbose=True)
+    workers, num_threads = split_thread_budget(blast_num_threads, len(input_database_paths))
+    fragment_paths: list[Path] = []
+    jobs = []
 
-        progress_handler(f"Processing query for database {i+1}/{total - 1}: {input_query_path.name}", i + 1, 0, total)
-        try:
-            execute_single_database_single_query(
-                work_dir=work_dir,
-                staging=staging,
+    for i, (input_database_path, target) in enumerate(zip(input_database_paths, target_paths_list)):
+        job_dir = _make_job_dir(work_dir, str(i))
+        fragment_path = job_dir / "appended.fasta"
+        fragment_path.touch()
+        fragment_paths.append(fragment_path)
+        jobs.append(
+            _make_job(
+                work_dir=job_dir,
+                database_staging=database_staging,
                 input_query_path=input_query_path,
+                prepared_query=prepared_query,
                 input_database_path=input_database_path,
                 blast_output_path=target.blast_output_path,
-                appended_output_path=appended_output_path,
+                appended_output_path=fragment_path,
                 blast_method=blast_method,
                 blast_outfmt=blast_outfmt,
                 blast_outfmt_options=blast_outfmt_options,
                 blast_evalue=blast_evalue,
-                blast_num_threads=blast_num_threads,
+                blast_num_threads=num_threads,
+                blast_num_shards=blast_num_shards,
+                blast_use_cache=blast_use_cache,
                 match_multiple=match_multiple,
                 match_pident=match_pident,
                 match_length=match_length,
                 specified_identifier=specified_identifier,
                 append_only=True,
             )
-        except Exception:
-            with open(target.error_log_path, "w") as f:
-                print_exc(file=f)
-            failed.append(input_database_path)
-        finally:
-            staging.cleanup()
+        )
+
+    failed_indices: set[int] = set()
+    try:
+        for done, result in enumerate(run_concurrent_jobs(jobs, workers), 1):
+            input_database_path = input_database_paths[result.index]
+            if result.error is not None:
+                with open(target_paths_list[result.index].error_log_path, "w") as f:
+                    print_exception(result.error, file=f)
+                failed_indices.add(result.index)
+            progress_handler(f"Processed database {done}/{total - 1}: {input_database_path.name}", done, 0, total)
+    finally:
+        database_staging.cleanup()
+
+    # Merge the matches of each database in the order they were given
+    with open(appended_output_path, "a") as output_file:
+        for i, fragment_path in enumerate(fragment_paths):
+            if i in failed_indices:
+                continue
+            with open(fragment_path) as fragment_file:
+                shutil.copyfileobj(fragment_file, output_file)
+
+    failed = [path for i, path in enumerate(input_database_paths) if i in failed_indices]
 
     progress_handler("Done processing files.", total, 0, total)
 
@@ -220,6 +259,8 @@ def execute_batch_database_batch_queries(
     specified_identifier: str | None,
     append_timestamp: bool,
     append_configuration: bool,
+    blast_num_shards: int = 1,
+    blast_use_cache: bool = False,
 ) -> BatchResults:
     from itaxotools import abort, get_feedback, progress_handler
 
@@ -274,52 +315,66 @@ def execute_batch_database_batch_queries(
 
     ts = perf_counter()
 
-    for i, input_database_path in enumerate(input_database_paths):
+    for input_database_path in input_database_paths:
         database_output_path = output_path / input_database_path.name
         database_output_path.mkdir(exist_ok=True)
 
-        staging = StagingArea(work_dir)
-        staging.add(db_paths=[input_database_path])
+    progress_handler("Staging databases", 0, 0, total)
+    database_staging = StagingArea(_make_job_dir(work_dir, "databases"))
+    database_staging.add(db_paths=input_database_paths)
+    database_staging.stage(verbose=True)
+
+    workers, num_threads = split_thread_budget(blast_num_threads, total)
+    job_keys: list[tuple[Path, Path, TargetPaths]] = []
+    jobs = []
+
+    for input_database_path in input_database_paths:
+        for input_query_path, target in zip(input_query_paths, target_paths_dict[input_database_path]):
+            job_keys.append((input_database_path, input_query_path, target))
+            jobs.append(
+                _make_job(
+                    work_dir=_make_job_dir(work_dir, str(len(jobs))),
+                    database_staging=database_staging,
+                    input_query_path=input_query_path,
+                    input_database_path=input_database_path,
+                    blast_output_path=target.blast_output_path,
+                    appended_output_path=target.appended_output_path,
+                    blast_method=blast_method,
+                    blast_outfmt=blast_outfmt,
+                    blast_outfmt_options=blast_outfmt_options,
+                    blast_evalue=blast_evalue,
+                    blast_num_threads=num_threads,
+                    blast_num_shards=blast_num_shards,
+                    blast_use_cache=blast_use_cache,
+                    match_multiple=match_multiple,
+                    match_pident=match_pident,
+                    match_length=match_length,
+                    specified_identifier=specified_identifier,
+                )
+            )
 
-        progress_handler(f"Staging database {i+1}/{total - 1}", i + 1, 0, total)
-        staging.stage(verbose=True)
+    failed_indices: set[int] = set()
+    try:
+        for done, result in enumerate(run_concurrent_jobs(jobs, workers), 1):
+            input_database_path, input_query_path, target = job_keys[result.index]
+            if result.error is not None:
+                if total == 1:
+                    raise result.error
+                with open(target.error_log_path, "w") as f:
+                    print_exception(result.error, file=f)
+                failed_indices.add(result.index)
+            progress_handler(
+                f"Processed {repr(input_database_path.name)} for file: {input_query_path.name}",
+                done,
+                0,
+                total,
+            )
+    finally:
+        database_staging.cleanup()
 
-        try:
-            for j, (input_query_path, target) in enumerate(
-                zip(input_query_paths, target_paths_dict[input_database_path])
-            ):
-                progress_handler(
-                    f"Processing {repr(input_database_path.name)} for file: {input_query_path.name}",
-                    len(input_query_paths) * i + j,
-                    0,
-                    total,
-                )
-                try:
-                    execute_single_database_single_query(
-                        work_dir=work_dir,
-                        staging=staging,
-                        input_query_path=input_query_path,
-                        input_database_path=input_database_path,
-                        blast_output_path=target.blast_output_path,
-                        appended_output_path=target.appended_output_path,
-                        blast_method=blast_method,
-                        blast_outfmt=blast_outfmt,
-                        blast_outfmt_options=blast_outfmt_options,
-                        blast_evalue=blast_evalue,
-                        blast_num_threads=blast_num_threads,
-                        match_multiple=match_multiple,
-                        match_pident=match_pident,
-                        match_length=match_length,
-                        specified_identifier=specified_identifier,
-                    )
-                except Exception as e:
-                    if total == 1:
-                        raise e
-                    with open(target.error_log_path, "w") as f:
-                        print_exc(file=f)
-                    failed[input_database_path].append(input_query_path)
-        finally:
-            staging.cleanup()
+    for i, (input_database_path, input_query_path, _) in enumerate(job_keys):
+        if i in failed_indices:
+            failed[input_database_path].append(input_query_path)
 
     progress_handler("Done processing files.", total, 0, total)
 
@@ -342,6 +397,8 @@ def execute_single_database_batch_queries(
     specified_identifier: str | None,
     append_timestamp: bool,
     append_configuration: bool,
+    blast_num_shards: int = 1,
+    blast_use_cache: bool = False,
 ) -> BatchResults:
     from itaxotools import abort, get_feedback, progress_handler
 
@@ -349,7 +406,6 @@ def execute_single_database_batch_queries(
     blast_outfmt_options = "length pident qseqid sseqid sseq qframe sframe"
 
     total = len(input_query_paths)
-    failed: list[Path] = []
 
     timestamp = datetime.now() if append_timestamp else None
     blast_options: dict[str, str] = {}
@@ -371,9 +427,9 @@ def execute_single_database_batch_queries(
         get_target_paths(path, output_path, timestamp, blast_options, match_options) for path in input_query_paths
     ]
 
-    staging = StagingArea(work_dir)
-    staging.add(db_paths=[input_database_path])
-    if staging.requires_copy():
+    staging_check = StagingArea(work_dir)
+    staging_check.add(db_paths=[input_database_path])
+    if staging_check.requires_copy():
         if not get_feedback(Confirmation.StagingRequired):
             abort()
 
@@ -384,37 +440,49 @@ def execute_single_database_batch_queries(
     ts = perf_counter()
 
     progress_handler("Staging database", 0, 0, 0)
-    staging.stage(verbose=True)
+    database_staging = StagingArea(_make_job_dir(work_dir, "databases"))
+    database_staging.add(db_paths=[input_database_path])
+    database_staging.stage(verbose=True)
+
+    workers, num_threads = split_thread_budget(blast_num_threads, total)
+    jobs = [
+        _make_job(
+            work_dir=_make_job_dir(work_dir, str(i)),
+            database_staging=database_staging,
+            input_query_path=path,
+            input_database_path=input_database_path,
+            blast_output_path=target.blast_output_path,
+            appended_output_path=target.appended_output_path,
+            blast_method=blast_method,
+            blast_outfmt=blast_outfmt,
+            blast_outfmt_options=blast_outfmt_options,
+            blast_evalue=blast_evalue,
+            blast_num_threads=num_threads,
+            blast_num_shards=blast_num_shards,
+            blast_use_cache=blast_use_cache,
+            match_multiple=match_multiple,
+            match_pident=match_pident,
+            match_length=match_length,
+            specified_identifier=specified_identifier,
+        )
+        for i, (path, target) in enumerate(zip(input_query_paths, target_paths_list))
+    ]
 
+    failed_indices: set[int] = set()
     try:
-        for i, (path, target) in enumerate(zip(input_query_paths, target_paths_list)):
-            progress_handler(f"Processing file {i+1}/{total}: {path.name}", i, 0, total)
-            try:
-                execute_single_database_single_query(
-                    work_dir=work_dir,
-                    staging=staging,
-                    input_query_path=path,
-                    input_database_path=input_database_path,
-                    blast_output_path=target.blast_output_path,
-                    appended_output_path=target.appended_output_path,
-                    blast_method=blast_method,
-                    blast_outfmt=blast_outfmt,
-                    blast_outfmt_options=blast_outfmt_options,
-                    blast_evalue=blast_evalue,
-                    blast_num_threads=blast_num_threads,
-                    match_multiple=match_multiple,
-                    match_pident=match_pident,
-                    match_length=match_length,
-                    specified_identifier=specified_identifier,
-                )
-            except Exception as e:
+        for done, result in enumerate(run_concurrent_jobs(jobs, workers), 1):
+            path = input_query_paths[result.index]
+            if result.error is not None:
                 if total == 1:
-                    raise e
-                with open(target.error_log_path, "w") as f:
-                    print_exc(file=f)
-                failed.append(path)
+                    raise result.error
+                with open(target_paths_list[result.index].error_log_path, "w") as f:
+                    print_exception(result.error, file=f)
+                failed_indices.add(result.index)
+            progress_handler(f"Processed file {done}/{total}: {path.name}", done, 0, total)
     finally:
-        staging.cleanup()
+        database_staging.cleanup()
+
+    failed = [path for i, path in enumerate(input_query_paths) if i in failed_indices]
 
     progress_handler("Done processing files.", total, 0, total)
 
@@ -423,6 +491,25 @@ def execute_single_database_batch_queries(
     return BatchResults(output_path, failed, tf - ts)
 
 
+def _make_job_dir(work_dir: Path, name: str) -> Path:
+    job_dir = work_dir / name
+    job_dir.mkdir()
+    return job_dir
+
+
+def _make_job(work_dir: Path, **kwargs):
+    """Bind a single query and database to a job with its own work dir and output staging"""
+
+    def job():
+        staging = StagingArea(work_dir)
+        try:
+            execute_single_database_single_query(work_dir=work_dir, staging=staging, **kwargs)
+        finally:
+            staging.cleanup()
+
+    return job
+
+
 def execute_single_database_single_query(
     work_dir: Path,
     staging: StagingArea,
@@ -440,18 +527,18 @@ def execute_single_database_single_query(
     match_length: int,
     specified_identifier: str | None,
     append_only: bool = False,
+    database_staging: StagingArea | None = None,
+    blast_num_shards: int = 1,
+    blast_use_cache: bool = False,
+    prepared_query: tuple[Path, Path] | None = None,
 ):
+    from itaxotools.blastax.cache import BlastCache, QueryCache
     from itaxotools.blastax.core import blast_parse, run_blast
-    from itaxotools.blastax.utils import fastq_to_fasta, is_fastq, remove_gaps
-
-    if is_fastq(input_query_path):
-        target_query_path = work_dir / input_query_path.with_suffix(".fasta").name
-        fastq_to_fasta(input_query_path, target_query_path)
-        input_query_path = target_query_path
 
-    stem = make_str_blast_safe(input_query_path.stem) + "_no_gaps"
-    input_query_path_no_gaps = work_dir / input_query_path.with_stem(stem).name
-    remove_gaps(input_query_path, input_query_path_no_gaps)
+    if prepared_query is None:
+        query_cache = QueryCache() if blast_use_cache else None
+        prepared_query = prepare_query(input_query_path, work_dir, query_cache)
+    input_query_path, input_query_path_no_gaps = prepared_query
 
     staging.add(output_paths=[blast_output_path])
     staging.stage()
@@ -460,10 +547,12 @@ def execute_single_database_single_query(
         run_blast(
             blast_binary=blast_method,
             query_path=input_query_path_no_gaps,
-            database_path=staging[input_database_path],
+            database_path=(database_staging or staging)[input_database_path],
             output_path=staging[blast_output_path],
             evalue=blast_evalue,
             num_threads=blast_num_threads,
+            shards=blast_num_shards,
+            cache=BlastCache() if blast_use_cache else None,
             outfmt=f"{blast_outfmt} {blast_outfmt_options}",
             other="",
         )
@@ -22,6 +22,7 @@ class Model(BlastTaskModel):
     blast_method = Property(BlastMethod, BlastMethod.blastx)
     blast_evalue = Property(float, 1e-5)
     blast_num_threads = Property(int, 1)
+    blast_num_shards = Property(int, 1)
     blast_extra_args = Property(str, '-outfmt "6 length pident qseqid sseqid sseq qframe sframe"')
 
     match_multiple = Property(bool, False)
@@ -89,6 +90,7 @@ class Model(BlastTaskModel):
             output_path=self.output_path,
             blast_evalue=self.blast_evalue or self.properties.blast_evalue.default,
             blast_num_threads=self.blast_num_threads or self.properties.blast_num_threads.default,
+            blast_num_shards=self.blast_num_shards or self.properties.blast_num_shards.default,
             match_multiple=self.match_multiple,
             match_pident=self.match_pident,
             match_length=self.match_length,
@@ -3,9 +3,7 @@ from pathlib import Path
 from time import perf_counter
 from traceback import print_exc
 
-from itaxotools.blastax.utils import make_str_blast_safe
-
-from ..common.process import StagingArea
+from ..common.process import StagingArea, prepare_query
 from ..common.types import BatchResults, Confirmation
 from .types import TargetPaths
 
@@ -32,6 +30,7 @@ def execute(
     specified_identifier: str | None,
     append_timestamp: bool,
     append_configuration: bool,
+    blast_num_shards: int = 1,
 ) -> BatchResults:
     from itaxotools import abort, get_feedback, progress_handler
 
@@ -44,6 +43,7 @@ def execute(
     print(f"{output_path=}")
     print(f"{blast_evalue=}")
     print(f"{blast_num_threads=}")
+    print(f"{blast_num_shards=}")
     print(f"{match_multiple=}")
     print(f"{match_pident=}")
     print(f"{match_length=}")
@@ -105,6 +105,7 @@ def execute(
                     blast_outfmt_options=blast_outfmt_options,
                     blast_evalue=blast_evalue,
                     blast_num_threads=blast_num_threads,
+                    blast_num_shards=blast_num_shards,
                     match_multiple=match_multiple,
                     match_pident=match_pident,
                     match_length=match_length,
@@ -142,18 +143,11 @@ def execute_single(
     match_pident: float,
     match_length: int,
     specified_identifier: str | None,
+    blast_num_shards: int = 1,
 ):
     from itaxotools.blastax.core import blastx_parse, run_blast
-    from itaxotools.blastax.utils import fastq_to_fasta, is_fastq, remove_gaps
-
-    if is_fastq(input_query_path):
-        target_query_path = work_dir / input_query_path.with_suffix(".fasta").name
-        fastq_to_fasta(input_query_path, target_query_path)
-        input_query_path = target_query_path
 
-    stem = make_str_blast_safe(input_query_path.stem) + "_no_gaps"
-    input_query_path_no_gaps = work_dir / input_query_path.with_stem(stem).name
-    remove_gaps(input_query_path, input_query_path_no_gaps)
+    input_query_path, input_query_path_no_gaps = prepare_query(input_query_path, work_dir)
 
     staging.add(output_paths=[blast_output_path])
     staging.stage()
@@ -166,6 +160,7 @@ def execute_single(
             output_path=staging[blast_output_path],
             evalue=blast_evalue,
             num_threads=blast_num_threads,
+            shards=blast_num_shards,
             outfmt=f"{blast_outfmt} {blast_outfmt_options}",
             other="",
         )
@@ -85,6 +85,16 @@ class OptionsSelector(Card):
         self.controls.blast_num_threads = field
         row += 1
 
+        name = QtWidgets.QLabel("Shards:")
+        field = IntPropertyLineEdit()
+        description = QtWidgets.QLabel("Number of BLAST+ processes that share the threads, each with part of the query")
+        description.setStyleSheet("QLabel { font-style: italic; }")
+        options_layout.addWidget(name, row, 1)
+        options_layout.addWidget(field, row, 2)
+        options_layout.addWidget(description, row, 3)
+        self.controls.blast_num_shards = field
+        row += 1
+
         options_long_layout = QtWidgets.QGridLayout()
         options_long_layout.setContentsMargins(0, 0, 0, 0)
         options_long_layout.setColumnMinimumWidth(0, 16)
@@ -298,6 +308,7 @@ class View(BlastTaskView):
         self.binder.bind(self.cards.blast_options.controls.blast_method.valueChanged, object.properties.blast_method)
 
         self.cards.blast_options.controls.blast_num_threads.bind_property(object.properties.blast_num_threads)
+        self.cards.blast_options.controls.blast_num_shards.bind_property(object.properties.blast_num_shards)
         self.cards.blast_options.controls.blast_evalue.bind_property(object.properties.blast_evalue)
         self.cards.blast_options.controls.blast_extra_args.bind_property(object.properties.blast_extra_args)
 
@@ -21,6 +21,7 @@ class Model(BlastTaskModel):
     blast_method = Property(BlastMethod, BlastMethod.blastn)
     blast_evalue = Property(float, 1e-5)
     blast_num_threads = Property(int, 1)
+    blast_num_shards = Property(int, 1)
     blast_outfmt = Property(int, 0)
     blast_outfmt_show_more = Property(bool, False)
     blast_outfmt_options = Property(
@@ -79,6 +80,7 @@ class Model(BlastTaskModel):
             blast_method=self.blast_method.executable,
             blast_evalue=self.blast_evalue or self.properties.blast_evalue.default,
             blast_num_threads=self.blast_num_threads or self.properties.blast_num_threads.default,
+            blast_num_shards=self.blast_num_shards or self.properties.blast_num_shards.default,
             blast_outfmt=self.blast_outfmt or self.properties.blast_outfmt.default,
             blast_outfmt_options=self.blast_outfmt_options or self.properties.blast_outfmt_options.default,
             blast_extra_args=self.blast_extra_args,
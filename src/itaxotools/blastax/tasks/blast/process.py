@@ -2,9 +2,7 @@ from datetime import datetime
 from pathlib import Path
 from time import perf_counter
 
-from itaxotools.blastax.utils import make_str_blast_safe
-
-from ..common.process import StagingArea
+from ..common.process import StagingArea, prepare_query
 from ..common.types import Confirmation, Results
 
 
@@ -29,10 +27,10 @@ def execute(
     blast_extra_args: str,
     append_timestamp: bool,
     append_configuration: bool,
+    blast_num_shards: int = 1,
 ) -> Results:
     from itaxotools import abort, get_feedback, progress_handler
     from itaxotools.blastax.core import get_blast_filename, run_blast
-    from itaxotools.blastax.utils import fastq_to_fasta, is_fastq, remove_gaps
 
     from ..common.types import BLAST_OUTFMT_SPECIFIERS_TABLE
 
@@ -46,6 +44,7 @@ def execute(
     print(f"{blast_method=}")
     print(f"{blast_evalue=}")
     print(f"{blast_num_threads=}")
+    print(f"{blast_num_shards=}")
     print(f"{blast_outfmt=}")
     print(f"{blast_outfmt_options=}")
     print(f"{blast_extra_args=}")
@@ -80,14 +79,7 @@ def execute(
 
     ts = perf_counter()
 
-    if is_fastq(input_query_path):
-        target_query_path = work_dir / input_query_path.with_suffix(".fasta").name
-        fastq_to_fasta(input_query_path, target_query_path)
-        input_query_path = target_query_path
-
-    stem = make_str_blast_safe(input_query_path.stem) + "_no_gaps"
-    input_query_path_no_gaps = work_dir / input_query_path.with_stem(stem).name
-    remove_gaps(input_query_path, input_query_path_no_gaps)
+    _, input_query_path_no_gaps = prepare_query(input_query_path, work_dir)
 
     progress_handler("Staging files", 0, 0, 0)
     staging.stage(verbose=True)
@@ -101,6 +93,7 @@ def execute(
             output_path=staging[blast_output_path],
             evalue=blast_evalue,
             num_threads=blast_num_threads,
+            shards=blast_num_shards,
             outfmt=f"{blast_outfmt} {blast_outfmt_options}",
             other=blast_extra_args,
             debug=True,
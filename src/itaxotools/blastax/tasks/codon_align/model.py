@@ -1,3 +1,4 @@
+import multiprocessing
 from datetime import datetime
 from pathlib import Path
 
@@ -22,11 +23,15 @@ class Model(BlastTaskModel):
     append_timestamp = Property(bool, False)
     append_configuration = Property(bool, True)
 
+    num_threads = Property(int, 1)
+
     def __init__(self, name=None):
         super().__init__(name, daemon=False)
         self.can_open = True
         self.can_save = False
 
+        self._update_num_threads_default()
+
         self.input_sequences.set_globs(["fa", "fas", "fasta"])
 
         self.binder.bind(self.input_sequences.properties.parent_path, self.properties.output_path)
@@ -65,7 +70,14 @@ class Model(BlastTaskModel):
             adjust_direction=self.adjust_direction,
             append_timestamp=self.append_timestamp,
             append_configuration=self.append_configuration,
+            num_threads=self.num_threads,
         )
 
+    def _update_num_threads_default(self):
+        cpus = multiprocessing.cpu_count()
+        property = self.properties.num_threads
+        setattr(property._parent, Property.key_default(property._key), cpus)
+        property.set(cpus)
+
     def open(self, path: Path):
         self.input_sequences.open(path)
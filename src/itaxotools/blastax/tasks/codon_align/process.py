@@ -1,8 +1,9 @@
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 from time import perf_counter
-from traceback import print_exc
 
+from ..common.process import run_scheduled_jobs
 from ..common.types import BatchResults, Confirmation
 from ..mafft.types import AdjustDirection, AlignmentStrategy
 from .types import TargetPaths
@@ -25,8 +26,9 @@ def execute(
     adjust_direction: AdjustDirection,
     append_timestamp: bool,
     append_configuration: bool,
+    num_threads: int = 1,
 ) -> BatchResults:
-    from itaxotools import abort, get_feedback, progress_handler
+    from itaxotools import abort, get_feedback
 
     print(f"{input_paths=}")
     print(f"{output_path=}")
@@ -35,9 +37,7 @@ def execute(
     print(f"{adjust_direction=}")
     print(f"{append_timestamp=}")
     print(f"{append_configuration=}")
-
-    total = len(input_paths)
-    failed: list[Path] = []
+    print(f"{num_threads=}")
 
     timestamp = datetime.now() if append_timestamp else None
     configuration: dict[str, str] = {}
@@ -56,31 +56,25 @@ def execute(
 
     ts = perf_counter()
 
-    for i, (input_path, target_paths) in enumerate(zip(input_paths, target_paths_list)):
-        progress_handler(f"Processing file {i+1}/{total}: {input_path.name}", i, 0, total)
-        try:
-            single_work_dir = work_dir / input_path.name
-            single_work_dir.mkdir()
-            execute_single(
-                work_dir=single_work_dir,
-                input_path=input_path,
-                output_path=target_paths.output_path,
-                codon_table=codon_table,
-                strategy=strategy,
-                adjust_direction=adjust_direction,
-            )
-        except Exception as e:
-            if total == 1:
-                raise e
-            with open(target_paths.error_log_path, "w") as f:
-                print_exc(file=f)
-            failed.append(input_path)
-
-    progress_handler("Done processing files.", total, 0, total)
+    jobs = [
+        partial(
+            execute_single,
+            work_dir=work_dir / input_path.name,
+            input_path=input_path,
+            output_path=target_paths.output_path,
+            codon_table=codon_table,
+            strategy=strategy,
+            adjust_direction=adjust_direction,
+        )
+        for input_path, target_paths in zip(input_paths, target_paths_list)
+    ]
+    error_log_paths = [target_paths.error_log_path for target_paths in target_paths_list]
+
+    _, failed, seconds_per_file = run_scheduled_jobs(jobs, input_paths, error_log_paths, num_threads)
 
     tf = perf_counter()
 
-    return BatchResults(output_path, failed, tf - ts)
+    return BatchResults(output_path, failed, tf - ts, seconds_per_file)
 
 
 def execute_single(
@@ -90,54 +84,47 @@ def execute_single(
     codon_table: int,
     strategy: AlignmentStrategy,
     adjust_direction: AdjustDirection,
+    num_threads: int = 1,
 ):
-    from Bio.Seq import Seq
-
-    from itaxotools.blastax.codons import batched
+    from itaxotools.blastax.codons import back_translate, get_codon_translator
     from itaxotools.mafftpy import MultipleSequenceAlignment
     from itaxotools.taxi2.sequences import Sequence, SequenceHandler
 
-    translated_path = work_dir / input_path.name
+    work_dir.mkdir()
 
-    input_sequences: list[Sequence] = []
+    translated_path = work_dir / input_path.name
+    normal_table = str.maketrans({"-": "", "?": "N"})
 
     with (
         SequenceHandler.Fasta(input_path) as input_file,
         SequenceHandler.Fasta(translated_path, "w", line_width=0) as translated_file,
     ):
-        normal_table = str.maketrans({"-": "", "?": "N"})
+        translator = get_codon_translator(codon_table, gap="-")
         for sequence in input_file:
-            normal_seq = sequence.seq.translate(normal_table)
-            sequence = Sequence(id=sequence.id, seq=normal_seq, extras=sequence.extras)
-            input_sequences.append(sequence)
-            codons = Seq(sequence.seq).translate(table=codon_table)
-            codon_sequence = Sequence(id=sequence.id, seq=str(codons), extras=sequence.extras)
+            codons = translator.translate(sequence.seq.translate(normal_table), strict=True)
+            codon_sequence = Sequence(id=sequence.id, seq=codons, extras=sequence.extras)
             translated_file.write(codon_sequence)
 
     task = MultipleSequenceAlignment(translated_path)
     task.vars.set_strategy(strategy.key)
     task.vars.set_adjust_direction(adjust_direction.key)
+    if num_threads > 1:
+        task.vars.numthreads = num_threads
     task.target = work_dir
 
     task.start()
     aligned_path = task.get_results_path()
 
+    # the input is read again alongside the alignment, instead of being kept in memory
     with (
+        SequenceHandler.Fasta(input_path) as input_file,
         SequenceHandler.Fasta(aligned_path) as aligned_file,
         SequenceHandler.Fasta(output_path, "w", line_width=0) as target_file,
     ):
-        for input_sequence, aligned_sequence in zip(input_sequences, aligned_file):
+        for input_sequence, aligned_sequence in zip(input_file, aligned_file):
             assert input_sequence.id == aligned_sequence.id
-            batches = batched(input_sequence.seq)
-
-            def get_next_nucleotides(codon: str) -> str:
-                if codon == "-":
-                    return "---"
-                return next(batches)
-
-            nucleotides = "".join(get_next_nucleotides(codon) for codon in aligned_sequence.seq)
+            nucleotides = back_translate(aligned_sequence.seq, input_sequence.seq.translate(normal_table))
             nucleotide_sequence = Sequence(id=input_sequence.id, seq=nucleotides, extras=input_sequence.extras)
-
             target_file.write(nucleotide_sequence)
 
 
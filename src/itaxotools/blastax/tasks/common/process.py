@@ -1,10 +1,18 @@
 import os
 import platform
 import shutil
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import partial
 from pathlib import Path
+from time import perf_counter
+from traceback import print_exception
+from typing import Callable, Iterator
 
+from itaxotools.blastax.cache import QueryCache
 from itaxotools.blastax.utils import make_str_blast_safe
 
+from .types import JobResult
+
 
 def _is_str_safe(text: str) -> bool:
     if not text.isascii():
@@ -144,7 +152,7 @@ class StagingArea:
                     if verbose:
                         print(f"Symlinked {src} -> {dst}")
                 else:
-                    shutil.copy(src, dst)
+                    shutil.copy2(src, dst)
                     if verbose:
                         print(f"Copied {src} -> {dst}")
             self._pending_copies.clear()
@@ -180,3 +188,199 @@ class StagingArea:
     def __exit__(self, *exc):
         self.unstage_outputs()
         self.cleanup()
+
+
+def split_thread_budget(num_threads: int, num_jobs: int, min_threads_per_job: int = 4) -> tuple[int, int]:
+    """Split a thread budget between concurrent jobs.
+
+    BLAST+ scales poorly past a few threads, so the budget is spread over
+    as many jobs as possible while giving each at least min_threads_per_job.
+    Returns the number of concurrent jobs and the threads given to each.
+    """
+    num_threads = max(1, num_threads)
+    workers = max(1, min(num_jobs, num_threads // min_threads_per_job))
+    return workers, max(1, num_threads // workers)
+
+
+def run_concurrent_jobs(jobs: list[Callable[[], object]], max_workers: int) -> Iterator[JobResult]:
+    """Run jobs on a thread pool and yield their results as they complete.
+
+    Jobs are expected to spend their time in subprocesses such as BLAST+,
+    so threads are enough to keep them busy. Exceptions are caught and
+    returned with the result, so that the caller can log them in order.
+    """
+    if max_workers <= 1:
+        for index, job in enumerate(jobs):
+            try:
+                yield JobResult(index, job(), None)
+            except Exception as e:
+                yield JobResult(index, None, e)
+        return
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(job): index for index, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                yield JobResult(index, future.result(), None)
+            except Exception as e:
+                yield JobResult(index, None, e)
+
+
+def run_parallel_jobs(jobs: list[Callable[[], object]], max_workers: int) -> Iterator[JobResult]:
+    """Run jobs on a process pool and yield their results as they complete.
+
+    Unlike run_concurrent_jobs, this is meant for jobs that spend their time
+    in Python code. Jobs must be picklable, such as partials of module-level
+    functions, and so must their results and exceptions.
+    """
+    if max_workers <= 1:
+        yield from run_concurrent_jobs(jobs, 1)
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(job): index for index, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                yield JobResult(index, future.result(), None)
+            except Exception as e:
+                yield JobResult(index, None, e)
+
+
+def run_batch_jobs(
+    jobs: list[Callable[[], object]],
+    input_paths: list[Path],
+    error_log_paths: list[Path] | None = None,
+    max_workers: int = 1,
+) -> tuple[list[object], list[Path]]:
+    """Run one job per input file and report progress as files are processed.
+
+    Jobs run on a process pool when max_workers is more than one, see
+    run_parallel_jobs. Returns the job values and the failed input paths,
+    both in input order, with None in place of the values of failed jobs.
+    Failed jobs have their traceback written to the matching error log.
+    Without error logs, or for a single file, the first error is raised.
+    """
+    from itaxotools import progress_handler
+
+    total = len(jobs)
+    values: list[object] = [None] * total
+    errors: dict[int, Exception] = {}
+
+    if max_workers <= 1 or total <= 1:
+        for i, (job, path) in enumerate(zip(jobs, input_paths)):
+            progress_handler(f"Processing file {i+1}/{total}: {path.name}", i, 0, total)
+            try:
+                values[i] = job()
+            except Exception as e:
+                if total == 1 or error_log_paths is None:
+                    raise e
+                errors[i] = e
+    else:
+        progress_handler(f"Processing {total} files with {min(max_workers, total)} workers", 0, 0, total)
+        for done, (index, value, error) in enumerate(run_parallel_jobs(jobs, max_workers), 1):
+            progress_handler(f"Processed file {done}/{total}: {input_paths[index].name}", done, 0, total)
+            if error is not None:
+                errors[index] = error
+            values[index] = value
+        if errors and error_log_paths is None:
+            raise errors[min(errors)]
+
+    for index, error in sorted(errors.items()):
+        with open(error_log_paths[index], "w") as f:
+            print_exception(error, file=f)
+
+    progress_handler("Done processing files.", total, 0, total)
+
+    return values, [input_paths[index] for index in sorted(errors)]
+
+
+def run_timed(job: Callable[[], object]) -> tuple[object, float]:
+    """Run a job and return its value along with the seconds it took."""
+    ts = perf_counter()
+    value = job()
+    return value, perf_counter() - ts
+
+
+def run_scheduled_jobs(
+    jobs: list[Callable[..., object]],
+    input_paths: list[Path],
+    error_log_paths: list[Path] | None = None,
+    num_threads: int = 1,
+    min_threads_per_job: int = 1,
+) -> tuple[list[object], list[Path], dict[Path, float]]:
+    """Run one multithreaded job per input file within a global thread budget.
+
+    The budget is split between concurrent jobs with split_thread_budget,
+    and each job is called with its share as the num_threads keyword.
+    Files are started largest first, so that a big file does not end up
+    running alone at the end of the batch. Returns the values and failed
+    paths as run_batch_jobs does, along with the seconds taken by each
+    successful job, all in input order.
+    """
+    workers, threads = split_thread_budget(num_threads, len(jobs), min_threads_per_job)
+    order = sorted(range(len(jobs)), key=lambda index: input_paths[index].stat().st_size, reverse=True)
+
+    scheduled_jobs = [partial(run_timed, partial(jobs[index], num_threads=threads)) for index in order]
+    scheduled_paths = [input_paths[index] for index in order]
+    scheduled_error_log_paths = None
+    if error_log_paths is not None:
+        scheduled_error_log_paths = [error_log_paths[index] for index in order]
+
+    timed_values, _ = run_batch_jobs(scheduled_jobs, scheduled_paths, scheduled_error_log_paths, workers)
+
+    values: list[object] = [None] * len(jobs)
+    seconds: dict[int, float] = {}
+    for index, timed_value in zip(order, timed_values):
+        if timed_value is not None:
+            values[index], seconds[index] = timed_value
+    failed = [input_paths[index] for index in range(len(jobs)) if index not in seconds]
+    return values, failed, {input_paths[index]: seconds[index] for index in sorted(seconds)}
+
+
+def get_converted_query_path(query_path: Path, work_dir: Path) -> Path | None:
+    """Returns where to write a FASTQ or gzipped query as plain FASTA, or None for plain FASTA queries"""
+    from itaxotools.blastax.utils import get_query_format, is_gzip
+
+    path = Path(query_path.name)
+    compressed = is_gzip(query_path)
+    if compressed and path.suffix == ".gz":
+        path = Path(path.stem)
+    if get_query_format(query_path) == "fastq":
+        path = path.with_suffix(".fasta")
+    elif not compressed:
+        return None
+    return work_dir / path.name
+
+
+def get_normalized_query_path(query_path: Path, work_dir: Path) -> Path:
+    path = get_converted_query_path(query_path, work_dir) or work_dir / query_path.name
+    stem = make_str_blast_safe(path.stem) + "_no_gaps"
+    return work_dir / path.with_stem(stem).name
+
+
+def prepare_query(query_path: Path, work_dir: Path, cache: QueryCache | None = None) -> tuple[Path, Path]:
+    """Normalize a query file for BLAST+ and return the paths of the query as FASTA and of the result.
+
+    FASTQ conversion, gap removal and the header check are done in a single
+    pass over the query, which may be gzipped. FASTQ and gzipped queries are
+    also written to work_dir as plain FASTA with their gaps kept, for the steps
+    that read the original sequences; plain FASTA queries are returned as is.
+    If a cache is given, queries with the same contents are only normalized once.
+    """
+    from itaxotools.blastax.utils import normalize_query
+
+    fasta_path = get_converted_query_path(query_path, work_dir)
+    output_path = get_normalized_query_path(query_path, work_dir)
+    key = None
+    if cache is not None:
+        key = cache.key(query_path)
+        if cache.get(key, output_path) and (fasta_path is None or cache.get(key + "-fasta", fasta_path)):
+            return fasta_path or query_path, output_path
+    normalize_query(query_path, output_path, fasta_path)
+    if cache is not None:
+        cache.put(key, output_path)
+        if fasta_path is not None:
+            cache.put(key + "-fasta", fasta_path)
+    return fasta_path or query_path, output_path
@@ -20,6 +20,7 @@ class BatchResults(NamedTuple):
     output_path: Path
     failed: list[Path]
     seconds_taken: float
+    seconds_per_file: dict[Path, float] | None = None
 
 
 class DoubleBatchResults(NamedTuple):
@@ -28,6 +29,12 @@ class DoubleBatchResults(NamedTuple):
     seconds_taken: float
 
 
+class JobResult(NamedTuple):
+    index: int
+    value: object
+    error: BaseException | None
+
+
 class Confirmation(NamedTuple):
     kind: str
     path: Path | None = None
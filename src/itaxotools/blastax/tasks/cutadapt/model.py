@@ -38,6 +38,8 @@ class Model(BlastTaskModel):
     append_timestamp = Property(bool, False)
     append_configuration = Property(bool, True)
 
+    num_workers = Property(int, 1)
+
     def __init__(self, name=None):
         super().__init__(name, daemon=False)
         self.can_open = True
@@ -47,6 +49,7 @@ class Model(BlastTaskModel):
         self.input_paths.set_globs(["fa", "fas", "fasta", "fq", "fastq"])
 
         self._update_num_threads_default()
+        self._update_num_workers_default()
         self.binder.bind(self.input_paths.properties.parent_path, self.properties.output_dir)
 
         self.subtask_init = SubtaskModel(self, bind_busy=False)
@@ -105,6 +108,7 @@ class Model(BlastTaskModel):
             write_reports=self.write_reports,
             append_timestamp=self.append_timestamp,
             append_configuration=self.append_configuration,
+            num_workers=self.num_workers,
         )
 
     def _update_num_threads_default(self):
@@ -113,5 +117,11 @@ class Model(BlastTaskModel):
         setattr(property._parent, Property.key_default(property._key), cpus)
         property.set(cpus)
 
+    def _update_num_workers_default(self):
+        cpus = multiprocessing.cpu_count()
+        property = self.properties.num_workers
+        setattr(property._parent, Property.key_default(property._key), cpus)
+        property.set(cpus)
+
     def open(self, path: Path):
         self.input_paths.open(path)
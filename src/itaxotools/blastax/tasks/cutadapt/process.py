@@ -1,10 +1,11 @@
 import io
 import sys
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 from time import perf_counter
-from traceback import print_exc
 
+from ..common.process import run_batch_jobs
 from ..common.types import Confirmation
 from .types import CutAdaptResults, TargetPaths
 
@@ -39,8 +40,9 @@ def execute(
     write_reports: bool,
     append_timestamp: bool,
     append_configuration: bool,
+    num_workers: int = 1,
 ) -> CutAdaptResults:
-    from itaxotools import abort, get_feedback, progress_handler
+    from itaxotools import abort, get_feedback
 
     adapters_a_list = [line.strip() for line in adapters_a.splitlines()]
     adapters_g_list = [line.strip() for line in adapters_g.splitlines()]
@@ -63,9 +65,7 @@ def execute(
     print(f"{write_reports=}")
     print(f"{append_timestamp=}")
     print(f"{append_configuration=}")
-
-    total = len(input_paths)
-    failed: list[Path] = []
+    print(f"{num_workers=}")
 
     timestamp = datetime.now() if append_timestamp else None
     options: dict[str, str] = {}
@@ -96,52 +96,46 @@ def execute(
 
     ts = perf_counter()
 
-    sum_reads_total = 0
-    sum_bp_total = 0
-    sum_quality_trimmed = 0
-    sum_reads_cut = 0
-    file_count = 0
-
-    for i, (path, target) in enumerate(zip(input_paths, target_paths_list)):
-        progress_handler(f"Processing file {i+1}/{total}: {path.name}", i, 0, total)
-        try:
-            reads_total, bp_total, quality_trimmed, reads_cut = execute_single(
-                input_path=path,
-                output_path=target.output_path,
-                report_path=target.report_path,
-                adapters_a_list=adapters_a_list,
-                adapters_g_list=adapters_g_list,
-                quality_trim_enabled=quality_trim_enabled,
-                quality_trim_a=quality_trim_a,
-                quality_trim_g=quality_trim_g,
-                cutadapt_action=cutadapt_action,
-                cutadapt_error_rate=cutadapt_error_rate,
-                cutadapt_overlap=cutadapt_overlap,
-                cutadapt_num_threads=cutadapt_num_threads,
-                cutadapt_extra_args=cutadapt_extra_args,
-                cutadapt_no_indels=cutadapt_no_indels,
-                cutadapt_reverse_complement=cutadapt_reverse_complement,
-                cutadapt_trim_poly_a=cutadapt_trim_poly_a,
-            )
-            sum_reads_total += reads_total
-            sum_bp_total += bp_total
-            sum_quality_trimmed += quality_trimmed
-            sum_reads_cut += reads_cut
-            file_count += 1
-        except Exception as e:
-            if total == 1:
-                raise e
-            with open(target.error_log_path, "w") as f:
-                print_exc(file=f)
-            failed.append(path)
+    jobs = [
+        partial(
+            execute_single,
+            input_path=path,
+            output_path=target.output_path,
+            report_path=target.report_path,
+            adapters_a_list=adapters_a_list,
+            adapters_g_list=adapters_g_list,
+            quality_trim_enabled=quality_trim_enabled,
+            quality_trim_a=quality_trim_a,
+            quality_trim_g=quality_trim_g,
+            cutadapt_action=cutadapt_action,
+            cutadapt_error_rate=cutadapt_error_rate,
+            cutadapt_overlap=cutadapt_overlap,
+            cutadapt_num_threads=cutadapt_num_threads,
+            cutadapt_extra_args=cutadapt_extra_args,
+            cutadapt_no_indels=cutadapt_no_indels,
+            cutadapt_reverse_complement=cutadapt_reverse_complement,
+            cutadapt_trim_poly_a=cutadapt_trim_poly_a,
+        )
+        for path, target in zip(input_paths, target_paths_list)
+    ]
+    error_log_paths = [target.error_log_path for target in target_paths_list]
+
+    # each file already runs on cutadapt_num_threads cores
+    file_workers = max(num_workers // max(cutadapt_num_threads, 1), 1)
+
+    values, failed = run_batch_jobs(jobs, input_paths, error_log_paths, file_workers)
+    stats = [value for value in values if value is not None]
+
+    sum_reads_total = sum(reads_total for reads_total, _, _, _ in stats)
+    sum_bp_total = sum(bp_total for _, bp_total, _, _ in stats)
+    sum_quality_trimmed = sum(quality_trimmed for _, _, quality_trimmed, _ in stats)
+    sum_reads_cut = sum(reads_cut for _, _, _, reads_cut in stats)
 
     if not quality_trim_enabled:
         sum_quality_trimmed = -1
     if not (adapters_a_list or adapters_g_list):
         sum_reads_cut = -1
 
-    progress_handler("Done processing files.", total, 0, total)
-
     tf = perf_counter()
 
     return CutAdaptResults(
@@ -22,6 +22,9 @@ class Model(BlastTaskModel):
     blast_method = Property(BlastMethod, BlastMethod.blastn)
     blast_evalue = Property(float, 1e-5)
     blast_num_threads = Property(int, 1)
+    blast_num_shards = Property(int, 1)
+    blast_use_cache = Property(bool, False)
+    blast_single_search = Property(bool, False)
     blast_extra_args = Property(str, '-outfmt "6 qseqid sseqid pident bitscore length"')
 
     decont_variable = Property(DecontVariable, DecontVariable.pident)
@@ -78,6 +81,9 @@ class Model(BlastTaskModel):
             blast_method=self.blast_method.executable,
             blast_evalue=self.blast_evalue or self.properties.blast_evalue.default,
             blast_num_threads=self.blast_num_threads or self.properties.blast_num_threads.default,
+            blast_num_shards=self.blast_num_shards or self.properties.blast_num_shards.default,
+            blast_use_cache=self.blast_use_cache,
+            blast_single_search=self.blast_single_search,
             decont_column=self.decont_variable.column,
             append_timestamp=self.append_timestamp,
             append_configuration=self.append_configuration,
@@ -3,9 +3,7 @@ from pathlib import Path
 from time import perf_counter
 from traceback import print_exc
 
-from itaxotools.blastax.utils import make_str_blast_safe
-
-from ..common.process import StagingArea
+from ..common.process import StagingArea, prepare_query
 from ..common.types import BatchResults, Confirmation
 from .types import TargetPaths
 
@@ -30,6 +28,9 @@ def execute(
     blast_num_threads: int,
     append_timestamp: bool,
     append_configuration: bool,
+    blast_num_shards: int = 1,
+    blast_use_cache: bool = False,
+    blast_single_search: bool = False,
 ) -> BatchResults:
     from itaxotools import abort, get_feedback, progress_handler
 
@@ -45,6 +46,9 @@ def execute(
     print(f"{blast_method=}")
     print(f"{blast_evalue=}")
     print(f"{blast_num_threads=}")
+    print(f"{blast_num_shards=}")
+    print(f"{blast_use_cache=}")
+    print(f"{blast_single_search=}")
     print(f"{append_timestamp=}")
     print(f"{append_configuration=}")
 
@@ -82,6 +86,15 @@ def execute(
     staging.stage(verbose=True)
 
     try:
+        ingroup_accessions = None
+        if blast_single_search:
+            progress_handler("Reading database accessions", 0, 0, 0)
+            ingroup_accessions = get_single_search_accessions(
+                staging[ingroup_database_path],
+                staging[outgroup_database_path],
+                use_cache=blast_use_cache,
+            )
+
         for i, (path, target) in enumerate(zip(input_query_paths, target_paths_list)):
             progress_handler(f"Processing file {i+1}/{total}: {path.name}", i, 0, total)
             try:
@@ -99,6 +112,9 @@ def execute(
                     blast_method=blast_method,
                     blast_evalue=blast_evalue,
                     blast_num_threads=blast_num_threads,
+                    blast_num_shards=blast_num_shards,
+                    blast_use_cache=blast_use_cache,
+                    ingroup_accessions=ingroup_accessions,
                 )
             except Exception as e:
                 if total == 1:
@@ -130,40 +146,56 @@ def execute_single(
     blast_method: str,
     blast_evalue: float,
     blast_num_threads: int,
+    blast_num_shards: int = 1,
+    blast_use_cache: bool = False,
+    ingroup_accessions: set[str] | None = None,
 ):
-    from itaxotools.blastax.core import decontaminate, run_blast_decont
-    from itaxotools.blastax.utils import fastq_to_fasta, is_fastq, remove_gaps
+    from itaxotools.blastax.cache import BlastCache, QueryCache
+    from itaxotools.blastax.core import decontaminate, run_blast_decont, run_blast_decont_combined
 
-    if is_fastq(input_query_path):
-        target_query_path = work_dir / input_query_path.with_suffix(".fasta").name
-        fastq_to_fasta(input_query_path, target_query_path)
-        input_query_path = target_query_path
-
-    stem = make_str_blast_safe(input_query_path.stem) + "_no_gaps"
-    input_query_path_no_gaps = work_dir / input_query_path.with_stem(stem).name
-    remove_gaps(input_query_path, input_query_path_no_gaps)
+    query_cache = QueryCache() if blast_use_cache else None
+    input_query_path, input_query_path_no_gaps = prepare_query(input_query_path, work_dir, query_cache)
 
     staging.add(output_paths=[blasted_ingroup_path, blasted_outgroup_path])
     staging.stage()
 
     try:
-        run_blast_decont(
-            blast_binary=blast_method,
-            query_path=input_query_path_no_gaps,
-            database_path=staging[ingroup_database_path],
-            output_path=staging[blasted_ingroup_path],
-            evalue=blast_evalue,
-            num_threads=blast_num_threads,
-        )
-
-        run_blast_decont(
-            blast_binary=blast_method,
-            query_path=input_query_path_no_gaps,
-            database_path=staging[outgroup_database_path],
-            output_path=staging[blasted_outgroup_path],
-            evalue=blast_evalue,
-            num_threads=blast_num_threads,
-        )
+        if ingroup_accessions is not None:
+            run_blast_decont_combined(
+                blast_binary=blast_method,
+                query_path=input_query_path_no_gaps,
+                ingroup_database_path=staging[ingroup_database_path],
+                outgroup_database_path=staging[outgroup_database_path],
+                ingroup_accessions=ingroup_accessions,
+                blasted_ingroup_path=staging[blasted_ingroup_path],
+                blasted_outgroup_path=staging[blasted_outgroup_path],
+                evalue=blast_evalue,
+                num_threads=blast_num_threads,
+                shards=blast_num_shards,
+                cache=BlastCache() if blast_use_cache else None,
+            )
+        else:
+            run_blast_decont(
+                blast_binary=blast_method,
+                query_path=input_query_path_no_gaps,
+                database_path=staging[ingroup_database_path],
+                output_path=staging[blasted_ingroup_path],
+                evalue=blast_evalue,
+                num_threads=blast_num_threads,
+                shards=blast_num_shards,
+                cache=BlastCache() if blast_use_cache else None,
+            )
+
+            run_blast_decont(
+                blast_binary=blast_method,
+                query_path=input_query_path_no_gaps,
+                database_path=staging[outgroup_database_path],
+                output_path=staging[blasted_outgroup_path],
+                evalue=blast_evalue,
+                num_threads=blast_num_threads,
+                shards=blast_num_shards,
+                cache=BlastCache() if blast_use_cache else None,
+            )
 
         decontaminate(
             query_path=input_query_path,
@@ -177,6 +209,23 @@ def execute_single(
         staging.unstage_outputs()
 
 
+def get_single_search_accessions(
+    ingroup_database_path: Path, outgroup_database_path: Path, use_cache: bool = False
+) -> set[str] | None:
+    """Get the ingroup accessions needed to search both databases at once, or None if they overlap"""
+    from itaxotools.blastax.cache import AccessionCache
+    from itaxotools.blastax.core import get_database_accessions
+
+    cache = AccessionCache() if use_cache else None
+    ingroup_accessions = get_database_accessions(ingroup_database_path, cache=cache)
+    outgroup_accessions = get_database_accessions(outgroup_database_path, cache=cache)
+    shared = ingroup_accessions & outgroup_accessions
+    if shared:
+        print(f"Databases share {len(shared)} accessions, searching them separately instead")
+        return None
+    return ingroup_accessions
+
+
 def get_target_paths(
     query_path: Path,
     output_path: Path,
@@ -79,6 +79,16 @@ class BlastOptionSelector(Card):
         self.controls.blast_num_threads = field
         row += 1
 
+        name = QtWidgets.QLabel("Shards:")
+        field = IntPropertyLineEdit()
+        description = QtWidgets.QLabel("Number of BLAST+ processes that share the threads, each with part of the query")
+        description.setStyleSheet("QLabel { font-style: italic; }")
+        options_layout.addWidget(name, row, 1)
+        options_layout.addWidget(field, row, 2)
+        options_layout.addWidget(description, row, 3)
+        self.controls.blast_num_shards = field
+        row += 1
+
         options_long_layout = QtWidgets.QGridLayout()
         options_long_layout.setContentsMargins(0, 0, 0, 0)
         options_long_layout.setColumnMinimumWidth(0, 16)
@@ -97,9 +107,22 @@ class BlastOptionSelector(Card):
         self.controls.blast_extra_args = field
         row += 1
 
+        options_checks_layout = QtWidgets.QVBoxLayout()
+        options_checks_layout.setContentsMargins(16, 4, 0, 8)
+        options_checks_layout.setSpacing(8)
+
+        field = QtWidgets.QCheckBox("Cache BLAST results on disk and reuse them for identical searches.")
+        self.controls.blast_use_cache = field
+        options_checks_layout.addWidget(field)
+
+        field = QtWidgets.QCheckBox("Search both databases in one BLAST+ run (e-values use their combined size).")
+        self.controls.blast_single_search = field
+        options_checks_layout.addWidget(field)
+
         self.addLayout(title_layout)
         self.addLayout(options_layout)
         self.addLayout(options_long_layout)
+        self.addLayout(options_checks_layout)
 
 
 class DecontVariableSelector(Card):
@@ -213,6 +236,20 @@ class View(BlastTaskView):
         self.binder.bind(self.cards.blast_options.controls.blast_method.valueChanged, object.properties.blast_method)
 
         self.cards.blast_options.controls.blast_num_threads.bind_property(object.properties.blast_num_threads)
+        self.cards.blast_options.controls.blast_num_shards.bind_property(object.properties.blast_num_shards)
+
+        self.binder.bind(
+            object.properties.blast_use_cache, self.cards.blast_options.controls.blast_use_cache.setChecked
+        )
+        self.binder.bind(self.cards.blast_options.controls.blast_use_cache.toggled, object.properties.blast_use_cache)
+
+        self.binder.bind(
+            object.properties.blast_single_search, self.cards.blast_options.controls.blast_single_search.setChecked
+        )
+        self.binder.bind(
+            self.cards.blast_options.controls.blast_single_search.toggled, object.properties.blast_single_search
+        )
+
         self.cards.blast_options.controls.blast_evalue.bind_property(object.properties.blast_evalue)
         self.cards.blast_options.controls.blast_extra_args.bind_property(object.properties.blast_extra_args)
 
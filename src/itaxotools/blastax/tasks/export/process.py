@@ -1,5 +1,6 @@
 import re
 from pathlib import Path
+from threading import Event
 from time import perf_counter
 
 from ..common.process import StagingArea
@@ -63,17 +64,64 @@ def database_to_fasta(
     return Results(output_path, tf - ts)
 
 
+class _TaxidScanner:
+    """Consume the %T export of a database, stopping as soon as a sequence without a taxID is found"""
+
+    def __init__(self, cancel_event: Event):
+        self.cancel_event = cancel_event
+        self.tail = b""
+        self.has_content = False
+        self.has_missing = False
+
+    def __call__(self, chunk: bytes):
+        lines = (self.tail + chunk).split(b"\n")
+        self.tail = lines.pop()
+        for line in lines:
+            self.check(line)
+
+    def check(self, line: bytes):
+        line = line.strip()
+        if line:
+            self.has_content = True
+        if not line or line == b"0":
+            self.has_missing = True
+            self.cancel_event.set()
+
+    def finish(self) -> bool | None:
+        if self.tail:
+            self.check(self.tail)
+        if not self.has_content:
+            return None
+        return not self.has_missing
+
+
+def _scan_database_taxids(database_path: Path) -> bool | None:
+    from itaxotools.blastax.blast import BlastCancelled
+    from itaxotools.blastax.core import run_blast_export
+
+    scanner = _TaxidScanner(Event())
+    try:
+        run_blast_export(
+            database_path=database_path,
+            output_path=None,
+            outfmt="%T",
+            debug=True,
+            stdout_consumer=scanner,
+            cancel_event=scanner.cancel_event,
+        )
+    except BlastCancelled:
+        return False
+    return scanner.finish()
+
+
 def database_check_taxid(
     work_dir: Path,
     input_database_path: Path,
 ) -> Results:
     from itaxotools import abort, get_feedback, progress_handler
-    from itaxotools.blastax.core import run_blast_export
 
     print(f"{input_database_path=}")
 
-    blast_outfmt = "%T"
-
     staging = StagingArea(work_dir)
     staging.add(db_paths=[input_database_path])
     if staging.requires_copy():
@@ -85,25 +133,12 @@ def database_check_taxid(
 
     try:
         progress_handler("Running BLAST+", 0, 0, 0)
-        output_bytes = run_blast_export(
-            database_path=staging[input_database_path],
-            output_path=None,
-            outfmt=blast_outfmt,
-            debug=True,
-        )
+        has_taxids = _scan_database_taxids(staging[input_database_path])
         progress_handler("Done.", 1, 0, 1)
     finally:
         staging.cleanup()
 
-    output = output_bytes.decode("utf-8")
-    if not output.strip():
-        return None
-
-    for line in output.splitlines():
-        if not line.strip() or line.strip() == "0":
-            return False
-
-    return True
+    return has_taxids
 
 
 def _parse_database_version(info_output: str) -> int | None:
@@ -127,7 +162,7 @@ def database_check_info(
     input_database_path: Path,
 ):
     from itaxotools import abort, get_feedback, progress_handler
-    from itaxotools.blastax.core import get_database_info, run_blast_export
+    from itaxotools.blastax.core import get_database_info
 
     print(f"{input_database_path=}")
 
@@ -152,26 +187,11 @@ def database_check_info(
         version = _parse_database_version(info_output)
 
         progress_handler("Checking taxonomy IDs...", 0, 0, 0)
-        output_bytes = run_blast_export(
-            database_path=staging[input_database_path],
-            output_path=None,
-            outfmt="%T",
-            debug=True,
-        )
+        has_taxids = _scan_database_taxids(staging[input_database_path])
         progress_handler("Done.", 1, 0, 1)
     finally:
         staging.cleanup()
 
-    output = output_bytes.decode("utf-8")
-    if not output.strip():
-        has_taxids = None
-    else:
-        has_taxids = True
-        for line in output.splitlines():
-            if not line.strip() or line.strip() == "0":
-                has_taxids = False
-                break
-
     return DatabaseInfo(version, db_type, has_taxids)
 
 
@@ -20,11 +20,11 @@ def execute(
     pattern_sequence: str,
     compress: bool,
 ) -> WarnResults:
-    import gzip
     import warnings
 
     from itaxotools import progress_handler
     from itaxotools.blastax.fastmerge import fastmerge
+    from itaxotools.blastax.fastutils import open_gzip
 
     print(f"{input_paths=}")
     print(f"{output_path=}")
@@ -41,15 +41,15 @@ def execute(
     total = len(file_list)
 
     if compress:
-        output = gzip.open(output_file + ".gz", mode="wt", errors="replace")
+        output = open_gzip(output_file + ".gz", mode="wt", errors="replace")
     else:
-        output = open(output_file, mode="w", errors="replace")
+        output = open(output_file, mode="w", errors="replace", buffering=1 << 20)
 
     def progress_callback(file: str, index: int, total: int):
         path = Path(file)
         progress_handler(f"Processing file {index+1}/{total}: {path.name}", index, 0, total)
 
-    with warnings.catch_warnings(record=True) as warns:
+    with output, warnings.catch_warnings(record=True) as warns:
         fastmerge(
             file_list=file_list,
             file_types=file_types,
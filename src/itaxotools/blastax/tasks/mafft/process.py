@@ -1,8 +1,9 @@
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 from time import perf_counter
-from traceback import print_exc
 
+from ..common.process import run_scheduled_jobs
 from ..common.types import BatchResults, Confirmation
 from .types import AdjustDirection, AlignmentStrategy, TargetPaths
 
@@ -23,8 +24,9 @@ def execute(
     adjust_direction: AdjustDirection,
     append_timestamp: bool,
     append_configuration: bool,
+    num_threads: int = 1,
 ) -> BatchResults:
-    from itaxotools import abort, get_feedback, progress_handler
+    from itaxotools import abort, get_feedback
 
     print(f"{input_paths=}")
     print(f"{output_path=}")
@@ -32,9 +34,7 @@ def execute(
     print(f"{adjust_direction=}")
     print(f"{append_timestamp=}")
     print(f"{append_configuration=}")
-
-    total = len(input_paths)
-    failed: list[Path] = []
+    print(f"{num_threads=}")
 
     timestamp = datetime.now() if append_timestamp else None
     configuration: dict[str, str] = {}
@@ -53,30 +53,24 @@ def execute(
 
     ts = perf_counter()
 
-    for i, (input_path, target_paths) in enumerate(zip(input_paths, target_paths_list)):
-        progress_handler(f"Processing file {i+1}/{total}: {input_path.name}", i, 0, total)
-        try:
-            single_work_dir = work_dir / input_path.name
-            single_work_dir.mkdir()
-            execute_single(
-                work_dir=single_work_dir,
-                input_path=input_path,
-                output_path=target_paths.output_path,
-                strategy=strategy,
-                adjust_direction=adjust_direction,
-            )
-        except Exception as e:
-            if total == 1:
-                raise e
-            with open(target_paths.error_log_path, "w") as f:
-                print_exc(file=f)
-            failed.append(input_path)
-
-    progress_handler("Done processing files.", total, 0, total)
+    jobs = [
+        partial(
+            execute_single,
+            work_dir=work_dir / input_path.name,
+            input_path=input_path,
+            output_path=target_paths.output_path,
+            strategy=strategy,
+            adjust_direction=adjust_direction,
+        )
+        for input_path, target_paths in zip(input_paths, target_paths_list)
+    ]
+    error_log_paths = [target_paths.error_log_path for target_paths in target_paths_list]
+
+    _, failed, seconds_per_file = run_scheduled_jobs(jobs, input_paths, error_log_paths, num_threads)
 
     tf = perf_counter()
 
-    return BatchResults(output_path, failed, tf - ts)
+    return BatchResults(output_path, failed, tf - ts, seconds_per_file)
 
 
 def execute_single(
@@ -85,12 +79,17 @@ def execute_single(
     output_path: Path,
     strategy: AlignmentStrategy,
     adjust_direction: AdjustDirection,
+    num_threads: int = 1,
 ):
     from itaxotools.mafftpy import MultipleSequenceAlignment
 
+    work_dir.mkdir()
+
     task = MultipleSequenceAlignment(input_path)
     task.vars.set_strategy(strategy.key)
     task.vars.set_adjust_direction(adjust_direction.key)
+    if num_threads > 1:
+        task.vars.numthreads = num_threads
     task.target = work_dir
 
     task.start()
@@ -25,6 +25,8 @@ class Model(BlastTaskModel):
     blast_method = Property(BlastMethod, BlastMethod.blastn)
     blast_evalue = Property(float, 1e-5)
     blast_num_threads = Property(int, 1)
+    blast_num_shards = Property(int, 1)
+    blast_use_cache = Property(bool, False)
     blast_extra_args = Property(str, '-outfmt "6 qseqid sseqid sacc stitle pident qseq"')
 
     append_timestamp = Property(bool, False)
@@ -74,6 +76,8 @@ class Model(BlastTaskModel):
             output_path=self.output_path,
             blast_evalue=self.blast_evalue or self.properties.blast_evalue.default,
             blast_num_threads=self.blast_num_threads or self.properties.blast_num_threads.default,
+            blast_num_shards=self.blast_num_shards or self.properties.blast_num_shards.default,
+            blast_use_cache=self.blast_use_cache,
             pident_threshold=self.pident_threshold,
             retrieve_original=self.retrieve_original,
             deduplicate=self.deduplicate,
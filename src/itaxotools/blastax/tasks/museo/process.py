@@ -3,9 +3,7 @@ from pathlib import Path
 from time import perf_counter
 from traceback import print_exc
 
-from itaxotools.blastax.utils import make_str_blast_safe
-
-from ..common.process import StagingArea
+from ..common.process import StagingArea, prepare_query
 from ..common.types import BatchResults, Confirmation
 from .types import TargetPaths
 
@@ -30,6 +28,8 @@ def execute(
     deduplicate: bool,
     append_timestamp: bool,
     append_configuration: bool,
+    blast_num_shards: int = 1,
+    blast_use_cache: bool = False,
 ) -> BatchResults:
     from itaxotools import abort, get_feedback, progress_handler
 
@@ -42,6 +42,8 @@ def execute(
     print(f"{output_path=}")
     print(f"{blast_evalue=}")
     print(f"{blast_num_threads=}")
+    print(f"{blast_num_shards=}")
+    print(f"{blast_use_cache=}")
     print(f"{pident_threshold=}")
     print(f"{retrieve_original=}")
     print(f"{deduplicate=}")
@@ -103,6 +105,8 @@ def execute(
                     blast_method=blast_method,
                     blast_evalue=blast_evalue,
                     blast_num_threads=blast_num_threads,
+                    blast_num_shards=blast_num_shards,
+                    blast_use_cache=blast_use_cache,
                     blast_outfmt=blast_outfmt,
                     blast_outfmt_options=blast_outfmt_options,
                     pident_threshold=pident_threshold,
@@ -140,18 +144,14 @@ def execute_single(
     pident_threshold: float,
     retrieve_original: bool,
     deduplicate: bool,
+    blast_num_shards: int = 1,
+    blast_use_cache: bool = False,
 ):
+    from itaxotools.blastax.cache import BlastCache, QueryCache
     from itaxotools.blastax.core import museoscript, run_blast
-    from itaxotools.blastax.utils import fastq_to_fasta, is_fastq, remove_gaps
-
-    if is_fastq(input_query_path):
-        target_query_path = work_dir / input_query_path.with_suffix(".fasta").name
-        fastq_to_fasta(input_query_path, target_query_path)
-        input_query_path = target_query_path
 
-    stem = make_str_blast_safe(input_query_path.stem) + "_no_gaps"
-    input_query_path_no_gaps = work_dir / input_query_path.with_stem(stem).name
-    remove_gaps(input_query_path, input_query_path_no_gaps)
+    query_cache = QueryCache() if blast_use_cache else None
+    _, input_query_path_no_gaps = prepare_query(input_query_path, work_dir, query_cache)
 
     staging.add(output_paths=[blast_output_path])
     staging.stage()
@@ -164,6 +164,8 @@ def execute_single(
             output_path=staging[blast_output_path],
             evalue=blast_evalue,
             num_threads=blast_num_threads,
+            shards=blast_num_shards,
+            cache=BlastCache() if blast_use_cache else None,
             outfmt=f"{blast_outfmt} {blast_outfmt_options}",
             other="",
         )
@@ -1,3 +1,4 @@
+import multiprocessing
 from pathlib import Path
 
 from itaxotools.common.bindings import Instance, Property
@@ -37,11 +38,15 @@ class Model(BlastTaskModel):
 
     append_timestamp = Property(bool, False)
 
+    num_workers = Property(int, 1)
+
     def __init__(self, name=None):
-        super().__init__(name)
+        super().__init__(name, daemon=False)
         self.can_open = True
         self.can_save = False
 
+        self._update_num_workers_default()
+
         self.input_sequences.set_globs(["fa", "fas", "fasta"])
         self.binder.bind(self.input_sequences.properties.parent_path, self.properties.output_path)
 
@@ -93,7 +98,14 @@ class Model(BlastTaskModel):
             fixseqasterisks=self.ali and self.fixseqasterisks,
             fixaliseparator=self.ali and self.fixaliseparator,
             append_timestamp=self.append_timestamp,
+            num_workers=self.num_workers,
         )
 
+    def _update_num_workers_default(self):
+        cpus = multiprocessing.cpu_count()
+        property = self.properties.num_workers
+        setattr(property._parent, Property.key_default(property._key), cpus)
+        property.set(cpus)
+
     def open(self, path: Path):
         self.input_sequences.open(path)
@@ -1,8 +1,9 @@
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 from time import perf_counter
-from traceback import print_exc
 
+from ..common.process import run_batch_jobs
 from ..common.types import BatchResults, Confirmation
 
 
@@ -33,8 +34,9 @@ def execute(
     fixseqasterisks: bool,
     fixaliseparator: bool,
     append_timestamp: bool,
+    num_workers: int = 1,
 ) -> BatchResults:
-    from itaxotools import abort, get_feedback, progress_handler
+    from itaxotools import abort, get_feedback
     from itaxotools.blastax.core import fasta_name_modifier, get_error_filename, get_fasta_prepared_filename
 
     print(f"{input_paths=}")
@@ -55,9 +57,7 @@ def execute(
     print(f"{fixseqasterisks=}")
     print(f"{fixaliseparator=}")
     print(f"{append_timestamp=}")
-
-    total = len(input_paths)
-    failed: list[Path] = []
+    print(f"{num_workers=}")
 
     timestamp = datetime.now() if append_timestamp else None
 
@@ -69,37 +69,32 @@ def execute(
 
     ts = perf_counter()
 
-    for i, (path, target) in enumerate(zip(input_paths, target_paths)):
-        progress_handler(f"Processing file {i+1}/{total}: {path.name}", i, 0, total)
-        try:
-            fasta_name_modifier(
-                input_name=path,
-                output_name=target,
-                trim=trim,
-                add=add,
-                replace=replace,
-                sanitize=sanitize,
-                preserve_separators=preserve_separators,
-                trimposition=trim_direction,
-                trimmaxchar=trim_max_length,
-                renameauto=auto_increment,
-                direc=add_direction,
-                addstring=add_text,
-                findstring=replace_source,
-                replacestring=replace_target,
-                fixseqspaces=fixseqspaces,
-                fixseqasterisks=fixseqasterisks,
-                fixaliseparator=fixaliseparator,
-            )
-        except Exception as e:
-            if total == 1:
-                raise e
-            error_log_path = output_path / get_error_filename(path)
-            with open(error_log_path, "w") as f:
-                print_exc(file=f)
-            failed.append(path)
-
-    progress_handler("Done processing files.", total, 0, total)
+    jobs = [
+        partial(
+            fasta_name_modifier,
+            input_name=path,
+            output_name=target,
+            trim=trim,
+            add=add,
+            replace=replace,
+            sanitize=sanitize,
+            preserve_separators=preserve_separators,
+            trimposition=trim_direction,
+            trimmaxchar=trim_max_length,
+            renameauto=auto_increment,
+            direc=add_direction,
+            addstring=add_text,
+            findstring=replace_source,
+            replacestring=replace_target,
+            fixseqspaces=fixseqspaces,
+            fixseqasterisks=fixseqasterisks,
+            fixaliseparator=fixaliseparator,
+        )
+        for path, target in zip(input_paths, target_paths)
+    ]
+    error_log_paths = [output_path / get_error_filename(path) for path in input_paths]
+
+    _, failed = run_batch_jobs(jobs, input_paths, error_log_paths, num_workers)
 
     tf = perf_counter()
 
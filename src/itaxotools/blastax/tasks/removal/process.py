@@ -1,9 +1,12 @@
 from datetime import datetime
+from functools import partial
+from io import StringIO
 from os import devnull
 from pathlib import Path
 from time import perf_counter
 from typing import TextIO
 
+from ..common.process import run_batch_jobs
 from ..common.types import Confirmation
 from .types import RemovalMode, RemovalResults
 
@@ -27,6 +30,7 @@ def execute(
     log: bool,
     append_timestamp: bool,
     append_configuration: bool,
+    num_workers: int = 1,
 ) -> RemovalResults:
     from itaxotools import abort, get_feedback
 
@@ -39,6 +43,7 @@ def execute(
     print(f"{log=}")
     print(f"{append_timestamp=}")
     print(f"{append_configuration=}")
+    print(f"{num_workers=}")
 
     timestamp = datetime.now() if append_timestamp else None
     description: str = ""
@@ -55,62 +60,96 @@ def execute(
 
     ts = perf_counter()
 
-    description: str = ""
+    jobs = [
+        partial(
+            execute_single,
+            input_path=input_path,
+            target_path=target_path,
+            mode=mode,
+            frame=frame,
+            code=code,
+            cutoff=cutoff,
+        )
+        for input_path, target_path in zip(input_paths, target_paths)
+    ]
+
+    results, _ = run_batch_jobs(jobs, input_paths, max_workers=num_workers)
 
     with open(log_path, "w") as log_file:
         log_options(log_file, code, frame)
 
-        match mode:
-            case RemovalMode.discard_file:
-                description = execute_discard_file(
-                    input_paths=input_paths,
-                    target_paths=target_paths,
-                    log_file=log_file,
-                    frame=frame,
-                    code=code,
-                )
-
-            case RemovalMode.discard_sequence:
-                description = execute_discard_sequences(
-                    input_paths=input_paths,
-                    target_paths=target_paths,
-                    log_file=log_file,
-                    frame=frame,
-                    code=code,
-                )
-
-            case RemovalMode.trim_after_stop:
-                description = execute_trim_after_stop(
-                    input_paths=input_paths,
-                    target_paths=target_paths,
-                    log_file=log_file,
-                    frame=frame,
-                    code=code,
-                )
-
-            case RemovalMode.trim_or_discard:
-                description = execute_trim_or_discard(
-                    input_paths=input_paths,
-                    target_paths=target_paths,
-                    log_file=log_file,
-                    frame=frame,
-                    code=code,
-                    cutoff=cutoff,
-                )
-
-            case RemovalMode.report_only:
-                description = execute_report_only(
-                    input_paths=input_paths,
-                    log_file=log_file,
-                    frame=frame,
-                    code=code,
-                )
+        file_count = 0
+        counts = (0, 0)
+
+        for log_text, file_counts in results:
+            log_file.write(log_text)
+            if log_text:
+                file_count += 1
+            counts = tuple(a + b for a, b in zip(counts, file_counts))
+
+        if not file_count:
+            print("No stop codons detected!", file=log_file)
+
+    description = get_description(mode, file_count, *counts)
 
     tf = perf_counter()
 
     return RemovalResults(output_dir, description, tf - ts)
 
 
+def execute_single(
+    input_path: Path,
+    target_path: Path,
+    mode: RemovalMode,
+    frame: int,
+    code: int,
+    cutoff: int,
+) -> tuple[str, tuple[int, int]]:
+    log_file = StringIO()
+
+    match mode:
+        case RemovalMode.discard_file:
+            counts = execute_discard_file(input_path, target_path, log_file, frame, code)
+        case RemovalMode.discard_sequence:
+            counts = execute_discard_sequences(input_path, target_path, log_file, frame, code)
+        case RemovalMode.trim_after_stop:
+            counts = execute_trim_after_stop(input_path, target_path, log_file, frame, code)
+        case RemovalMode.trim_or_discard:
+            counts = execute_trim_or_discard(input_path, target_path, log_file, frame, code, cutoff)
+        case RemovalMode.report_only:
+            counts = execute_report_only(input_path, log_file, frame, code)
+
+    return log_file.getvalue(), counts
+
+
+def get_description(mode: RemovalMode, file_count: int, first_count: int, second_count: int) -> str:
+    fs = "" if file_count == 1 else "s"
+
+    match mode:
+        case RemovalMode.discard_file:
+            return f"Discarded {file_count} file{fs}"
+
+        case RemovalMode.discard_sequence:
+            ss = "" if first_count == 1 else "s"
+            return f"Discarded {first_count} sequence{ss} from {file_count} file{fs}"
+
+        case RemovalMode.trim_after_stop:
+            ss = "" if first_count == 1 else "s"
+            return f"Trimmed {first_count} sequence{ss} from {file_count} file{fs}"
+
+        case RemovalMode.trim_or_discard:
+            ds = "" if first_count == 1 else "s"
+            ts = "" if second_count == 1 else "s"
+            return (
+                f"Discarded {first_count} sequence{ds} and\n"
+                f"trimmed {second_count} sequence{ts} from {file_count} file{fs}"
+            )
+
+        case RemovalMode.report_only:
+            ss = "" if first_count == 1 else "s"
+            return f"Detected {first_count} codon{ss} in {file_count} file{fs}"
+
+
 def log_options(file: TextIO, code: int, frame: int):
     from itaxotools.blastax.codons import get_codon_tables, get_stop_codons_for_table
 
@@ -138,216 +177,162 @@ def log_stop_codon(file: TextIO, id: str, pos: int, codon: str):
 
 
 def execute_discard_file(
-    input_paths: list[Path],
-    target_paths: list[Path],
+    input_path: Path,
+    target_path: Path,
     log_file: TextIO,
     frame: int,
     code: int,
-) -> str:
+) -> tuple[int, int]:
     import shutil
 
     from itaxotools.blastax.codons import find_stop_codon_in_sequence
     from itaxotools.taxi2.sequences import SequenceHandler
 
-    def check_file_contains_stop_codon(path: Path) -> bool:
-        with SequenceHandler.Fasta(path) as file:
-            for sequence in file:
-                pos = find_stop_codon_in_sequence(sequence=sequence.seq, table_id=code, reading_frame=frame)
-                if pos >= 0:
-                    codon = sequence.seq[pos : pos + 3]
-                    log_filename(log_file, path.name)
-                    log_stop_codon(log_file, sequence.id, pos, codon)
-                    return True
-        return False
+    with SequenceHandler.Fasta(input_path) as file:
+        for sequence in file:
+            pos = find_stop_codon_in_sequence(sequence=sequence.seq, table_id=code, reading_frame=frame)
+            if pos >= 0:
+                codon = sequence.seq[pos : pos + 3]
+                log_filename(log_file, input_path.name)
+                log_stop_codon(log_file, sequence.id, pos, codon)
+                return 0, 0
 
-    file_count = 0
-
-    for input_path, target_path in zip(input_paths, target_paths):
-        if not check_file_contains_stop_codon(input_path):
-            shutil.copy(input_path, target_path)
-        else:
-            file_count += 1
-
-    if not file_count:
-        print("No stop codons detected!", file=log_file)
-
-    s = "" if file_count == 1 else "s"
-    return f"Discarded {file_count} file{s}"
+    shutil.copy(input_path, target_path)
+    return 0, 0
 
 
 def execute_discard_sequences(
-    input_paths: list[Path],
-    target_paths: list[Path],
+    input_path: Path,
+    target_path: Path,
     log_file: TextIO,
     frame: int,
     code: int,
-) -> str:
+) -> tuple[int, int]:
     from itaxotools.blastax.codons import find_stop_codon_in_sequence
     from itaxotools.taxi2.sequences import SequenceHandler
 
-    file_count = 0
     sequence_count = 0
 
-    for input_path, target_path in zip(input_paths, target_paths):
-        already_encountered = False
-        with (
-            SequenceHandler.Fasta(input_path) as input_file,
-            SequenceHandler.Fasta(target_path, "w", line_width=0) as output_file,
-        ):
-            for sequence in input_file:
-                pos = find_stop_codon_in_sequence(sequence=sequence.seq, table_id=code, reading_frame=frame)
-                if pos < 0:
-                    output_file.write(sequence)
-                else:
-                    codon = sequence.seq[pos : pos + 3]
-                    sequence_count += 1
-                    if not already_encountered:
-                        log_filename(log_file, input_path.name)
-                        already_encountered = True
-                        file_count += 1
-                    log_stop_codon(log_file, sequence.id, pos, codon)
-
-    if not file_count:
-        print("No stop codons detected!", file=log_file)
-
-    ss = "" if sequence_count == 1 else "s"
-    fs = "" if file_count == 1 else "s"
-    return f"Discarded {sequence_count} sequence{ss} from {file_count} file{fs}"
+    with (
+        SequenceHandler.Fasta(input_path) as input_file,
+        SequenceHandler.Fasta(target_path, "w", line_width=0) as output_file,
+    ):
+        for sequence in input_file:
+            pos = find_stop_codon_in_sequence(sequence=sequence.seq, table_id=code, reading_frame=frame)
+            if pos < 0:
+                output_file.write(sequence)
+            else:
+                codon = sequence.seq[pos : pos + 3]
+                if not sequence_count:
+                    log_filename(log_file, input_path.name)
+                sequence_count += 1
+                log_stop_codon(log_file, sequence.id, pos, codon)
+
+    return sequence_count, 0
 
 
 def execute_trim_after_stop(
-    input_paths: list[Path],
-    target_paths: list[Path],
+    input_path: Path,
+    target_path: Path,
     log_file: TextIO,
     frame: int,
     code: int,
-) -> str:
+) -> tuple[int, int]:
     from itaxotools.blastax.codons import find_stop_codon_in_sequence
     from itaxotools.taxi2.sequences import Sequence, SequenceHandler
 
-    file_count = 0
     sequence_count = 0
 
-    for input_path, target_path in zip(input_paths, target_paths):
-        already_encountered = False
-        with (
-            SequenceHandler.Fasta(input_path) as input_file,
-            SequenceHandler.Fasta(target_path, "w", line_width=0) as output_file,
-        ):
-            for sequence in input_file:
-                pos = find_stop_codon_in_sequence(
-                    sequence=sequence.seq,
-                    table_id=code,
-                    reading_frame=frame,
-                )
-                if pos >= 0:
-                    codon = sequence.seq[pos : pos + 3]
-                    sequence = Sequence(sequence.id, sequence.seq[:pos])
-                    sequence_count += 1
-                    if not already_encountered:
-                        log_filename(log_file, input_path.name)
-                        already_encountered = True
-                        file_count += 1
-                    log_stop_codon(log_file, sequence.id, pos, codon)
-                output_file.write(sequence)
-
-    if not file_count:
-        print("No stop codons detected!", file=log_file)
-
-    ss = "" if sequence_count == 1 else "s"
-    fs = "" if file_count == 1 else "s"
-    return f"Trimmed {sequence_count} sequence{ss} from {file_count} file{fs}"
+    with (
+        SequenceHandler.Fasta(input_path) as input_file,
+        SequenceHandler.Fasta(target_path, "w", line_width=0) as output_file,
+    ):
+        for sequence in input_file:
+            pos = find_stop_codon_in_sequence(
+                sequence=sequence.seq,
+                table_id=code,
+                reading_frame=frame,
+            )
+            if pos >= 0:
+                codon = sequence.seq[pos : pos + 3]
+                sequence = Sequence(sequence.id, sequence.seq[:pos])
+                if not sequence_count:
+                    log_filename(log_file, input_path.name)
+                sequence_count += 1
+                log_stop_codon(log_file, sequence.id, pos, codon)
+            output_file.write(sequence)
+
+    return sequence_count, 0
 
 
 def execute_trim_or_discard(
-    input_paths: list[Path],
-    target_paths: list[Path],
+    input_path: Path,
+    target_path: Path,
     log_file: TextIO,
     frame: int,
     code: int,
     cutoff: int,
-) -> str:
+) -> tuple[int, int]:
     from itaxotools.blastax.codons import find_stop_codon_in_sequence
     from itaxotools.taxi2.sequences import Sequence, SequenceHandler
 
-    file_count = 0
     discard_count = 0
     trim_count = 0
 
-    for input_path, target_path in zip(input_paths, target_paths):
-        already_encountered = False
-        with (
-            SequenceHandler.Fasta(input_path) as input_file,
-            SequenceHandler.Fasta(target_path, "w", line_width=0) as output_file,
-        ):
-            for sequence in input_file:
-                threshold = len(sequence.seq) - cutoff
-                pos = find_stop_codon_in_sequence(
-                    sequence=sequence.seq,
-                    table_id=code,
-                    reading_frame=frame,
-                )
-                if pos < 0:
+    with (
+        SequenceHandler.Fasta(input_path) as input_file,
+        SequenceHandler.Fasta(target_path, "w", line_width=0) as output_file,
+    ):
+        for sequence in input_file:
+            threshold = len(sequence.seq) - cutoff
+            pos = find_stop_codon_in_sequence(
+                sequence=sequence.seq,
+                table_id=code,
+                reading_frame=frame,
+            )
+            if pos < 0:
+                output_file.write(sequence)
+            else:
+                codon = sequence.seq[pos : pos + 3]
+                if not (discard_count or trim_count):
+                    log_filename(log_file, input_path.name)
+                if pos >= threshold:
+                    sequence = Sequence(sequence.id, sequence.seq[:pos])
                     output_file.write(sequence)
+                    trim_count += 1
                 else:
-                    codon = sequence.seq[pos : pos + 3]
-                    if pos >= threshold:
-                        sequence = Sequence(sequence.id, sequence.seq[:pos])
-                        output_file.write(sequence)
-                        trim_count += 1
-                    else:
-                        discard_count += 1
-                    if not already_encountered:
-                        log_filename(log_file, input_path.name)
-                        already_encountered = True
-                        file_count += 1
-                    log_stop_codon(log_file, sequence.id, pos, codon)
-
-    if not file_count:
-        print("No stop codons detected!", file=log_file)
-
-    ds = "" if discard_count == 1 else "s"
-    ts = "" if trim_count == 1 else "s"
-    fs = "" if file_count == 1 else "s"
-    return f"Discarded {discard_count} sequence{ds} and\ntrimmed {trim_count} sequence{ts} from {file_count} file{fs}"
+                    discard_count += 1
+                log_stop_codon(log_file, sequence.id, pos, codon)
+
+    return discard_count, trim_count
 
 
 def execute_report_only(
-    input_paths: list[Path],
+    input_path: Path,
     log_file: TextIO,
     frame: int,
     code: int,
-) -> str:
+) -> tuple[int, int]:
     from itaxotools.blastax.codons import find_stop_codon_in_sequence
     from itaxotools.taxi2.sequences import SequenceHandler
 
-    file_count = 0
     sequence_count = 0
 
-    for input_path in input_paths:
-        already_encountered = False
-        with SequenceHandler.Fasta(input_path) as input_file:
-            for sequence in input_file:
-                pos = find_stop_codon_in_sequence(
-                    sequence=sequence.seq,
-                    table_id=code,
-                    reading_frame=frame,
-                )
-                if pos >= 0:
-                    codon = sequence.seq[pos : pos + 3]
-                    sequence_count += 1
-                    if not already_encountered:
-                        log_filename(log_file, input_path.name)
-                        already_encountered = True
-                        file_count += 1
-                    log_stop_codon(log_file, sequence.id, pos, codon)
-
-    if not file_count:
-        print("No stop codons detected!", file=log_file)
-
-    ss = "" if sequence_count == 1 else "s"
-    fs = "" if file_count == 1 else "s"
-    return f"Detected {sequence_count} codon{ss} in {file_count} file{fs}"
+    with SequenceHandler.Fasta(input_path) as input_file:
+        for sequence in input_file:
+            pos = find_stop_codon_in_sequence(
+                sequence=sequence.seq,
+                table_id=code,
+                reading_frame=frame,
+            )
+            if pos >= 0:
+                codon = sequence.seq[pos : pos + 3]
+                if not sequence_count:
+                    log_filename(log_file, input_path.name)
+                sequence_count += 1
+                log_stop_codon(log_file, sequence.id, pos, codon)
+
+    return sequence_count, 0
 
 
 def get_target_path(
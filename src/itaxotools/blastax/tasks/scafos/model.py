@@ -1,3 +1,4 @@
+import multiprocessing
 from datetime import datetime
 from pathlib import Path
 
@@ -24,11 +25,15 @@ class Model(BlastTaskModel):
     append_timestamp = Property(bool, False)
     append_configuration = Property(bool, True)
 
+    num_workers = Property(int, 1)
+
     def __init__(self, name=None):
-        super().__init__(name)
+        super().__init__(name, daemon=False)
         self.can_open = True
         self.can_save = False
 
+        self._update_num_workers_default()
+
         self.input_sequences.set_globs(["fa", "fas", "fasta", "fq", "fastq", "ali"])
 
         self.binder.bind(self.input_sequences.properties.parent_path, self.properties.output_path)
@@ -68,7 +73,14 @@ class Model(BlastTaskModel):
             outlier_factor=self.outlier_factor,
             append_timestamp=self.append_timestamp,
             append_configuration=self.append_configuration,
+            num_workers=self.num_workers,
         )
 
+    def _update_num_workers_default(self):
+        cpus = multiprocessing.cpu_count()
+        property = self.properties.num_workers
+        setattr(property._parent, Property.key_default(property._key), cpus)
+        property.set(cpus)
+
     def open(self, path: Path):
         self.input_sequences.open(path)
@@ -1,9 +1,10 @@
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 from time import perf_counter
-from traceback import print_exc
 from typing import cast
 
+from ..common.process import run_batch_jobs
 from ..common.types import BatchResults, Confirmation
 from .types import AmalgamationMethodTexts, DistanceTargetPaths, TagMethodTexts, TargetPaths
 
@@ -26,8 +27,9 @@ def execute(
     outlier_factor: float,
     append_timestamp: bool,
     append_configuration: bool,
+    num_workers: int = 1,
 ) -> BatchResults:
-    from itaxotools import abort, get_feedback, progress_handler
+    from itaxotools import abort, get_feedback
 
     print(f"{input_paths=}")
     print(f"{output_path=}")
@@ -38,9 +40,7 @@ def execute(
     print(f"{outlier_factor=}")
     print(f"{append_timestamp=}")
     print(f"{append_configuration=}")
-
-    total = len(input_paths)
-    failed: list[Path] = []
+    print(f"{num_workers=}")
 
     timestamp = datetime.now() if append_timestamp else None
     configuration: dict[str, str] = {}
@@ -63,28 +63,28 @@ def execute(
         if not get_feedback(Confirmation.OverwriteFiles):
             abort()
 
+    # a single file computes its distances by blocks of rows on the workers instead
+    distance_workers = max(num_workers, 1) if len(input_paths) == 1 else 1
+
     ts = perf_counter()
 
-    for i, (path, target_paths) in enumerate(zip(input_paths, target_paths_list)):
-        progress_handler(f"Processing file {i+1}/{total}: {path.name}", i, 0, total)
-        try:
-            execute_single(
-                input_path=path,
-                target_paths=target_paths,
-                tag_method=tag_method,
-                amalgamation_method=amalgamation_method,
-                save_reports=save_reports,
-                fuse_ambiguous=fuse_ambiguous,
-                outlier_factor=outlier_factor,
-            )
-        except Exception as e:
-            if total == 1:
-                raise e
-            with open(target_paths.error_log_path, "w") as f:
-                print_exc(file=f)
-            failed.append(path)
-
-    progress_handler("Done processing files.", total, 0, total)
+    jobs = [
+        partial(
+            execute_single,
+            input_path=path,
+            target_paths=target_paths,
+            tag_method=tag_method,
+            amalgamation_method=amalgamation_method,
+            save_reports=save_reports,
+            fuse_ambiguous=fuse_ambiguous,
+            outlier_factor=outlier_factor,
+            num_processes=distance_workers,
+        )
+        for path, target_paths in zip(input_paths, target_paths_list)
+    ]
+    error_log_paths = [target_paths.error_log_path for target_paths in target_paths_list]
+
+    _, failed = run_batch_jobs(jobs, input_paths, error_log_paths, num_workers // distance_workers)
 
     tf = perf_counter()
 
@@ -99,6 +99,7 @@ def execute_single(
     save_reports: bool,
     fuse_ambiguous: bool,
     outlier_factor: float,
+    num_processes: int = 1,
 ):
     from itaxotools.blastax.scafos import (
         AmalgamationMethod,
@@ -130,6 +131,8 @@ def execute_single(
         if amalgamation_method in [AmalgamationMethod.ByMinimumDistance, AmalgamationMethod.ByDiscardingOutliers]:
             target_paths = cast(DistanceTargetPaths, target_paths)
             extra_kwargs |= dict(distance_report=target_paths.distances_path, mean_report=target_paths.means_path)
+    if amalgamation_method in [AmalgamationMethod.ByMinimumDistance, AmalgamationMethod.ByDiscardingOutliers]:
+        extra_kwargs |= dict(num_processes=num_processes)
     if amalgamation_method in [AmalgamationMethod.ByFillingGaps, AmalgamationMethod.ByDiscardingOutliers]:
         extra_kwargs |= dict(ambiguous=fuse_ambiguous)
     if amalgamation_method == AmalgamationMethod.ByDiscardingOutliers:
@@ -21,6 +21,8 @@ class Model(BlastTaskModel):
     blast_method = Property(BlastMethod, BlastMethod.blastn)
     blast_evalue = Property(float, 1e-5)
     blast_num_threads = Property(int, 1)
+    blast_num_shards = Property(int, 1)
+    blast_use_cache = Property(bool, False)
     blast_extra_args = Property(str, '-outfmt "6 length pident qseqid sseqid staxids sscinames"')
 
     match_pident = Property(float, 70.000)
@@ -81,6 +83,8 @@ class Model(BlastTaskModel):
             blast_method=self.blast_method.executable,
             blast_evalue=self.blast_evalue or self.properties.blast_evalue.default,
             blast_num_threads=self.blast_num_threads or self.properties.blast_num_threads.default,
+            blast_num_shards=self.blast_num_shards or self.properties.blast_num_shards.default,
+            blast_use_cache=self.blast_use_cache,
             blast_taxdb_path=self.blast_taxdb_path if self.blast_taxdb_path != Path() else None,
             match_pident=self.match_pident,
             match_length=self.match_length,
@@ -1,11 +1,11 @@
+import os
+import shutil
 from datetime import datetime
 from pathlib import Path
 from time import perf_counter
 from traceback import print_exc
 
-from itaxotools.blastax.utils import make_str_blast_safe
-
-from ..common.process import StagingArea
+from ..common.process import StagingArea, prepare_query
 from ..common.types import BatchResults, Confirmation
 from .types import TargetPaths
 
@@ -36,6 +36,8 @@ def execute(
     write_organism_report: bool,
     append_timestamp: bool,
     append_configuration: bool,
+    blast_num_shards: int = 1,
+    blast_use_cache: bool = False,
 ) -> BatchResults:
     from itaxotools import abort, get_feedback, progress_handler
 
@@ -48,6 +50,8 @@ def execute(
     print(f"{blast_method=}")
     print(f"{blast_evalue=}")
     print(f"{blast_num_threads=}")
+    print(f"{blast_num_shards=}")
+    print(f"{blast_use_cache=}")
     print(f"{blast_taxdb_path=}")
     print(f"{match_pident=}")
     print(f"{match_length=}")
@@ -106,6 +110,8 @@ def execute(
                     blast_outfmt_options=blast_outfmt_options,
                     blast_evalue=blast_evalue,
                     blast_num_threads=blast_num_threads,
+                    blast_num_shards=blast_num_shards,
+                    blast_use_cache=blast_use_cache,
                     blast_taxdb_path=blast_taxdb_path,
                     write_blast_headers=write_blast_headers,
                     match_pident=match_pident,
@@ -145,18 +151,14 @@ def execute_single(
     write_blast_headers: bool,
     match_pident: float,
     match_length: int,
+    blast_num_shards: int = 1,
+    blast_use_cache: bool = False,
 ):
-    from itaxotools.blastax.core import assign_taxonomy, run_blast, write_best_hits_report, write_organism_report
-    from itaxotools.blastax.utils import fastq_to_fasta, is_fastq, remove_gaps
-
-    if is_fastq(input_query_path):
-        target_query_path = work_dir / input_query_path.with_suffix(".fasta").name
-        fastq_to_fasta(input_query_path, target_query_path)
-        input_query_path = target_query_path
+    from itaxotools.blastax.cache import BlastCache, QueryCache
+    from itaxotools.blastax.core import run_blast, write_taxonomy_outputs
 
-    stem = make_str_blast_safe(input_query_path.stem) + "_no_gaps"
-    input_query_path_no_gaps = work_dir / input_query_path.with_stem(stem).name
-    remove_gaps(input_query_path, input_query_path_no_gaps)
+    query_cache = QueryCache() if blast_use_cache else None
+    input_query_path, input_query_path_no_gaps = prepare_query(input_query_path, work_dir, query_cache)
 
     staging.add(output_paths=[blast_output_path])
     staging.stage()
@@ -169,37 +171,24 @@ def execute_single(
             output_path=staging[blast_output_path],
             evalue=blast_evalue,
             num_threads=blast_num_threads,
+            shards=blast_num_shards,
+            cache=BlastCache() if blast_use_cache else None,
             outfmt=f"{blast_outfmt} {blast_outfmt_options}",
             other="",
             blastdb_path=staging[blast_taxdb_path],
             debug=True,
         )
-        assign_taxonomy(
-            query_path=input_query_path,
+        write_taxonomy_outputs(
             blast_path=staging[blast_output_path],
+            outfmt_columns=blast_outfmt_options.split(),
+            query_path=input_query_path,
             output_path=taxo_output_path,
+            best_hits_report_path=best_hits_report_path,
+            organism_report_path=organism_report_path,
             min_length=match_length,
             min_pident=match_pident,
         )
 
-        if best_hits_report_path:
-            write_best_hits_report(
-                blast_path=staging[blast_output_path],
-                report_path=best_hits_report_path,
-                outfmt_columns=blast_outfmt_options.split(),
-                min_length=match_length,
-                min_pident=match_pident,
-            )
-
-        if organism_report_path:
-            write_organism_report(
-                blast_path=staging[blast_output_path],
-                report_path=organism_report_path,
-                outfmt_columns=blast_outfmt_options.split(),
-                min_length=match_length,
-                min_pident=match_pident,
-            )
-
         if write_blast_headers:
             prepend_blast_headers(staging[blast_output_path], blast_outfmt_options)
 
@@ -208,9 +197,13 @@ def execute_single(
 
 
 def prepend_blast_headers(blast_path: Path, blast_outfmt_options: str):
-    header = "\t".join(blast_outfmt_options.split()) + "\n"
-    content = blast_path.read_text()
-    blast_path.write_text(header + content)
+    header = "\t".join(blast_outfmt_options.split()) + os.linesep
+    headed_path = blast_path.with_name(blast_path.name + ".headed")
+    with open(headed_path, "wb") as headed_file:
+        headed_file.write(header.encode())
+        with open(blast_path, "rb") as blast_file:
+            shutil.copyfileobj(blast_file, headed_file)
+    os.replace(headed_path, blast_path)
 
 
 def get_target_paths(
@@ -21,6 +21,7 @@ class Model(BlastTaskModel):
     blast_method = Property(BlastMethod, BlastMethod.blastn)
     blast_evalue = Property(float, 1e-5)
     blast_num_threads = Property(int, 1)
+    blast_num_shards = Property(int, 1)
     blast_extra_args = Property(str, '-outfmt "6 qseqid sseqid pident bitscore length staxids"')
     blast_taxdb_path = Property(Path, Path())
 
@@ -103,6 +104,7 @@ class Model(BlastTaskModel):
             blast_method=self.blast_method.executable,
             blast_evalue=self.blast_evalue or self.properties.blast_evalue.default,
             blast_num_threads=self.blast_num_threads or self.properties.blast_num_threads.default,
+            blast_num_shards=self.blast_num_shards or self.properties.blast_num_shards.default,
             blast_taxdb_path=self.blast_taxdb_path if self.blast_taxdb_path != Path() else None,
             taxid_mode_text=self.taxid_mode_text,
             taxid_text=self.taxid_text,
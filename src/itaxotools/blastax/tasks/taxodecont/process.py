@@ -4,9 +4,7 @@ from time import perf_counter
 from traceback import print_exc
 from typing import Iterator
 
-from itaxotools.blastax.utils import make_str_blast_safe
-
-from ..common.process import StagingArea
+from ..common.process import StagingArea, prepare_query
 from ..common.types import BatchResults, Confirmation
 from .types import TargetPaths
 
@@ -42,6 +40,7 @@ def execute(
     threshold_length: float | None,
     append_timestamp: bool,
     append_configuration: bool,
+    blast_num_shards: int = 1,
 ) -> BatchResults:
     from itaxotools import abort, get_feedback, progress_handler
 
@@ -55,6 +54,7 @@ def execute(
     print(f"{blast_method=}")
     print(f"{blast_evalue=}")
     print(f"{blast_num_threads=}")
+    print(f"{blast_num_shards=}")
     print(f"{blast_taxdb_path=}")
     print(f"{taxid_mode_text=}")
     print(f"{taxid_text=}")
@@ -151,6 +151,7 @@ def execute(
                     blast_method=blast_method,
                     blast_evalue=blast_evalue,
                     blast_num_threads=blast_num_threads,
+                    blast_num_shards=blast_num_shards,
                     blast_taxdb_path=blast_taxdb_path,
                     taxid_mode_text=taxid_mode_text,
                     taxid_text=taxid_text,
@@ -282,18 +283,11 @@ def execute_single(
     threshold_pident: float | None,
     threshold_bitscore: float | None,
     threshold_length: float | None,
+    blast_num_shards: int = 1,
 ):
     from itaxotools.blastax.core import run_blast
-    from itaxotools.blastax.utils import fastq_to_fasta, is_fastq, remove_gaps
-
-    if is_fastq(input_query_path):
-        target_query_path = work_dir / input_query_path.with_suffix(".fasta").name
-        fastq_to_fasta(input_query_path, target_query_path)
-        input_query_path = target_query_path
 
-    stem = make_str_blast_safe(input_query_path.stem) + "_no_gaps"
-    input_query_path_no_gaps = work_dir / input_query_path.with_stem(stem).name
-    remove_gaps(input_query_path, input_query_path_no_gaps)
+    input_query_path, input_query_path_no_gaps = prepare_query(input_query_path, work_dir)
 
     staging.add(output_paths=[blast_output_path])
     staging.stage()
@@ -324,6 +318,7 @@ def execute_single(
             output_path=staging[blast_output_path],
             evalue=blast_evalue,
             num_threads=blast_num_threads,
+            shards=blast_num_shards,
             outfmt=blast_outfmt,
             other=other,
             blastdb_path=staging[blast_taxdb_path],
@@ -353,27 +348,22 @@ def get_contaminant_ids(
     threshold_bitscore: float | None,
     threshold_length: float | None,
 ) -> set[str]:
-    from itaxotools.taxi2.handlers import FileHandler
+    import numpy as np
+
+    from itaxotools.blastax.tabular import iter_blast_columns
 
     contaminant_ids: set[str] = set()
 
-    with FileHandler.Tabfile(blast_path) as blast_file:
-        for line in blast_file:
-            qseqid = line[0]
-            pident = float(line[2])
-            bitscore = float(line[3])
-            length = float(line[4])
-
-            meets_all = True
-            if threshold_pident is not None and pident < threshold_pident:
-                meets_all = False
-            if threshold_bitscore is not None and bitscore < threshold_bitscore:
-                meets_all = False
-            if threshold_length is not None and length < threshold_length:
-                meets_all = False
-
-            if meets_all:
-                contaminant_ids.add(qseqid)
+    usecols = ["qseqid", "pident", "bitscore", "length"]
+    for batch in iter_blast_columns(blast_path, BLAST_OUTFMT_OPTIONS, usecols):
+        meets_all = np.ones(len(batch["qseqid"]), dtype=bool)
+        if threshold_pident is not None:
+            meets_all &= batch["pident"] >= threshold_pident
+        if threshold_bitscore is not None:
+            meets_all &= batch["bitscore"] >= threshold_bitscore
+        if threshold_length is not None:
+            meets_all &= batch["length"] >= threshold_length
+        contaminant_ids.update(batch["qseqid"][meets_all])
 
     return contaminant_ids
 
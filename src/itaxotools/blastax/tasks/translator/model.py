@@ -1,3 +1,4 @@
+import multiprocessing
 from pathlib import Path
 
 from itaxotools.common.bindings import Instance, Property
@@ -24,11 +25,15 @@ class Model(BlastTaskModel):
     option_log = Property(bool, True)
     option_nucleotides = Property(bool, True)
 
+    num_workers = Property(int, 1)
+
     def __init__(self, name=None):
-        super().__init__(name)
+        super().__init__(name, daemon=False)
         self.can_open = True
         self.can_save = False
 
+        self._update_num_workers_default()
+
         self.binder.bind(self.input_paths.properties.parent_path, self.properties.output_path)
         self.binder.bind(
             self.input_paths.properties.query_path,
@@ -88,6 +93,7 @@ class Model(BlastTaskModel):
                 input_type=str(self.option_mode),
                 frame=str(self.option_frame),
                 code=str(self.option_code),
+                num_workers=self.num_workers,
             )
         else:
             self.exec(
@@ -101,7 +107,14 @@ class Model(BlastTaskModel):
                 input_type=str(self.option_mode),
                 frame=str(self.option_frame),
                 code=str(self.option_code),
+                num_workers=self.num_workers,
             )
 
+    def _update_num_workers_default(self):
+        cpus = multiprocessing.cpu_count()
+        property = self.properties.num_workers
+        setattr(property._parent, Property.key_default(property._key), cpus)
+        property.set(cpus)
+
     def open(self, path: Path):
         self.input_paths.open(path)
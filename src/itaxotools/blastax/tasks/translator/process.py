@@ -1,7 +1,8 @@
+from functools import partial
 from pathlib import Path
 from time import perf_counter
-from traceback import print_exc
 
+from ..common.process import run_batch_jobs
 from ..common.types import BatchResults, Results
 
 
@@ -20,6 +21,7 @@ def execute(
     input_type: str,
     frame: str,
     code: int,
+    num_workers: int = 1,
 ) -> Results:
     from itaxotools.blastax.translator import Options, translate
 
@@ -30,6 +32,7 @@ def execute(
     print(f"{input_type=}")
     print(f"{frame=}")
     print(f"{code=}")
+    print(f"{num_workers=}")
 
     ts = perf_counter()
 
@@ -41,6 +44,7 @@ def execute(
         input_type=input_type,
         frame=frame,
         code=code,
+        num_workers=num_workers,
     )
     translate(options)
 
@@ -57,10 +61,9 @@ def execute_batch(
     input_type: str,
     frame: str,
     code: int,
+    num_workers: int = 1,
 ) -> Results:
-    from itaxotools import progress_handler
     from itaxotools.blastax.core import get_error_filename
-    from itaxotools.blastax.translator import Options, translate
 
     print(f"{input_paths=}")
     print(f"{output_dir=}")
@@ -69,14 +72,17 @@ def execute_batch(
     print(f"{input_type=}")
     print(f"{frame=}")
     print(f"{code=}")
+    print(f"{num_workers=}")
+
+    jobs = []
+    error_log_paths = []
 
-    total = len(input_paths)
-    failed: list[Path] = []
+    # a single file is translated by chunks of records on the workers instead
+    record_workers = max(num_workers, 1) if len(input_paths) == 1 else 1
 
     ts = perf_counter()
 
-    for i, input_path in enumerate(input_paths):
-        progress_handler(f"Processing file {i}/{total}: {input_path.name}", i, 0, total)
+    for input_path in input_paths:
         output_path = output_dir / input_path.with_stem(input_path.stem + "_aa").with_suffix(".fasta").name
         log_path = output_dir / input_path.with_suffix(".log").name if write_logs else None
         error_path = output_dir / get_error_filename(input_path)
@@ -84,7 +90,8 @@ def execute_batch(
             nucleotide_path = output_dir / input_path.with_stem(Path(input_path).stem + "_orf_nt").name
         else:
             nucleotide_path = None
-        options = Options(
+        job = partial(
+            execute_single,
             input_path=input_path,
             output_path=output_path,
             log_path=log_path,
@@ -92,20 +99,42 @@ def execute_batch(
             input_type=input_type,
             frame=frame,
             code=code,
+            num_workers=record_workers,
         )
-        try:
-            translate(options)
-        except Exception:
-            with open(error_path, "w") as f:
-                print_exc(file=f)
-            failed.append(input_path)
+        jobs.append(job)
+        error_log_paths.append(error_path)
 
-    progress_handler("Done processing files.", total, 0, total)
+    _, failed = run_batch_jobs(jobs, input_paths, error_log_paths, num_workers // record_workers)
 
     tf = perf_counter()
 
     return BatchResults(output_dir, failed, tf - ts)
 
 
+def execute_single(
+    input_path: Path,
+    output_path: Path,
+    log_path: Path | None,
+    nucleotide_path: Path | None,
+    input_type: str,
+    frame: str,
+    code: int,
+    num_workers: int = 1,
+):
+    from itaxotools.blastax.translator import Options, translate
+
+    options = Options(
+        input_path=input_path,
+        output_path=output_path,
+        log_path=log_path,
+        nucleotide_path=nucleotide_path,
+        input_type=input_type,
+        frame=frame,
+        code=code,
+        num_workers=num_workers,
+    )
+    translate(options)
+
+
 def dummy() -> Results:
     raise NotImplementedError()
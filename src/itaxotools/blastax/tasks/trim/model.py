@@ -1,3 +1,4 @@
+import multiprocessing
 from pathlib import Path
 
 from itaxotools.common.bindings import Instance, Property
@@ -22,11 +23,15 @@ class Model(BlastTaskModel):
     append_timestamp = Property(bool, False)
     append_configuration = Property(bool, True)
 
+    num_workers = Property(int, 1)
+
     def __init__(self, name=None):
-        super().__init__(name)
+        super().__init__(name, daemon=False)
         self.can_open = True
         self.can_save = False
 
+        self._update_num_workers_default()
+
         self.input_paths.batch_mode = True
         self.input_paths.set_globs(["fa", "fas", "fasta"])
 
@@ -64,7 +69,14 @@ class Model(BlastTaskModel):
             log=self.option_log,
             append_timestamp=self.append_timestamp,
             append_configuration=self.append_configuration,
+            num_workers=self.num_workers,
         )
 
+    def _update_num_workers_default(self):
+        cpus = multiprocessing.cpu_count()
+        property = self.properties.num_workers
+        setattr(property._parent, Property.key_default(property._key), cpus)
+        property.set(cpus)
+
     def open(self, path: Path):
         self.input_paths.open(path)
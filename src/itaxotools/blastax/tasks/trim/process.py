@@ -1,9 +1,12 @@
 from datetime import datetime
+from functools import partial
+from io import StringIO
 from os import devnull
 from pathlib import Path
 from time import perf_counter
 from typing import TextIO
 
+from ..common.process import run_batch_jobs
 from ..common.types import Confirmation
 from .types import TrimResults
 
@@ -27,14 +30,9 @@ def execute(
     log: bool,
     append_timestamp: bool,
     append_configuration: bool,
+    num_workers: int = 1,
 ) -> TrimResults:
     from itaxotools import abort, get_feedback
-    from itaxotools.blastax.codons import (
-        are_counts_ambiguous,
-        count_stop_codons_for_all_frames_in_sequence,
-        smart_trim_sequence,
-    )
-    from itaxotools.taxi2.sequences import Sequence, SequenceHandler
 
     print(f"{input_paths=}")
     print(f"{output_dir=}")
@@ -45,6 +43,7 @@ def execute(
     print(f"{log=}")
     print(f"{append_timestamp=}")
     print(f"{append_configuration=}")
+    print(f"{num_workers=}")
 
     timestamp = datetime.now() if append_timestamp else None
     description: str = ""
@@ -61,6 +60,21 @@ def execute(
 
     ts = perf_counter()
 
+    jobs = [
+        partial(
+            execute_single,
+            input_path=input_path,
+            target_path=target_path,
+            trim_stop=trim_stop,
+            trim_end=trim_end,
+            discard_ambiguous=discard_ambiguous,
+            code=code,
+        )
+        for input_path, target_path in zip(input_paths, target_paths)
+    ]
+
+    results, _ = run_batch_jobs(jobs, input_paths, max_workers=num_workers)
+
     description: str = ""
 
     with open(log_path, "w") as log_file:
@@ -68,36 +82,11 @@ def execute(
         file_count = 0
         ambiguity_count = 0
 
-        for input_path, target_path in zip(input_paths, target_paths):
-            already_encountered = False
-            with (
-                SequenceHandler.Fasta(input_path) as input_file,
-                SequenceHandler.Fasta(target_path, "w", line_width=0) as output_file,
-            ):
-                for sequence in input_file:
-                    counts, positions = count_stop_codons_for_all_frames_in_sequence(
-                        sequence=sequence.seq,
-                        table_id=code,
-                    )
-                    ambiguous = are_counts_ambiguous(counts)
-                    if ambiguous:
-                        ambiguity_count += 1
-                        if not already_encountered:
-                            log_filename(log_file, input_path.name)
-                            already_encountered = True
-                            file_count += 1
-                        log_ambiguity(log_file, sequence.id, counts, positions)
-                        if discard_ambiguous:
-                            continue
-                    seq = smart_trim_sequence(
-                        sequence.seq,
-                        counts=counts,
-                        positions=positions,
-                        trim_stop=trim_stop,
-                        trim_end=trim_end,
-                    )
-                    sequence = Sequence(sequence.id, seq)
-                    output_file.write(sequence)
+        for log_text, count in results:
+            log_file.write(log_text)
+            if count:
+                ambiguity_count += count
+                file_count += 1
 
         if not file_count:
             description = "No reading frame ambiguity detected!"
@@ -112,6 +101,54 @@ def execute(
     return TrimResults(output_dir, description, tf - ts)
 
 
+def execute_single(
+    input_path: Path,
+    target_path: Path,
+    trim_stop: bool,
+    trim_end: bool,
+    discard_ambiguous: bool,
+    code: int,
+) -> tuple[str, int]:
+    from itaxotools.blastax.codons import (
+        are_counts_ambiguous,
+        count_stop_codons_for_all_frames_in_sequence,
+        smart_trim_sequence,
+    )
+    from itaxotools.taxi2.sequences import Sequence, SequenceHandler
+
+    log_file = StringIO()
+    ambiguity_count = 0
+
+    with (
+        SequenceHandler.Fasta(input_path) as input_file,
+        SequenceHandler.Fasta(target_path, "w", line_width=0) as output_file,
+    ):
+        for sequence in input_file:
+            counts, positions = count_stop_codons_for_all_frames_in_sequence(
+                sequence=sequence.seq,
+                table_id=code,
+            )
+            ambiguous = are_counts_ambiguous(counts)
+            if ambiguous:
+                if not ambiguity_count:
+                    log_filename(log_file, input_path.name)
+                ambiguity_count += 1
+                log_ambiguity(log_file, sequence.id, counts, positions)
+                if discard_ambiguous:
+                    continue
+            seq = smart_trim_sequence(
+                sequence.seq,
+                counts=counts,
+                positions=positions,
+                trim_stop=trim_stop,
+                trim_end=trim_end,
+            )
+            sequence = Sequence(sequence.id, seq)
+            output_file.write(sequence)
+
+    return log_file.getvalue(), ambiguity_count
+
+
 def log_options(file: TextIO, code: int):
     from itaxotools.blastax.codons import get_codon_tables, get_stop_codons_for_table
 
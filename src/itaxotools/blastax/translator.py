@@ -1,18 +1,35 @@
 # Translator, AKS, 02.09.24, Anpassungen ab 28.10.24, Korrekturen 08.04.25
 
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from functools import partial
+from io import StringIO
+from itertools import islice
 from os import devnull
 from pathlib import Path
-from typing import Literal, TextIO
+from typing import Callable, Iterable, Iterator, Literal, NamedTuple, TextIO
 
-from Bio import SeqIO
-from Bio.SeqRecord import SeqRecord
+from .codons import get_codon_translator, reverse_complement
 
 # print(Bio.Data.CodonTable.standard_dna_table)
 STOPS = ["TAA", "TAG", "TGA"]
 
+# number of records translated together by each worker
+TRANSLATION_CHUNK_SIZE = 1000
+# line width of the protein sequences, same as Bio.SeqIO
+FASTA_WRAP = 60
+
+FASTA_WHITESPACE = str.maketrans("", "", " \t\r\n")
+
+
+class FastaRecord(NamedTuple):
+    """A lightweight FASTA record, used in place of SeqRecord while translating"""
+
+    id: str
+    seq: str
+
 
 @dataclass
 class Options:
@@ -24,6 +41,7 @@ class Options:
     input_type: Literal["cds", "cds_stop", "transcript ", "all"]
     frame: Literal["autodetect", "1", "2", "3", "4", "5", "6"]
     code: str | int  # codon table
+    num_workers: int = 1
 
     stop: Literal["yes", "no"] = field(init=False, default=None)
     input_file: TextIO = field(init=False, default=None)
@@ -60,22 +78,95 @@ class Options:
         self.nucleotide_file.close()
 
 
+@dataclass
+class ChunkOptions:
+    """The options needed to translate a chunk of records, with all outputs written in memory"""
+
+    input_type: str
+    frame: str
+    code: str | int
+    stop: str
+
+    output_file: StringIO = field(init=False, default_factory=StringIO)
+    log_file: StringIO = field(init=False, default_factory=StringIO)
+    nucleotide_file: StringIO = field(init=False, default_factory=StringIO)
+    translation_6: StringIO = field(init=False, default_factory=StringIO)
+
+
+def iter_fasta_records(file: TextIO) -> Iterator[FastaRecord]:
+    """Parse FASTA records the same way as Bio.SeqIO, but as plain tuples"""
+    line = file.readline()
+    if line and not line.startswith(">"):
+        raise ValueError("This FASTA file contains comments at the beginning of the file.")
+    while line:
+        title = line[1:].rstrip()
+        lines = []
+        line = ""
+        for next_line in file:
+            if next_line[0] == ">":
+                line = next_line
+                break
+            lines.append(next_line)
+        words = title.split(None, 1)
+        yield FastaRecord(words[0] if words else "", "".join(lines).translate(FASTA_WHITESPACE))
+
+
+def format_fasta_record(record: FastaRecord) -> str:
+    """Format a record the same way as Bio.SeqIO"""
+    lines = [f">{record.id}\n"]
+    lines.extend(record.seq[i : i + FASTA_WRAP] + "\n" for i in range(0, len(record.seq), FASTA_WRAP))
+    return "".join(lines)
+
+
 def prot_record(record, options: Options):
     protein = translate_DNA_record(record, options)
-    return SeqRecord(seq=protein, id=record.id + "_translated_sequence", description="")
+    return FastaRecord(record.id + "_translated_sequence", protein)
 
 
 # special function for mode all
 def prot_record_solo(record, options: Options):
     alloutput = options.output_file
     proteinall = ""
-    for zae in range(1, 7):
-        protein = translate_DNA_record_solo(record, options.code, zae)
+    orfs = LazyOrfs(str(record.seq), options.code)
+    for protein in orfs:
         proteinall = proteinall + protein + "\n"
     # records = SeqRecord(seq=protein, id=">" + record.id, description="_translated_sequence")
     alloutput.write(">" + record.id + "\n")
     alloutput.write(str(proteinall))
-    return SeqRecord(seq=protein, id=record.id + "_translated_sequence", description="")
+    return FastaRecord(record.id + "_translated_sequence", protein)
+
+
+ORF_LABELS = ("orf1", "orf2", "orf3", "orf1rc", "orf2rc", "orf3rc")
+
+
+class LazyOrfs:
+    """The six ORF translations of a sequence, each translated on first access and then memoized"""
+
+    def __init__(self, sequence: str, table_nr):
+        if len(sequence) % 3 == 0:
+            self.slices = [sequence, sequence[1:-3], sequence[2:-2]]
+        elif len(sequence) % 3 == 1:
+            self.slices = [sequence[0:-2], sequence[1:-1], sequence[2:-3]]
+        elif len(sequence) % 3 == 2:
+            self.slices = [sequence[0:-3], sequence[1:-2], sequence[2:-1]]
+        self.translator = get_codon_translator(table_nr, gap="-")
+        self.orfs: list[str | None] = [None] * 6
+
+    def __getitem__(self, index: int) -> str:
+        orf = self.orfs[index]
+        if orf is None:
+            part = self.slices[index % 3]
+            if index >= 3:
+                part = reverse_complement(part)
+            orf = self.orfs[index] = self.translator.translate(part, strict=True)
+        return orf
+
+    def __len__(self) -> int:
+        return 6
+
+
+def translate_orfs(sequence: str, table_nr) -> tuple[str, str, str, str, str, str]:
+    return tuple(LazyOrfs(sequence, table_nr))
 
 
 def translate_DNA_record(record, options: Options):
@@ -86,69 +177,41 @@ def translate_DNA_record(record, options: Options):
     loggi = options.log_file
     nucli = options.nucleotide_file
 
-    if len(record) % 3 == 0:
-        orf1 = record.seq.translate(table=table_nr)
-        orf2 = record.seq[1:-3].translate(table=table_nr)
-        orf3 = record.seq[2:-2].translate(table=table_nr)
-
-        orf1rc = record.seq.reverse_complement().translate(table=table_nr)
-        orf2rc = record.seq[1:-3].reverse_complement().translate(table=table_nr)
-        orf3rc = record.seq[2:-2].reverse_complement().translate(table=table_nr)
-
-    elif len(record) % 3 == 1:
-        orf1 = record.seq[0:-2].translate(table=table_nr)
-        orf2 = record.seq[1:-1].translate(table=table_nr)
-        orf3 = record.seq[2:-3].translate(table=table_nr)
-
-        orf1rc = record.seq[0:-2].reverse_complement().translate(table=table_nr)
-        orf2rc = record.seq[1:-1].reverse_complement().translate(table=table_nr)
-        orf3rc = record.seq[2:-3].reverse_complement().translate(table=table_nr)
-
-    elif len(record) % 3 == 2:
-        orf1 = record.seq[0:-3].translate(table=table_nr)
-        orf2 = record.seq[1:-2].translate(table=table_nr)
-        orf3 = record.seq[2:-1].translate(table=table_nr)
-
-        orf1rc = record.seq[0:-3].reverse_complement().translate(table=table_nr)
-        orf2rc = record.seq[1:-2].reverse_complement().translate(table=table_nr)
-        orf3rc = record.seq[2:-1].reverse_complement().translate(table=table_nr)
-
-    orf_dict = {"orf1": orf1, "orf2": orf2, "orf3": orf3, "orf1rc": orf1rc, "orf2rc": orf2rc, "orf3rc": orf3rc}
-    orf_list = []
-    for elem in orf_dict:
-        orf_list.append(orf_dict[elem])
-    orf_wanted = orf1
+    # frames are only translated as needed by the selected mode
+    orfs = LazyOrfs(str(record.seq), table_nr)
+
+    orf_wanted = None
     orf_label = "orf1"
     if input_type == "cds":
         if frame == "1":
-            orf_wanted = orf1
+            orf_wanted = orfs[0]
             orf_label = "orf1"
         elif frame == "2":
-            orf_wanted = orf2
+            orf_wanted = orfs[1]
             orf_label = "orf2"
         elif frame == "3":
-            orf_wanted = orf3
+            orf_wanted = orfs[2]
             orf_label = "orf3"
         elif frame == "4":
-            orf_wanted = orf1rc
+            orf_wanted = orfs[3]
             orf_label = "orf1rc"
         elif frame == "5":
-            orf_wanted = orf2rc
+            orf_wanted = orfs[4]
             orf_label = "orf2rc"
         elif frame == "6":
-            orf_wanted = orf3rc
+            orf_wanted = orfs[5]
             orf_label = "orf3rc"
         elif frame == "autodetect":
             if stop == "no":
                 count_stopless = 0
                 another = 0
-                if "*" not in orf1:
-                    orf_wanted = orf1
+                if "*" not in orfs[0]:
+                    orf_wanted = orfs[0]
                     orf_label = "orf1"
                     count_stopless = count_stopless + 1
                 # loggi.write(str(orf_wanted)+'\n')
-                if "*" not in orf2:
-                    orf_wanted = orf2
+                if "*" not in orfs[1]:
+                    orf_wanted = orfs[1]
                     orf_label = "orf2"
                     count_stopless = count_stopless + 1
                     if count_stopless > 1:
@@ -158,8 +221,8 @@ def translate_DNA_record(record, options: Options):
                         )
                         another = 1
                         loggi.write(orf_label + ": " + str(orf_wanted) + "\n")
-                if "*" not in orf3:
-                    orf_wanted = orf3
+                if "*" not in orfs[2]:
+                    orf_wanted = orfs[2]
                     orf_label = "orf3"
                     count_stopless = count_stopless + 1
                     if count_stopless > 1:
@@ -170,8 +233,8 @@ def translate_DNA_record(record, options: Options):
                             )
                             another = 1
                         loggi.write(orf_label + ": " + str(orf_wanted) + "\n")
-                if "*" not in orf1rc:
-                    orf_wanted = orf1rc
+                if "*" not in orfs[3]:
+                    orf_wanted = orfs[3]
                     orf_label = "orf1rc"
                     count_stopless = count_stopless + 1
                     if count_stopless > 1:
@@ -182,8 +245,8 @@ def translate_DNA_record(record, options: Options):
                             )
                             another = 1
                         loggi.write(orf_label + ": " + str(orf_wanted) + "\n")
-                if "*" not in orf2rc:
-                    orf_wanted = orf2rc
+                if "*" not in orfs[4]:
+                    orf_wanted = orfs[4]
                     orf_label = "orf2rc"
                     count_stopless = count_stopless + 1
                     if count_stopless > 1:
@@ -194,8 +257,8 @@ def translate_DNA_record(record, options: Options):
                             )
                             another = 1
                         loggi.write(orf_label + ": " + str(orf_wanted) + "\n")
-                if "*" not in orf3rc:
-                    orf_wanted = orf3rc
+                if "*" not in orfs[5]:
+                    orf_wanted = orfs[5]
                     orf_label = "orf3rc"
                     if count_stopless > 1:
                         if not another:
@@ -209,7 +272,7 @@ def translate_DNA_record(record, options: Options):
                 # no translation without stops
                 if count_stopless == 0:
                     nr_stops_list = []
-                    for orf in orf_list:
+                    for orf in orfs:
                         nr_stops = str(orf).count("*")
                         if orf[-1] == "*":
                             nr_stops = 999
@@ -224,7 +287,7 @@ def translate_DNA_record(record, options: Options):
                                 doppelt = testnr
                                 # doppel_pos = nr_stops_list.index(doppelt)
 
-                    orf_wanted = orf_list[pos]
+                    orf_wanted = orfs[pos]
                     loggi.write("\n" + record.id + "\n")
                     loggi.write("Warning: For this sequence no translation without stops was found." + "\n")
                     loggi.write("Translation with minimal number of stops is:" + "\n")
@@ -237,79 +300,67 @@ def translate_DNA_record(record, options: Options):
 
     if input_type == "cds_stop":
         if frame == "1":
-            orf_wanted = orf1
+            orf_wanted = orfs[0]
             orf_label = "orf1"
         elif frame == "2":
-            orf_wanted = orf2
+            orf_wanted = orfs[1]
             orf_label = "orf2"
         elif frame == "3":
-            orf_wanted = orf3
+            orf_wanted = orfs[2]
             orf_label = "orf3"
         elif frame == "4":
-            orf_wanted = orf1rc
+            orf_wanted = orfs[3]
             orf_label = "orf1rc"
         elif frame == "5":
-            orf_wanted = orf2rc
+            orf_wanted = orfs[4]
             orf_label = "orf2rc"
         elif frame == "6":
-            orf_wanted = orf3rc
+            orf_wanted = orfs[5]
             orf_label = "orf3rc"
         elif frame == "autodetect":
             if stop == "no":
-                if "*" not in orf1:
-                    orf_wanted = orf1
+                if "*" not in orfs[0]:
+                    orf_wanted = orfs[0]
                     orf_label = "orf1"
-                elif "*" not in orf2:
-                    orf_wanted = orf2
+                elif "*" not in orfs[1]:
+                    orf_wanted = orfs[1]
                     orf_label = "orf2"
-                elif "*" not in orf3:
-                    orf_wanted = orf3
+                elif "*" not in orfs[2]:
+                    orf_wanted = orfs[2]
                     orf_label = "orf3"
-                elif "*" not in orf1rc:
-                    orf_wanted = orf1rc
+                elif "*" not in orfs[3]:
+                    orf_wanted = orfs[3]
                     orf_label = "orf1rc"
-                elif "*" not in orf2rc:
-                    orf_wanted = orf2rc
+                elif "*" not in orfs[4]:
+                    orf_wanted = orfs[4]
                     orf_label = "orf2rc"
-                elif "*" not in orf3rc:
-                    orf_wanted = orf3rc
+                elif "*" not in orfs[5]:
+                    orf_wanted = orfs[5]
                     orf_label = "orf3rc"
                 # no translation without stops
                 else:
                     nr_stops_list = []
-                    for orf in orf_list:
+                    for orf in orfs:
                         nr_stops = str(orf).count("*")
                         nr_stops_list.append(nr_stops)
                     min_stops = min(nr_stops_list)
                     pos = nr_stops_list.index(min_stops)
-                    orf_wanted = orf_list[pos]
+                    orf_wanted = orfs[pos]
 
     if input_type == "transcript":
         orf_label = "none"
-        if "*" not in orf1:
-            orf_wanted = orf1
-            orf_label = "orf1"
-        if "*" not in orf2:
-            orf_wanted = orf2
-            orf_label = "orf2"
-        if "*" not in orf3:
-            orf_wanted = orf3
-            orf_label = "orf3"
-        if "*" not in orf1rc:
-            orf_wanted = orf1rc
-            orf_label = "orf1rc"
-        if "*" not in orf2rc:
-            orf_wanted = orf2rc
-            orf_label = "orf2rc"
-        if "*" not in orf3rc:
-            orf_wanted = orf3rc
-            orf_label = "orf3rc"
+        # the last frame without stops is wanted
+        for index in reversed(range(6)):
+            if "*" not in orfs[index]:
+                orf_wanted = orfs[index]
+                orf_label = ORF_LABELS[index]
+                break
         loggi.write(record.id + "\n")
         # no sequence without stops
         if orf_label == "none":
             wanted_len = 0
             zae = 0
-            for orf in orf_list:
+            for orf in orfs:
                 nr_stops = str(orf).count("*")
                 splitti = orf.split("*")
                 i = 0
@@ -329,8 +380,7 @@ def translate_DNA_record(record, options: Options):
                     orf_wanted = splitti[index]
                     pos_orf = str(orf).find(str(orf_wanted))
                     wanted_len = len(splitti[index])
-                    orf_key = list(orf_dict.keys())
-                    orf_label = orf_key[zae]
+                    orf_label = ORF_LABELS[zae]
                 zae = zae + 1
             loggi.write(
                 "orf_wanted is "
@@ -343,7 +393,7 @@ def translate_DNA_record(record, options: Options):
                 + orf_label
                 + "\n"
             )
-            full_orf_len = len(str(orf_dict[orf_label]))
+            full_orf_len = len(str(orfs[ORF_LABELS.index(orf_label)]))
             if orf_label == "orf1":
                 dna_start = pos_orf * 3
                 dna_end = dna_start + wanted_len * 3
@@ -364,7 +414,7 @@ def translate_DNA_record(record, options: Options):
                 dna_end = dna_start + (wanted_len * 3) + 2
             else:
                 raise Exception("Unexpected ORF label: " + orf_label)
-            orfx = record.seq[dna_start:dna_end].translate(table=table_nr)
+            orfx = get_codon_translator(table_nr, gap="-").translate(str(record.seq[dna_start:dna_end]), strict=True)
 
             loggi.write(
                 "dna "
@@ -402,7 +452,7 @@ def translate_DNA_record(record, options: Options):
                 dna_end = dna_start + (wanted_len * 3) + 2
             else:
                 raise Exception("Unexpected ORF label: " + orf_label)
-            orfx = record.seq[dna_start:dna_end].translate(table=table_nr)
+            orfx = get_codon_translator(table_nr, gap="-").translate(str(record.seq[dna_start:dna_end]), strict=True)
 
             loggi.write(
                 "dna "
@@ -415,71 +465,80 @@ def translate_DNA_record(record, options: Options):
             )
             nucli.write(str(record.seq[dna_start:dna_end]) + "\n")
 
+    if orf_wanted is None:
+        orf_wanted = orfs[0]
     return orf_wanted
 
 
 # special function for mode all
 def translate_DNA_record_solo(record, table_nr, nr):
-    if len(record) % 3 == 0:
-        orf1 = record.seq.translate(table=table_nr)
-        orf2 = record.seq[1:-3].translate(table=table_nr)
-        orf3 = record.seq[2:-2].translate(table=table_nr)
-
-        orf1rc = record.seq.reverse_complement().translate(table=table_nr)
-        orf2rc = record.seq[1:-3].reverse_complement().translate(table=table_nr)
-        orf3rc = record.seq[2:-2].reverse_complement().translate(table=table_nr)
-
-    elif len(record) % 3 == 1:
-        orf1 = record.seq[0:-2].translate(table=table_nr)
-        orf2 = record.seq[1:-1].translate(table=table_nr)
-        orf3 = record.seq[2:-3].translate(table=table_nr)
-
-        orf1rc = record.seq[0:-2].reverse_complement().translate(table=table_nr)
-        orf2rc = record.seq[1:-1].reverse_complement().translate(table=table_nr)
-        orf3rc = record.seq[2:-3].reverse_complement().translate(table=table_nr)
-
-    elif len(record) % 3 == 2:
-        orf1 = record.seq[0:-3].translate(table=table_nr)
-        orf2 = record.seq[1:-2].translate(table=table_nr)
-        orf3 = record.seq[2:-1].translate(table=table_nr)
-
-        orf1rc = record.seq[0:-3].reverse_complement().translate(table=table_nr)
-        orf2rc = record.seq[1:-2].reverse_complement().translate(table=table_nr)
-        orf3rc = record.seq[2:-1].reverse_complement().translate(table=table_nr)
-
-    if nr == 1:
-        orf_wanted = orf1
-        # orf_label = "orf1"
-    elif nr == 2:
-        orf_wanted = orf2
-        # orf_label = "orf2"
-    elif nr == 3:
-        orf_wanted = orf3
-        # orf_label = "orf3"
-    elif nr == 4:
-        orf_wanted = orf1rc
-        # orf_label = "orf1rc"
-    elif nr == 5:
-        orf_wanted = orf2rc
-        # orf_label = "orf2rc"
-    elif nr == 6:
-        orf_wanted = orf3rc
-        # orf_label = "orf3rc"
+    return LazyOrfs(str(record.seq), table_nr)[nr - 1]
 
-    return orf_wanted
+
+def translate_chunk(records: list[FastaRecord], input_type: str, frame: str, code: str | int, stop: str):
+    """Translate a chunk of records, returning the text of the output, log, nucleotide and translation_6 files"""
+    options = ChunkOptions(input_type, frame, code, stop)
+    if input_type == "all":
+        for record in records:
+            protein_record = prot_record_solo(record, options)
+            options.translation_6.write(format_fasta_record(protein_record))
+    else:
+        for record in records:
+            protein_record = prot_record(record, options)
+            options.output_file.write(format_fasta_record(protein_record))
+    return (
+        options.output_file.getvalue(),
+        options.log_file.getvalue(),
+        options.nucleotide_file.getvalue(),
+        options.translation_6.getvalue(),
+    )
+
+
+def iter_chunks(records: Iterable[FastaRecord], size: int) -> Iterator[list[FastaRecord]]:
+    records = iter(records)
+    while chunk := list(islice(records, size)):
+        yield chunk
+
+
+def map_chunks(func: Callable, chunks: Iterable[list], num_workers: int) -> Iterator:
+    """
+    Map 'func' over the chunks on a pool of 'num_workers' processes, yielding results in input order.
+    Chunks that finish early wait in a reorder buffer, which also limits how many chunks are in flight.
+    """
+    if num_workers <= 1:
+        yield from map(func, chunks)
+        return
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(func, chunk))
+            if len(pending) >= 2 * num_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
 
 
 def translate(options: Options):
-    if options.input_type == "all":
-        prot_record_solo_partial = partial(prot_record_solo, options=options)
-        records = map(prot_record_solo_partial, SeqIO.parse(options.input_file, "fasta"))
-        SeqIO.write(records, options.translation_6, "fasta")
-    else:
-        prot_record_partial = partial(prot_record, options=options)
-        records = map(prot_record_partial, SeqIO.parse(options.input_file, "fasta"))
-        options.output_file.close()
-        SeqIO.write(records, options.output_path, "fasta")
-    options.close_files()
+    job = partial(
+        translate_chunk,
+        input_type=options.input_type,
+        frame=options.frame,
+        code=options.code,
+        stop=options.stop,
+    )
+    chunks = iter_chunks(iter_fasta_records(options.input_file), TRANSLATION_CHUNK_SIZE)
+    translation_6 = open(options.translation_6, "w") if options.input_type == "all" else None
+    try:
+        for output, log, nucleotides, translations in map_chunks(job, chunks, options.num_workers):
+            options.output_file.write(output)
+            options.log_file.write(log)
+            options.nucleotide_file.write(nucleotides)
+            if translation_6 is not None:
+                translation_6.write(translations)
+    finally:
+        if translation_6 is not None:
+            translation_6.close()
+        options.close_files()
 
 
 if __name__ == "__main__":
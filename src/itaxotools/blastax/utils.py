@@ -1,6 +1,9 @@
+import gzip
 import re
 import unicodedata
+from contextlib import nullcontext
 from pathlib import Path
+from typing import Callable
 
 
 def check_fasta_headers(file_path):
@@ -103,54 +106,31 @@ def trans_triplett(triplett):
     return codon_map.get(triplett, "X")
 
 
+COMPLEMENT_STRICT_TABLE = str.maketrans("ACGT", "TGCA")
+
+
 def complement(seq):
-    comp = ""
-    for i in range(0, len(seq)):
-        if seq[i] == "A":
-            comp = comp + "T"
-        elif seq[i] == "T":
-            comp = comp + "A"
-        elif seq[i] == "G":
-            comp = comp + "C"
-        elif seq[i] == "C":
-            comp = comp + "G"
-    return comp
+    """Complement of the sequence, all characters other than ACGT are dropped"""
+    return re.sub(r"[^ACGT]", "", seq).translate(COMPLEMENT_STRICT_TABLE)
+
+
+def _translate_triplets(translator, line, start, stop):
+    # Translate the triplets at range(start, stop, 3), partial triplets are unknown
+    count = len(range(start, stop, 3))
+    complete = min(count, max(0, (len(line) - start) // 3))
+    return translator.translate(line[start : start + complete * 3]) + "X" * (count - complete)
 
 
 def translate(line):
+    from .codons import get_codon_translator
+
+    translator = get_codon_translator(1, stop_symbol="X", unknown_symbol="X", ambiguous=False, ignore_case=False)
+    reverse = complement(line)[::-1]
     prot_list = []
-    ami_string_frame1 = ""
-    for i in range(0, len(line) - 1, 3):
-        ami = trans_triplett(line[i : i + 3])
-        ami_string_frame1 = ami_string_frame1 + ami
-    prot_list.append(ami_string_frame1)
-    ami_string_frame2 = ""
-    for i in range(1, len(line) - 3, 3):
-        ami = trans_triplett(line[i : i + 3])
-        ami_string_frame2 = ami_string_frame2 + ami
-    prot_list.append(ami_string_frame2)
-    ami_string_frame3 = ""
-    for i in range(2, len(line) - 3, 3):
-        ami = trans_triplett(line[i : i + 3])
-        ami_string_frame3 = ami_string_frame3 + ami
-    prot_list.append(ami_string_frame3)
-    compi = complement(line)
-    reverse = compi[::-1]
-    ami_string_frame1r = ""
-    for i in range(0, len(reverse) - 1, 3):
-        ami = trans_triplett(reverse[i : i + 3])
-        ami_string_frame1r = ami_string_frame1r + ami
-    prot_list.append(ami_string_frame1r)
-    ami_string_frame2r = ""
-    for i in range(1, len(reverse) - 3, 3):
-        ami = trans_triplett(reverse[i : i + 3])
-        ami_string_frame2r = ami_string_frame2r + ami
-    prot_list.append(ami_string_frame2r)
-    ami_string_frame3r = ""
-    for i in range(2, len(reverse) - 3, 3):
-        ami = trans_triplett(reverse[i : i + 3])
-        ami_string_frame3r = ami_string_frame3r + ami
-    prot_list.append(ami_string_frame3r)
+    for sequence in [line, reverse]:
+        prot_list.append(_translate_triplets(translator, sequence, 0, len(sequence) - 1))
+        prot_list.append(_translate_triplets(translator, sequence, 1, len(sequence) - 3))
+        prot_list.append(_translate_triplets(translator, sequence, 2, len(sequence) - 3))
     return prot_list
 
 
@@ -214,10 +194,206 @@ def is_fastq(path: Path | str) -> bool:
     return False
 
 
+def is_gzip(path: Path | str) -> bool:
+    with open(path, "rb") as file:
+        return file.read(2) == b"\x1f\x8b"
+
+
+def open_query(path: Path | str):
+    """Open a query file for reading as text, decompressing it on the fly if gzipped"""
+    if is_gzip(path):
+        return gzip.open(path, "rt")
+    return open(path, "r")
+
+
+def get_query_format(path: Path | str) -> str | None:
+    """Sniff whether a possibly gzipped query file is FASTA or FASTQ from its first record"""
+    with open_query(path) as file:
+        for line in file:
+            if not line.strip() or line.startswith(";"):
+                continue
+            if line.startswith(">"):
+                return "fasta"
+            if line.startswith("@"):
+                return "fastq"
+            return None
+    return None
+
+
+class QueryParseError(Exception):
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        super().__init__(f"Missing sequence identifier in query file: {self.path.name}")
+
+
+def normalize_query(input_path: Path | str, output_path: Path | str, fasta_path: Path | str | None = None):
+    """
+    Prepare a query file for BLAST+ in a single pass: FASTQ is converted to FASTA,
+    gaps are removed from the sequences and every header is checked for an identifier.
+    Gzipped input is decompressed on the fly. Input that is neither FASTA nor FASTQ
+    is only stripped of gaps, leaving its validation to BLAST+.
+    If `fasta_path` is given, the same records are also written there as plain FASTA
+    with their gaps kept, for the steps that read the original sequences.
+    """
+    format = get_query_format(input_path)
+    with (
+        open_query(input_path) as infile,
+        open(output_path, "w") as outfile,
+        open(fasta_path, "w") if fasta_path is not None else nullcontext() as fastafile,
+    ):
+        if format == "fastq":
+            _normalize_fastq(input_path, infile, outfile, fastafile)
+        else:
+            _normalize_fasta(input_path, infile, outfile, fastafile)
+
+
+def _normalize_fasta(input_path: Path | str, infile, outfile, fastafile=None):
+    write = outfile.write
+    write_fasta = fastafile.write if fastafile is not None else None
+    for line in infile:
+        if write_fasta is not None:
+            write_fasta(line)
+        if line.startswith(">"):
+            if not line[1:].strip():
+                raise QueryParseError(input_path)
+            write(line)
+        else:
+            write(line.replace("-", ""))
+
+
+def _normalize_fastq(input_path: Path | str, infile, outfile, fastafile=None):
+    write = outfile.write
+    write_fasta = fastafile.write if fastafile is not None else None
+    id = None
+    seq = None
+    for line in infile:
+        if not line.strip():
+            continue
+        if line.startswith("@"):
+            id = line.removeprefix("@").strip()
+            if not id:
+                raise QueryParseError(input_path)
+            continue
+        if id is not None and seq is None:
+            seq = line.strip()
+            continue
+        if line.startswith("+"):
+            if id is None or seq is None:
+                raise FastqParseError(input_path)
+            infile.readline()
+            write(f">{id}\n{seq.replace('-', '')}\n")
+            if write_fasta is not None:
+                write_fasta(f">{id}\n{seq}\n")
+            id = None
+            seq = None
+            continue
+
+
 # Utils for fasta name modifier
-def string_trimmer(
-    komm_zeile: str,
-    counter: int,
+
+# The dictionary used to translate extended ASCII into ASCII representation by lib.utils.sanitize
+EXT_ASCII_TRANS = {
+    "ƒ": "f",
+    "Š": "S",
+    "Œ": "OE",
+    "Ž": "Z",
+    "š": "s",
+    "œ": "oe",
+    "ž": "z",
+    "Ÿ": "Y",
+    "¡": "i",
+    "¢": "c",
+    "ª": "a",
+    "²": "2",
+    "³": "3",
+    "µ": "u",
+    "¹": "1",
+    "º": "o",
+    "À": "A",
+    "Á": "A",
+    "Â": "A",
+    "Ã": "A",
+    "Ä": "Ae",
+    "Å": "A",
+    "Æ": "Ae",
+    "Ç": "C",
+    "È": "E",
+    "É": "E",
+    "Ê": "E",
+    "Ë": "E",
+    "Ì": "I",
+    "Í": "I",
+    "Î": "I",
+    "Ï": "I",
+    "Ð": "D",
+    "Ñ": "N",
+    "Ò": "O",
+    "Ó": "O",
+    "Ô": "O",
+    "Õ": "O",
+    "Ö": "Oe",
+    "×": "x",
+    "Ø": "O",
+    "Ù": "U",
+    "Ú": "U",
+    "Û": "U",
+    "Ü": "Ue",
+    "Ý": "Y",
+    "ß": "ss",
+    "à": "a",
+    "á": "a",
+    "â": "a",
+    "ã": "a",
+    "ä": "ae",
+    "å": "a",
+    "æ": "a",
+    "ç": "c",
+    "è": "e",
+    "é": "e",
+    "ê": "e",
+    "ë": "e",
+    "ì": "i",
+    "í": "i",
+    "î": "i",
+    "ï": "i",
+    "ð": "d",
+    "ñ": "n",
+    "ò": "o",
+    "ó": "o",
+    "ô": "o",
+    "õ": "o",
+    "ö": "oe",
+    "ù": "ue",
+    "ú": "ue",
+    "û": "ue",
+    "ü": "ue",
+    "ý": "y",
+    "ÿ": "y",
+}
+
+
+class SanitizeTable(dict):
+    """
+    Translation table for str.translate that keeps letters_and_numbers,
+    transliterates extended ASCII and replaces everything else with '_'.
+    Each character is only looked up once, then served from the dict.
+    """
+
+    def __init__(self, letters_and_numbers: str):
+        super().__init__()
+        self.letters_and_numbers = set(letters_and_numbers)
+
+    def __missing__(self, key: int) -> str:
+        char = chr(key)
+        if char in self.letters_and_numbers:
+            value = char
+        else:
+            value = EXT_ASCII_TRANS.get(char) or "_"
+        self[key] = value
+        return value
+
+
+def get_string_trimmer(
     trim: bool,
     add: bool,
     replace: bool,
@@ -230,138 +406,90 @@ def string_trimmer(
     addstring: str = None,
     findstring: str = None,
     replacestring: str = None,
-) -> str:
-    # The dictionary used to translate extended ASCII into ASCII representation by lib.utils.sanitize
-    ext_ascii_trans = {
-        "ƒ": "f",
-        "Š": "S",
-        "Œ": "OE",
-        "Ž": "Z",
-        "š": "s",
-        "œ": "oe",
-        "ž": "z",
-        "Ÿ": "Y",
-        "¡": "i",
-        "¢": "c",
-        "ª": "a",
-        "²": "2",
-        "³": "3",
-        "µ": "u",
-        "¹": "1",
-        "º": "o",
-        "À": "A",
-        "Á": "A",
-        "Â": "A",
-        "Ã": "A",
-        "Ä": "Ae",
-        "Å": "A",
-        "Æ": "Ae",
-        "Ç": "C",
-        "È": "E",
-        "É": "E",
-        "Ê": "E",
-        "Ë": "E",
-        "Ì": "I",
-        "Í": "I",
-        "Î": "I",
-        "Ï": "I",
-        "Ð": "D",
-        "Ñ": "N",
-        "Ò": "O",
-        "Ó": "O",
-        "Ô": "O",
-        "Õ": "O",
-        "Ö": "Oe",
-        "×": "x",
-        "Ø": "O",
-        "Ù": "U",
-        "Ú": "U",
-        "Û": "U",
-        "Ü": "Ue",
-        "Ý": "Y",
-        "ß": "ss",
-        "à": "a",
-        "á": "a",
-        "â": "a",
-        "ã": "a",
-        "ä": "ae",
-        "å": "a",
-        "æ": "a",
-        "ç": "c",
-        "è": "e",
-        "é": "e",
-        "ê": "e",
-        "ë": "e",
-        "ì": "i",
-        "í": "i",
-        "î": "i",
-        "ï": "i",
-        "ð": "d",
-        "ñ": "n",
-        "ò": "o",
-        "ó": "o",
-        "ô": "o",
-        "õ": "o",
-        "ö": "oe",
-        "ù": "ue",
-        "ú": "ue",
-        "û": "ue",
-        "ü": "ue",
-        "ý": "y",
-        "ÿ": "y",
-    }
-    komm_zeile = unicodedata.normalize("NFC", komm_zeile)
-    new_komm = komm_zeile
-    laenge = len(new_komm)
-    nk = ""
-
-    new_komm = komm_zeile.replace("﻿>", ">")  # Replace look-alike characters
-
-    # Adding string at the beginning or end
-    if add:
-        if direc == "beginning":
-            strippi = new_komm.lstrip(">")
-            new_komm = ">" + addstring + strippi
-        elif direc == "end":
+) -> Callable[[str, int], str]:
+    """
+    Prepare the header modifications once and return a function
+    that applies them to a header line given its counter.
+    See string_trimmer for the meaning of the arguments.
+    """
+    add_beginning = add and direc == "beginning"
+    add_end = add and direc == "end"
+    trim_beginning = trim and trimpos == "beginning"
+    trim_end = trim and trimpos == "end"
+    if trim:
+        trimmaxchar = int(trimmaxchar) - 1 if auto else int(trimmaxchar)
+    sanitize_table = SanitizeTable(letters_and_numbers) if sanitize else None
+    normalize = unicodedata.normalize
+
+    def trimmer(komm_zeile: str, counter: int) -> str:
+        if not komm_zeile.isascii():
+            komm_zeile = normalize("NFC", komm_zeile)
+        laenge = len(komm_zeile)
+
+        new_komm = komm_zeile.replace("﻿>", ">")  # Replace look-alike characters
+
+        # Adding string at the beginning or end
+        if add_beginning:
+            new_komm = ">" + addstring + new_komm.lstrip(">")
+        elif add_end:
             new_komm = new_komm + addstring
 
-    # Replacing strings
-    if replace:
-        new_komm = ">" + new_komm[1:].replace(findstring, replacestring)
+        # Replacing strings
+        if replace:
+            new_komm = ">" + new_komm[1:].replace(findstring, replacestring)
 
-    # Trimming
-    if trim:
-        counterpad = len(str(int(counter))) - 1
+        # Trimming
+        if trim:
+            maxchar = trimmaxchar - len(str(int(counter))) + 1
+            if trim_beginning:
+                new_komm = ">" + new_komm[laenge - maxchar :]
+            elif trim_end:
+                new_komm = ">" + new_komm[1:maxchar]
+
+        # Autoincrement
         if auto:
-            trimmaxchar = int(trimmaxchar) - counterpad - 1
-        else:
-            trimmaxchar = int(trimmaxchar) - counterpad
-
-        if trimpos == "beginning":
-            startpos = laenge - int(trimmaxchar)
-            new_komm = ">" + new_komm[startpos:]
-        elif trimpos == "end":
-            endpos = int(trimmaxchar)
-            new_komm = ">" + new_komm[1:endpos]
-
-    # Autoincrement
-    if auto:
-        new_komm = f"{new_komm}_{counter}"
-    # Sanitization: Replace characters not in letters_and_numbers with '_'
-    if sanitize:
-        nk = ""
-        for zeichen in new_komm:
-            if zeichen in letters_and_numbers:
-                nk += zeichen
-            else:
-                translated_char = ext_ascii_trans.get(zeichen)
-                if translated_char:
-                    nk += translated_char
-                else:
-                    nk += "_"
-        new_komm = nk
-
-    return new_komm
+            new_komm = f"{new_komm}_{counter}"
+
+        # Sanitization: Replace characters not in letters_and_numbers with '_'
+        if sanitize_table is not None:
+            new_komm = new_komm.translate(sanitize_table)
+
+        return new_komm
+
+    return trimmer
+
+
+def string_trimmer(
+    komm_zeile: str,
+    counter: int,
+    trim: bool,
+    add: bool,
+    replace: bool,
+    sanitize: bool,
+    trimpos: str,
+    trimmaxchar: int,
+    auto: bool,
+    letters_and_numbers: str,
+    direc: str = None,
+    addstring: str = None,
+    findstring: str = None,
+    replacestring: str = None,
+) -> str:
+    trimmer = get_string_trimmer(
+        trim=trim,
+        add=add,
+        replace=replace,
+        sanitize=sanitize,
+        trimpos=trimpos,
+        trimmaxchar=trimmaxchar,
+        auto=auto,
+        letters_and_numbers=letters_and_numbers,
+        direc=direc,
+        addstring=addstring,
+        findstring=findstring,
+        replacestring=replacestring,
+    )
+    return trimmer(komm_zeile, counter)
 
 
 def make_str_blast_safe(text: str) -> str:
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from functools import partial
+from pathlib import Path
+
+import pytest
+
+import itaxotools
+from itaxotools.blastax.tasks.common.process import run_batch_jobs, run_scheduled_jobs
+
+
+def square(path: Path) -> int:
+    value = int(path.read_text())
+    if value < 0:
+        raise ValueError(f"Negative value: {value}")
+    return value * value
+
+
+def square_threaded(path: Path, num_threads: int) -> tuple[int, int]:
+    return square(path), num_threads
+
+
+@pytest.fixture
+def progress(monkeypatch: pytest.MonkeyPatch) -> list[tuple]:
+    calls = []
+    monkeypatch.setattr(itaxotools, "progress_handler", lambda *args: calls.append(args), raising=False)
+    return calls
+
+
+def write_inputs(tmp_path: Path, values: list[int]) -> list[Path]:
+    paths = []
+    for i, value in enumerate(values):
+        path = tmp_path / f"input_{i}.txt"
+        path.write_text(str(value))
+        paths.append(path)
+    return paths
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_run_batch_jobs(tmp_path: Path, progress: list[tuple], max_workers: int) -> None:
+    input_paths = write_inputs(tmp_path, [1, -2, 3, 4, -5, 6])
+    error_log_paths = [path.with_suffix(".log") for path in input_paths]
+    jobs = [partial(square, path) for path in input_paths]
+
+    values, failed = run_batch_jobs(jobs, input_paths, error_log_paths, max_workers)
+
+    assert values == [1, None, 9, 16, None, 36]
+    assert failed == [input_paths[1], input_paths[4]]
+    assert "Negative value: -2" in error_log_paths[1].read_text()
+    assert "Negative value: -5" in error_log_paths[4].read_text()
+    assert not error_log_paths[0].exists()
+    assert progress[-1] == ("Done processing files.", 6, 0, 6)
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_run_batch_jobs_raises_without_logs(tmp_path: Path, progress: list[tuple], max_workers: int) -> None:
+    input_paths = write_inputs(tmp_path, [1, -2, 3, -4])
+    jobs = [partial(square, path) for path in input_paths]
+
+    with pytest.raises(ValueError, match="Negative value: -2"):
+        run_batch_jobs(jobs, input_paths, max_workers=max_workers)
+
+
+def test_run_batch_jobs_raises_for_single_file(tmp_path: Path, progress: list[tuple]) -> None:
+    input_paths = write_inputs(tmp_path, [-1])
+    error_log_paths = [path.with_suffix(".log") for path in input_paths]
+    jobs = [partial(square, path) for path in input_paths]
+
+    with pytest.raises(ValueError):
+        run_batch_jobs(jobs, input_paths, error_log_paths, max_workers=4)
+    assert not error_log_paths[0].exists()
+
+
+@pytest.mark.parametrize(
+    "num_threads, expected_threads, expected_message",
+    [
+        (1, 1, "Processing file 1/4: input_1.txt"),
+        (2, 1, "Processing 4 files with 2 workers"),
+        (8, 2, "Processing 4 files with 4 workers"),
+    ],
+)
+def test_run_scheduled_jobs(
+    tmp_path: Path, progress: list[tuple], num_threads: int, expected_threads: int, expected_message: str
+) -> None:
+    input_paths = write_inputs(tmp_path, [1, 1000, -3, 10])
+    error_log_paths = [path.with_suffix(".log") for path in input_paths]
+    jobs = [partial(square_threaded, path) for path in input_paths]
+
+    values, failed, seconds = run_scheduled_jobs(jobs, input_paths, error_log_paths, num_threads)
+
+    assert values == [(1, expected_threads), (1000000, expected_threads), None, (100, expected_threads)]
+    assert failed == [input_paths[2]]
+    assert list(seconds) == [input_paths[0], input_paths[1], input_paths[3]]
+    assert all(value >= 0 for value in seconds.values())
+    assert "Negative value: -3" in error_log_paths[2].read_text()
+    assert progress[0][0] == expected_message
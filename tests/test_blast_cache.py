@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from itaxotools.blastax import cache as cache_module
+from itaxotools.blastax.cache import BlastCache, hash_file
+
+
+def write_entry(cache: BlastCache, tmp_path: Path, key: str, data: str, mtime: int) -> None:
+    source = tmp_path / f"{key}.txt"
+    source.write_text(data)
+    cache.put(key, source)
+    os.utime(cache.path / f"{key}{cache.suffix}", ns=(mtime, mtime))
+
+
+def test_blast_cache_get_put(tmp_path: Path) -> None:
+    cache = BlastCache(tmp_path / "cache")
+    output_path = tmp_path / "output.txt"
+
+    assert not cache.get("missing", output_path)
+    assert not output_path.exists()
+
+    write_entry(cache, tmp_path, "key", "query\tsubject\n", 0)
+    assert cache.get("key", output_path)
+    assert output_path.read_text() == "query\tsubject\n"
+
+
+def test_blast_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = BlastCache(tmp_path / "cache", max_size=25)
+    output_path = tmp_path / "output.txt"
+
+    write_entry(cache, tmp_path, "first", "a" * 10, 1_000_000_000)
+    write_entry(cache, tmp_path, "second", "b" * 10, 2_000_000_000)
+    assert cache.get("first", output_path)
+
+    write_entry(cache, tmp_path, "third", "c" * 10, 3_000_000_000)
+    assert cache.get("first", output_path)
+    assert not cache.get("second", output_path)
+    assert cache.get("third", output_path)
+
+
+def test_hash_file(tmp_path: Path) -> None:
+    path_a = tmp_path / "a.fas"
+    path_b = tmp_path / "b.fas"
+    path_a.write_text(">seq\nACGT\n")
+    path_b.write_text(">seq\nACGT\n")
+    assert hash_file(path_a) == hash_file(path_b)
+
+    path_b.write_text(">seq\nACGA\n")
+    assert hash_file(path_a) != hash_file(path_b)
+
+
+def test_blast_cache_skips_large_files(tmp_path: Path) -> None:
+    cache = BlastCache(tmp_path / "cache", max_size=25)
+    output_path = tmp_path / "output.txt"
+
+    write_entry(cache, tmp_path, "small", "a" * 10, 1_000_000_000)
+    source = tmp_path / "large.txt"
+    source.write_text("b" * 30)
+    cache.put("large", source)
+
+    assert not cache.get("large", output_path)
+    assert cache.get("small", output_path)
+
+
+def test_blast_cache_key_shards(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(cache_module, "get_database_fingerprint", lambda path: str(path))
+    cache = BlastCache(tmp_path / "cache")
+    query_path = tmp_path / "query.fas"
+    query_path.write_text(">seq\nACGT\n")
+
+    def key(**kwargs) -> str:
+        return cache.key("blastn", query_path, "database", "1e-5", "6 qseqid", "", **kwargs)
+
+    assert key() == key(shards=1) == key(shards=1, shard_by="residues")
+    assert key(shards=2) != key()
+    assert key(shards=2) != key(shards=4)
+    assert key(shards=2) != key(shards=2, shard_by="residues")
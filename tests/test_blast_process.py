@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import sys
+import threading
+from pathlib import Path
+from time import perf_counter
+
+import pytest
+
+from itaxotools.blastax.blast import BlastCancelled, run_blast_process
+
+
+def python_args(code: str) -> list[str]:
+    return [sys.executable, "-c", code]
+
+
+def test_run_blast_process_collects_large_stdout() -> None:
+    # more than a pipe buffer, which used to deadlock
+    result = run_blast_process(python_args("import sys; sys.stdout.write('x' * 2**20)"))
+    assert result.returncode == 0
+    assert result.stdout == b"x" * 2**20
+    assert result.seconds_taken >= 0
+
+
+def test_run_blast_process_streams_stdout_to_file(tmp_path: Path) -> None:
+    stdout_path = tmp_path / "stdout.txt"
+    result = run_blast_process(python_args("print('hello')"), stdout_path=stdout_path)
+    assert result.stdout is None
+    assert stdout_path.read_text().strip() == "hello"
+
+
+def test_run_blast_process_streams_stdout_to_consumer() -> None:
+    chunks = []
+    result = run_blast_process(python_args("print('hello')"), stdout_consumer=chunks.append)
+    assert result.stdout is None
+    assert b"".join(chunks).strip() == b"hello"
+
+
+def test_run_blast_process_forwards_stderr() -> None:
+    lines = []
+    code = "import sys; print('first', file=sys.stderr); print(file=sys.stderr); print('second', file=sys.stderr)"
+    run_blast_process(python_args(code), stderr_handler=lines.append)
+    assert lines == ["first", "second"]
+
+
+def test_run_blast_process_reports_last_error() -> None:
+    code = "import sys; print('warning', file=sys.stderr); print('error: bad input\\n', file=sys.stderr); sys.exit(1)"
+    with pytest.raises(Exception, match="failed: error: bad input"):
+        run_blast_process(python_args(code))
+
+
+def test_run_blast_process_cancel() -> None:
+    cancel_event = threading.Event()
+    timer = threading.Timer(0.2, cancel_event.set)
+    timer.start()
+    ts = perf_counter()
+    with pytest.raises(BlastCancelled):
+        run_blast_process(python_args("import time; time.sleep(30)"), cancel_event=cancel_event)
+    assert perf_counter() - ts < 10
+
+
+def test_run_blast_process_consumer_error() -> None:
+    def consumer(chunk: bytes) -> None:
+        raise ValueError("bad chunk")
+
+    code = "import sys, time; sys.stdout.write('x' * 2**20); sys.stdout.flush(); time.sleep(30)"
+    ts = perf_counter()
+    with pytest.raises(ValueError, match="bad chunk"):
+        run_blast_process(python_args(code), stdout_consumer=consumer)
+    assert perf_counter() - ts < 10
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from itaxotools.blastax.tabular import (
+    STANDARD_OUTFMT_COLUMNS,
+    iter_blast_columns,
+    iter_blast_records,
+    parse_outfmt_columns,
+)
+
+OUTFMT = "6 qseqid sseqid pident length evalue stitle"
+
+TABLE = (
+    "# BLASTN 2.16.0+\n"
+    "# Fields: query id, subject id, % identity, alignment length, evalue, subject title\n"
+    "query_1\tsubject_1\t100.000\t50\t1e-20\tfirst title\n"
+    "\n"
+    "query_1\tsubject_2\t98.500\t48\t3.5e-18\tsecond title\n"
+    "# BLAST processed 2 queries\n"
+    "query_2\tsubject_1\t87.250\t120\t0.0\tthird title"
+)
+
+
+@pytest.fixture
+def table_path(tmp_path: Path) -> Path:
+    path = tmp_path / "blast.tsv"
+    path.write_text(TABLE)
+    return path
+
+
+@pytest.mark.parametrize(
+    "outfmt, columns",
+    [
+        ("6 qseqid sseqid pident", ["qseqid", "sseqid", "pident"]),
+        ("qseqid sseqid pident", ["qseqid", "sseqid", "pident"]),
+        (["qseqid", "length"], ["qseqid", "length"]),
+        ("6", STANDARD_OUTFMT_COLUMNS),
+        ("7 std staxids", STANDARD_OUTFMT_COLUMNS + ["staxids"]),
+    ],
+)
+def test_parse_outfmt_columns(outfmt: str | list[str], columns: list[str]) -> None:
+    assert parse_outfmt_columns(outfmt) == columns
+
+
+def test_iter_blast_records(table_path: Path) -> None:
+    records = list(iter_blast_records(table_path, OUTFMT))
+    assert len(records) == 3
+    assert records[0] == ("query_1", "subject_1", 100.0, 50, 1e-20, "first title")
+    assert records[2].qseqid == "query_2"
+    assert records[2].stitle == "third title"
+    assert isinstance(records[1].length, int)
+    assert isinstance(records[1].pident, float)
+
+
+def test_iter_blast_records_usecols(table_path: Path) -> None:
+    records = list(iter_blast_records(table_path, OUTFMT, usecols=["length", "qseqid"]))
+    assert records == [(50, "query_1"), (48, "query_1"), (120, "query_2")]
+    assert records[0]._fields == ("length", "qseqid")
+
+    with pytest.raises(ValueError):
+        list(iter_blast_records(table_path, OUTFMT, usecols=["bitscore"]))
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 65536])
+def test_iter_blast_columns(table_path: Path, batch_size: int) -> None:
+    usecols = ["qseqid", "pident", "length"]
+    batches = list(iter_blast_columns(table_path, OUTFMT, usecols=usecols, batch_size=batch_size))
+    qseqids = np.concatenate([batch["qseqid"] for batch in batches])
+    pidents = np.concatenate([batch["pident"] for batch in batches])
+    lengths = np.concatenate([batch["length"] for batch in batches])
+
+    assert qseqids.tolist() == ["query_1", "query_1", "query_2"]
+    assert pidents.tolist() == [100.0, 98.5, 87.25]
+    assert lengths.tolist() == [50, 48, 120]
+    assert pidents.dtype == np.float64
+    assert lengths.dtype == np.int64
+
+    mask = (pidents >= 90) & (lengths >= 49)
+    assert qseqids[mask].tolist() == ["query_1"]
+
+
+def test_iter_blast_columns_malformed(tmp_path: Path) -> None:
+    path = tmp_path / "blast.tsv"
+    path.write_text("query_1\tsubject_1\n")
+    with pytest.raises(ValueError):
+        list(iter_blast_columns(path, "6 qseqid sseqid pident"))
@@ -5,7 +5,7 @@ from typing import NamedTuple
 
 import pytest
 
-from itaxotools.blastax.core import blastx_parse
+from itaxotools.blastax.core import NucleotideIndex, blastx_parse
 
 TEST_DATA_DIR = Path(__file__).parent / Path(__file__).stem
 
@@ -21,6 +21,7 @@ class BlastxParseTest(NamedTuple):
     pident: float = 70.0
     length: int = 100
     user_spec_name: str = None
+    in_memory_index: bool = True
 
     def validate(self, tmp_path: Path) -> None:
         input_path = TEST_DATA_DIR / self.input_path
@@ -34,7 +35,16 @@ class BlastxParseTest(NamedTuple):
         user_spec_name = self.user_spec_name
         expected_output = TEST_DATA_DIR / self.expected_output
         blastx_parse(
-            str(input_path), str(blast_result_path), str(output_path), str(extra_nucleotide_path), str(database_name),all_matches, pident, length, user_spec_name
+            str(input_path),
+            str(blast_result_path),
+            str(output_path),
+            str(extra_nucleotide_path),
+            str(database_name),
+            all_matches,
+            pident,
+            length,
+            user_spec_name,
+            self.in_memory_index,
         )
 
         assert output_path.exists()
@@ -93,9 +103,37 @@ blastx_parse_tests = [
         150,
         "shared_name"
     ),
+    BlastxParseTest(  # de-duplication, on-disk index
+        "2gene1_nucleotides_query.fas",
+        "2gene1_nucleotides_query.out",
+        "2gene1_nucleotides_query_blastmatchesadded.fas",
+        "2transcript_assembly_nucleotides.fas",
+        "blastx_db",
+        "2gene1_nucleotides_query_expected.fas",
+        False,
+        in_memory_index=False,
+    ),
 ]
 
 
 @pytest.mark.parametrize("test", blastx_parse_tests)
 def test_museoscript(test: BlastxParseTest, tmp_path: Path) -> None:
     test.validate(tmp_path)
+
+
+@pytest.mark.parametrize("in_memory", [True, False])
+def test_nucleotide_index(in_memory: bool, tmp_path: Path) -> None:
+    path = tmp_path / "nucleotides.fas"
+    with open(path, "w") as file:
+        file.write(">seq one\nACGT\nAC\n>seq_two long name\nGGG\n>seq_two long name extended\nTTT\n>other\nCCC")
+
+    index = NucleotideIndex(path, in_memory=in_memory)
+
+    assert len(index) == 4
+    assert index.get("seq_one") == "ACGTAC\n"
+    assert index.get("seq") == "ACGTAC\n"
+    assert index.get("seq_two_long_name") == "GGG\n"
+    assert index.get("seq_two_lo") == "TTT\n"
+    assert index.get("other") == "CCC\n"
+    assert index.get("missing") is None
+    assert index.get("") is None
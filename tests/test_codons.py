@@ -3,11 +3,16 @@ from __future__ import annotations
 from typing import NamedTuple
 
 import pytest
+from Bio.Data.CodonTable import TranslationError
 
 from itaxotools.blastax.codons import (
     are_counts_ambiguous,
+    back_translate,
     count_stop_codons_for_all_frames_in_sequence,
     find_stop_codon_in_sequence,
+    get_codon_translator,
+    get_stop_codon_scanner,
+    reverse_complement,
     smart_trim_sequence,
 )
 
@@ -44,6 +49,26 @@ class CountStopCodonsTest(NamedTuple):
         assert positions == self.positions
 
 
+class TranslateTest(NamedTuple):
+    sequence: str
+    table_id: int
+    expected: str
+
+    def validate(self) -> None:
+        translator = get_codon_translator(self.table_id)
+        assert translator.translate(self.sequence) == self.expected
+
+
+class TranslateFramesTest(NamedTuple):
+    sequence: str
+    table_id: int
+    expected: list[str]
+
+    def validate(self) -> None:
+        translator = get_codon_translator(self.table_id)
+        assert translator.translate_frames(self.sequence) == self.expected
+
+
 class SmartTrimTest(NamedTuple):
     sequence: str
     table_id: int
@@ -120,6 +145,27 @@ count_stop_codons_tests = [
 ]
 
 
+translate_tests = [
+    TranslateTest("", 1, ""),
+    TranslateTest("AT", 1, ""),
+    TranslateTest("ATG", 1, "M"),
+    TranslateTest("ATGA", 1, "M"),
+    TranslateTest("ATGTAA", 1, "M*"),
+    TranslateTest("atgtaa", 1, "M*"),
+    TranslateTest("ATGTGA", 2, "MW"),
+    TranslateTest("AGA", 2, "*"),
+    TranslateTest("GCNTAR", 1, "A*"),
+    TranslateTest("NNNAC?", 1, "XX"),
+    TranslateTest("AUG", 1, "M"),
+]
+
+
+translate_frames_tests = [
+    TranslateFramesTest("", 1, ["", "", "", "", "", ""]),
+    TranslateFramesTest("ATGAAATAG", 1, ["MK*", "*N", "EI", "LFH", "YF", "IS"]),
+]
+
+
 smart_trim_tests = [
     SmartTrimTest("", 1, False, False, ""),
     SmartTrimTest("", 1, True, True, ""),
@@ -156,6 +202,47 @@ def test_count_stop_codons(test: CountStopCodonsTest) -> None:
     test.validate()
 
 
+@pytest.mark.parametrize("test", translate_tests)
+def test_translate(test: TranslateTest) -> None:
+    test.validate()
+
+
+@pytest.mark.parametrize("test", translate_frames_tests)
+def test_translate_frames(test: TranslateFramesTest) -> None:
+    test.validate()
+
+
+def test_translate_strict() -> None:
+    translator = get_codon_translator(1, gap="-")
+    assert translator.translate("ATG---CCNNNNTAA", strict=True) == "M-PX*"
+    assert translator.translate("ATG-CCNNNTAA") == "MXX*"
+    with pytest.raises(TranslationError, match="Codon '-CC' is invalid"):
+        translator.translate("ATG-CCNNNTAA", strict=True)
+    with pytest.raises(TranslationError, match="Codon '---' is invalid"):
+        get_codon_translator(1).translate("ATG---", strict=True)
+
+
+def test_find_stop_positions() -> None:
+    scanner = get_stop_codon_scanner(1)
+    assert scanner.find_stop_positions("").tolist() == []
+    assert scanner.find_stop_positions("TAGAtaaNTGA").tolist() == [0, 4, 8]
+    assert get_stop_codon_scanner(2).find_stop_positions("TAGAtaaNTGA").tolist() == [0, 1, 4]
+
+
+def test_back_translate() -> None:
+    assert back_translate("", "") == ""
+    assert back_translate("-MK--L", "ATGAAACTG") == "---ATGAAA------CTG"
+    assert back_translate("MK-", "ATGAA") == "ATGAA---"
+    with pytest.raises(ValueError):
+        back_translate("MKL", "ATGAAA")
+
+
+def test_reverse_complement() -> None:
+    assert reverse_complement("") == ""
+    assert reverse_complement("AACGTN") == "NACGTT"
+    assert reverse_complement("acgRY-") == "-RYcgt"
+
+
 @pytest.mark.parametrize("test", smart_trim_tests)
 def test_smart_trim_sequence(test: SmartTrimTest) -> None:
     test.validate()
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from itaxotools.blastax import cache as cache_module
+from itaxotools.blastax import core
+from itaxotools.blastax.cache import AccessionCache
+
+COMBINED = (
+    "query_1\tin_1\t100.000\t200.0\t100\tin_1\n"
+    "query_1\tout_1\t90.000\t150.0\t100\tout_1\n"
+    "query_2\tout_2\t95.000\t180.0\t90\tout_2\n"
+    "query_2\tin_2\t98.000\t190.0\t90\tin_2\n"
+)
+
+
+def test_run_blast_decont_combined(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+
+    def fake_run_blast(**kwargs):
+        calls.append(kwargs)
+        Path(kwargs["output_path"]).write_text(COMBINED)
+
+    monkeypatch.setattr(core, "run_blast", fake_run_blast)
+
+    ingroup_path = tmp_path / "ingroup.tsv"
+    outgroup_path = tmp_path / "outgroup.tsv"
+    core.run_blast_decont_combined(
+        blast_binary="blastn",
+        query_path=tmp_path / "query.fas",
+        ingroup_database_path=tmp_path / "ingroup",
+        outgroup_database_path=tmp_path / "outgroup",
+        ingroup_accessions={"in_1", "in_2"},
+        blasted_ingroup_path=ingroup_path,
+        blasted_outgroup_path=outgroup_path,
+        evalue="1e-5",
+        num_threads=1,
+    )
+
+    assert len(calls) == 1
+    assert calls[0]["database_path"] == f"{tmp_path / 'ingroup'} {tmp_path / 'outgroup'}"
+    assert calls[0]["outfmt"].endswith(" sacc")
+    assert ingroup_path.read_text() == ("query_1\tin_1\t100.000\t200.0\t100\nquery_2\tin_2\t98.000\t190.0\t90\n")
+    assert outgroup_path.read_text() == ("query_1\tout_1\t90.000\t150.0\t100\nquery_2\tout_2\t95.000\t180.0\t90\n")
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["ingroup.tsv", "outgroup.tsv"]
+
+
+def test_get_database_accessions_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+
+    def fake_run_blast_export(database_path, output_path, outfmt, debug=False):
+        calls.append(database_path)
+        return b"in_1\nin_2\n"
+
+    monkeypatch.setattr(core, "run_blast_export", fake_run_blast_export)
+    monkeypatch.setattr(cache_module, "get_database_fingerprint", lambda path: str(path))
+    cache = AccessionCache(tmp_path / "cache")
+
+    assert core.get_database_accessions("ingroup", cache=cache) == {"in_1", "in_2"}
+    assert core.get_database_accessions("ingroup", cache=cache) == {"in_1", "in_2"}
+    assert calls == ["ingroup"]
@@ -1,11 +1,21 @@
 from __future__ import annotations
 
+import gzip
 from pathlib import Path
 from typing import NamedTuple
 
 import pytest
 
-from itaxotools.blastax.utils import fastq_to_fasta, is_fasta, is_fastq
+from itaxotools.blastax.cache import QueryCache
+from itaxotools.blastax.tasks.common.process import prepare_query
+from itaxotools.blastax.utils import (
+    QueryParseError,
+    fastq_to_fasta,
+    get_query_format,
+    is_fasta,
+    is_fastq,
+    normalize_query,
+)
 
 TEST_DATA_DIR = Path(__file__).parent / Path(__file__).stem
 
@@ -43,3 +53,127 @@ fastq_to_fasta_tests = [
 @pytest.mark.parametrize("test", fastq_to_fasta_tests)
 def test_fastq_to_fasta(test: FastqConversionTest, tmp_path: Path) -> None:
     test.validate(tmp_path)
+
+
+@pytest.mark.parametrize("test", fastq_to_fasta_tests)
+@pytest.mark.parametrize("compressed", [False, True])
+def test_normalize_fastq_query(test: FastqConversionTest, compressed: bool, tmp_path: Path) -> None:
+    fastq_path = TEST_DATA_DIR / test.fastq_filename
+    if compressed:
+        fastq_path = tmp_path / (test.fastq_filename + ".gz")
+        with gzip.open(fastq_path, "wb") as file:
+            file.write((TEST_DATA_DIR / test.fastq_filename).read_bytes())
+    output_path = tmp_path / test.fasta_filename
+
+    assert get_query_format(fastq_path) == "fastq"
+    normalize_query(fastq_path, output_path)
+
+    assert output_path.read_text() == (TEST_DATA_DIR / test.fasta_filename).read_text()
+
+
+def test_normalize_fasta_query(tmp_path: Path) -> None:
+    input_path = tmp_path / "query.fasta"
+    input_path.write_text(">seq-1 gapped\nAC--GT\n-ACGT-\n>seq_2\nACGT\n")
+    output_path = tmp_path / "output.fasta"
+
+    normalize_query(input_path, output_path)
+
+    assert output_path.read_text() == ">seq-1 gapped\nACGT\nACGT\n>seq_2\nACGT\n"
+
+
+def test_normalize_query_missing_identifier(tmp_path: Path) -> None:
+    input_path = tmp_path / "query.fasta"
+    input_path.write_text(">seq_1\nACGT\n>\nACGT\n")
+
+    with pytest.raises(QueryParseError):
+        normalize_query(input_path, tmp_path / "output.fasta")
+
+
+def test_normalize_query_keeps_gaps_in_fasta(tmp_path: Path) -> None:
+    input_path = tmp_path / "query.fastq.gz"
+    with gzip.open(input_path, "wt") as file:
+        file.write("@seq_1\nAC--GT\n+\nIIIIII\n")
+    output_path = tmp_path / "output.fasta"
+    fasta_path = tmp_path / "query.fasta"
+
+    normalize_query(input_path, output_path, fasta_path)
+
+    assert output_path.read_text() == ">seq_1\nACGT\n"
+    assert fasta_path.read_text() == ">seq_1\nAC--GT\n"
+
+
+def test_prepare_query_plain_fasta(tmp_path: Path) -> None:
+    fasta_path = TEST_DATA_DIR / "simple.fasta"
+
+    query_path, output_path = prepare_query(fasta_path, tmp_path)
+    assert query_path == fasta_path
+    assert output_path == tmp_path / "simple_no_gaps.fasta"
+
+
+def test_prepare_query_cache(tmp_path: Path) -> None:
+    fastq_path = TEST_DATA_DIR / "simple.fastq"
+    cache = QueryCache(tmp_path / "cache")
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+
+    query_path, output_path = prepare_query(fastq_path, work_dir, cache)
+    assert query_path == work_dir / "simple.fasta"
+    assert output_path == work_dir / "simple_no_gaps.fasta"
+    assert query_path.read_text() == (TEST_DATA_DIR / "simple.fasta").read_text()
+    assert output_path.read_text() == (TEST_DATA_DIR / "simple.fasta").read_text()
+    assert len(list(cache.path.iterdir())) == 2
+
+    query_path.unlink()
+    output_path.unlink()
+    assert cache.get(cache.key(fastq_path), output_path)
+    assert prepare_query(fastq_path, work_dir, cache) == (query_path, output_path)
+    assert query_path.read_text() == (TEST_DATA_DIR / "simple.fasta").read_text()
+    assert output_path.read_text() == (TEST_DATA_DIR / "simple.fasta").read_text()
+
+
+def test_append_batch_databases_prepare_query_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import itaxotools
+    from itaxotools.blastax import core
+    from itaxotools.blastax.tasks.append import process
+
+    calls: list[Path] = []
+
+    def counting_prepare_query(query_path: Path, *args, **kwargs):
+        calls.append(query_path)
+        return prepare_query(query_path, *args, **kwargs)
+
+    def fake_run_blast(**kwargs):
+        assert Path(kwargs["query_path"]).read_text() == ">query_1\nACGT\n>query_2\nACGT\n"
+        Path(kwargs["output_path"]).write_text("")
+
+    for name in ["progress_handler", "get_feedback", "abort"]:
+        monkeypatch.setattr(itaxotools, name, lambda *args: None, raising=False)
+    monkeypatch.setattr(process, "prepare_query", counting_prepare_query)
+    monkeypatch.setattr(core, "run_blast", fake_run_blast)
+
+    query_path = tmp_path / "query.fastq"
+    query_path.write_text("".join(f"@query_{i}\nAC-GT\n+\nIIIII\n" for i in range(1, 3)))
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+    output_path = tmp_path / "output"
+    output_path.mkdir()
+
+    results = process.execute_batch_databases_single_query(
+        work_dir=work_dir,
+        input_query_path=query_path,
+        input_database_paths=[tmp_path / "database_1", tmp_path / "database_2"],
+        output_path=output_path,
+        blast_method="blastn",
+        blast_evalue=1e-5,
+        blast_num_threads=1,
+        match_multiple=False,
+        match_pident=0,
+        match_length=0,
+        specified_identifier=None,
+        append_timestamp=False,
+        append_configuration=False,
+    )
+
+    assert results.failed == []
+    assert calls == [query_path]
+    assert (output_path / "query_with_blast_matches.fasta").read_text().startswith(">query_1\nAC-GT\n>query_2\nAC-GT\n")
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import gzip
+from pathlib import Path
+
+import pytest
+
+from itaxotools.blastax.fastsplit import fastsplit
+
+
+def split(
+    tmp_path: Path,
+    text: str,
+    file_format: str,
+    maxsize: int | None,
+    compressed: bool = False,
+    split_n: int | None = None,
+) -> list[str]:
+    input_path = tmp_path / "input.txt"
+    input_path.write_text(text)
+    output_dir = tmp_path / ("compressed" if compressed else "plain")
+    output_dir.mkdir(exist_ok=True)
+    for path in output_dir.iterdir():
+        path.unlink()
+    fastsplit(
+        file_format=file_format,
+        split_n=split_n,
+        maxsize=maxsize,
+        seqid_pattern=None,
+        sequence_pattern=None,
+        infile_path=str(input_path),
+        compressed=compressed,
+        outfile_template=str(output_dir / "output#.txt"),
+    )
+    paths = [output_dir / f"output_{index}.txt" for index in range(len(list(output_dir.iterdir())))]
+    if compressed:
+        return [gzip.decompress(path.read_bytes()).decode() for path in paths]
+    return [path.read_text() for path in paths]
+
+
+@pytest.mark.parametrize("maxsize", [1000, 30])
+def test_split_compressed(tmp_path: Path, maxsize: int) -> None:
+    text = "leading text\n>seq_1\nACGT\n>seq_2\nACGTACGT\n>seq_3\nAC\n"
+
+    assert split(tmp_path, text, "fasta", maxsize, compressed=True) == split(tmp_path, text, "fasta", maxsize)
+    assert "".join(split(tmp_path, text, "fasta", maxsize, compressed=True)) == text[len("leading text\n") :]
+
+
+@pytest.mark.parametrize(
+    "text, file_format, maxsize, expected",
+    [
+        ("leading text\n>a\nAC\n>b\nGT\n", "fasta", 12, [">a\nAC\n>b\nGT\n"]),
+        ("leading text\n>a\nAC\n>b\nGT\n", "fasta", 7, [">a\nAC\n", ">b\nGT\n"]),
+        ("no records\n", "fasta", 7, []),
+        (">a\nAC\n>b\nGT", "fasta", 7, [">a\nAC\n", ">b\nGT"]),
+        (
+            ">a\nACGTACGTACGT\n>b\nGT\n>c\nACGTACGTACGTACGT\n",
+            "fasta",
+            8,
+            [">a\nACGTACGTACGT\n", ">b\nGT\n", ">c\nACGTACGTACGTACGT\n"],
+        ),
+        (
+            "@a\nAC\n+\nII\n@b\nGT\n+\nII\n@c\nTT\n+\nII\n",
+            "fastq",
+            20,
+            ["@a\nAC\n+\nII\n", "@b\nGT\n+\nII\n", "@c\nTT\n+\nII\n"],
+        ),
+        (
+            "@a\nAC\n+\n@I\n@b\nGT\n+\n@I\n@c\nTT\n+\nII\n",
+            "fastq",
+            30,
+            ["@a\nAC\n+\n@I\n@b\nGT\n+\n@I\n", "@c\nTT\n+\nII\n"],
+        ),
+        ("@a\nAC\n+\nII\n@b\nGT\n+\nII", "fastq", 12, ["@a\nAC\n+\nII\n", "@b\nGT\n+\nII"]),
+        (
+            "@a\nACGTACGTACGT\n+\nIIIIIIIIIIII\n@b\nGT\n+\nII\n",
+            "fastq",
+            12,
+            ["@a\nACGTACGTACGT\n+\nIIIIIIIIIIII\n", "@b\nGT\n+\nII\n"],
+        ),
+        ("one\ntwo\nthree", "text", 8, ["one\ntwo\n", "three"]),
+    ],
+)
+def test_split_by_size(tmp_path: Path, text: str, file_format: str, maxsize: int, expected: list[str]) -> None:
+    assert split(tmp_path, text, file_format, maxsize) == (expected or [""])
+
+
+def test_split_by_count(tmp_path: Path) -> None:
+    text = "".join(f">seq_{i}\nACGT\n" for i in range(6))
+
+    files = split(tmp_path, text, "fasta", None, split_n=3)
+    assert len(files) == 3
+    assert "".join(files) == text
+    assert all(file.count(">") == 2 for file in files)
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import gzip
+import struct
+from pathlib import Path
+
+import pytest
+
+from itaxotools.blastax.fastutils import BGZF_BLOCK_SIZE, BGZF_EOF, compress_file_range, open_gzip
+
+TEXT = "".join(f">seq_{i}\n{'ACGT' * (i % 50)}\n" for i in range(5000))
+
+
+def iter_bgzf_blocks(data: bytes):
+    position = 0
+    while position < len(data):
+        assert data[position : position + 4] == b"\x1f\x8b\x08\x04"
+        assert data[position + 12 : position + 14] == b"BC"
+        size = struct.unpack("<H", data[position + 16 : position + 18])[0] + 1
+        yield data[position : position + size]
+        position += size
+    assert position == len(data)
+
+
+@pytest.mark.parametrize("threads", [1, 4])
+def test_bgzf_writer(tmp_path: Path, threads: int) -> None:
+    path = tmp_path / "output.gz"
+    with open_gzip(str(path), "wt", threads=threads) as file:
+        for line in TEXT.splitlines(keepends=True):
+            file.write(line)
+
+    data = path.read_bytes()
+    blocks = list(iter_bgzf_blocks(data))
+    assert len(blocks) > 2
+    assert blocks[-1] == BGZF_EOF
+    assert all(len(gzip.decompress(block)) <= BGZF_BLOCK_SIZE for block in blocks)
+    assert gzip.decompress(data).decode() == TEXT
+
+
+def test_threaded_reader(tmp_path: Path) -> None:
+    path = tmp_path / "input.gz"
+    with gzip.open(path, "wt") as file:
+        file.write(TEXT)
+
+    with open_gzip(str(path), "rt") as file:
+        assert file.name == str(path)
+        assert file.readline() == ">seq_0\n"
+        assert file.read() == TEXT[len(">seq_0\n") :]
+
+    with open_gzip(str(path), "rt") as file:
+        file.readline()
+
+
+def test_compress_file_range(tmp_path: Path) -> None:
+    path = tmp_path / "input.fas"
+    path.write_text(TEXT)
+    output_path = tmp_path / "output.fas.gz"
+
+    compress_file_range(str(path), 100, 1000, str(output_path))
+
+    assert gzip.decompress(output_path.read_bytes()).decode() == TEXT[100:1100]
@@ -49,3 +49,23 @@ museo_tests = [
 @pytest.mark.parametrize("test", museo_tests)
 def test_museoscript(test: MuseoTest, tmp_path: Path) -> None:
     test.validate(tmp_path)
+
+
+def test_museoscript_original_reads_by_id(tmp_path: Path) -> None:
+    blast_path = tmp_path / "blast.out"
+    blast_path.write_text(
+        "read_1\tref_1\tacc_1\ttitle\t0.950\tAC\n"
+        "read_10\tref_1\tacc_1\ttitle\t0.950\tGT\n"
+        "read_truncat\tref_2\tacc_2\ttitle\t0.990\tTT\n"
+    )
+    original_reads_path = tmp_path / "original.fas"
+    original_reads_path.write_text(
+        ">read_10 second\nGGGTTT\n>read_1 first\nAAACCC\n>read_2\nCCCCCC\n>read_truncated_name\nTTTTTT\n"
+    )
+    output_path = tmp_path / "museo.fas"
+
+    museoscript(blast_path, output_path, original_reads_path, pident_threshold=0.9)
+
+    assert output_path.read_text() == (
+        ">read_1_ref_1_0.950\nAAACCC\n>read_10_ref_1_0.950\nGGGTTT\n>read_truncat_ref_2_0.990\nTTTTTT\n"
+    )
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import pytest
+
+from itaxotools.blastax.fastutils import Pattern
+
+
+@pytest.mark.parametrize(
+    "pattern, line, matched",
+    [
+        ('"abc"', "xxABCxx", True),
+        ('"abc"', "xxabxx", False),
+        ('"a.c"', "abc", False),
+        ('"abc" or "def"', "xxdefxx", True),
+        ('"abc" or "def"', "xxdxx", False),
+        ('"abc" and "def"', "abc def", True),
+        ('"abc" and "def"', "abc", False),
+        ('not "abc"', "def", True),
+        ('not ("abc" or "def")', "def", False),
+        ('"abc" or ("def" and not "ghi") or "jkl"', "def", True),
+        ('"abc" or ("def" and not "ghi") or "jkl"', "def ghi", False),
+        ('"abc" or ("def" and not "ghi") or "jkl"', "ghi jkl", True),
+    ],
+)
+def test_pattern_match(pattern: str, line: str, matched: bool) -> None:
+    compiled = Pattern(pattern)
+    assert compiled.match(line) is matched
+    assert compiled.match_bytes(line.encode()) is matched
+
+
+@pytest.mark.parametrize("pattern", ['"abc" or', '("abc"', "abc"])
+def test_pattern_malformed(pattern: str) -> None:
+    with pytest.raises(ValueError):
+        Pattern(pattern)
@@ -5,7 +5,8 @@ from typing import NamedTuple
 
 import pytest
 
-from itaxotools.blastax.core import run_blast
+from itaxotools.blastax import core
+from itaxotools.blastax.core import run_blast, split_query_shards
 from itaxotools.blastax.utils import fastq_to_fasta
 
 TEST_DATA_DIR = Path(__file__).parent / Path(__file__).stem
@@ -21,6 +22,7 @@ class BlastTest(NamedTuple):
     outfmt: str
     other: str
     blast_expected: str
+    shards: int = 1
 
     def validate(self, tmp_path: Path) -> None:
         query_path = TEST_DATA_DIR / self.query_path
@@ -37,6 +39,7 @@ class BlastTest(NamedTuple):
             self.num_threads,
             self.outfmt,
             self.other,
+            shards=self.shards,
         )
         assert output_path.exists()
 
@@ -129,6 +132,30 @@ blast_tests = [
         "",
         "tblastx/tblastx_expected.out",
     ),
+    BlastTest(
+        "blastp",
+        "blastp/proteins.fasta",
+        "blastp/pdbaa",
+        "blastp_output.txt",
+        "0.001",
+        2,
+        "6 length pident qseqid sseqid sseq qframe sframe",
+        "",
+        "blastp/blastp_expected.out",
+        shards=2,
+    ),
+    BlastTest(
+        "tblastx",
+        "tblastx/malamini.fas",
+        "tblastx/mala.fas",
+        "tblastx_output.txt",
+        "0.001",
+        3,
+        "6 length pident qseqid sseqid sseq qframe sframe",
+        "",
+        "tblastx/tblastx_expected.out",
+        shards=3,
+    ),
 ]
 
 
@@ -150,3 +177,39 @@ def test_run_blast_with_fastq_conversion(tmp_path: Path) -> None:
         "fastq/blast_output_fastq_expected.out",
     )
     test.validate(tmp_path)
+
+
+@pytest.mark.parametrize("shards", [1, 2, 3, 10])
+@pytest.mark.parametrize("shard_by", ["records", "residues"])
+def test_split_query_shards(shards: int, shard_by: str, tmp_path: Path) -> None:
+    query_path = TEST_DATA_DIR / "blastn/malamini.fas"
+    paths = split_query_shards(query_path, tmp_path, shards, shard_by)
+    assert len(paths) == min(shards, 3)
+
+    with open(query_path) as file:
+        expected_data = file.read()
+    output_data = "".join(path.read_text() for path in paths)
+    assert output_data == expected_data
+
+
+@pytest.mark.parametrize("outfmt, processes", [("6 qseqid sseqid", 3), ("7 qseqid sseqid", 1), ("5", 1)])
+def test_run_blast_shards_tabular_outputs_only(
+    outfmt: str, processes: int, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    commands = []
+
+    def fake_execute_blast_command(args, blastdb_path=None, debug=False):
+        commands.append(args)
+        Path(args[args.index("-out") + 1]).write_text(Path(args[args.index("-query") + 1]).name + "\n")
+        return b""
+
+    monkeypatch.setattr(core, "execute_blast_command", fake_execute_blast_command)
+
+    query_path = tmp_path / "query.fasta"
+    query_path.write_text(">seq_1\nACGT\n>seq_2\nACGT\n>seq_3\nACGT\n")
+    output_path = tmp_path / "output.txt"
+    run_blast("blastn", query_path, "database", output_path, "0.001", 3, outfmt, "", shards=3)
+
+    assert len(commands) == processes
+    assert len(output_path.read_text().splitlines()) == processes
+    assert all(args[args.index("-num_threads") + 1] == str(3 // processes) for args in commands)
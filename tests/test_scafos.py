@@ -1,12 +1,18 @@
 from pathlib import Path
 from typing import NamedTuple
 
+import numpy as np
 import pytest
 
 from itaxotools.blastax.scafos import (
     GAP_CHARACTERS,
     AmalgamationMethod,
     TagMethod,
+    _assemble_sequence_from_most_common_characters,
+    _calculate_uncorrected_block,
+    _encode_sequences,
+    _get_ambiguity_character,
+    _get_most_common_character,
     count_non_gaps,
     fuse_by_filling_gaps,
     get_amalgamation_method_callable,
@@ -15,6 +21,7 @@ from itaxotools.blastax.scafos import (
     select_by_minimum_distance,
     tag_species_by_method,
 )
+from itaxotools.taxi2.distances import DistanceMetric
 from itaxotools.taxi2.sequences import Sequence, Sequences
 
 from .pytest_utils import assert_file_equals
@@ -323,6 +330,29 @@ def test_fuse_by_min_reports_no_overlap():
         select_by_minimum_distance(sequences)
 
 
+@pytest.mark.parametrize("distance_report", [False, True])
+def test_fuse_by_min_duplicate_ids(distance_report: bool, tmp_path: Path):
+    # sequences with the same id are merged, and only the species of the first is left out
+    mean_report_output = tmp_path / "mean_report.txt"
+    sequences = Sequences([
+            Sequence("a", "AAAA", {"species": "X"}),
+            Sequence("a", "AATT", {"species": "Y"}),
+            Sequence("b", "AAAT", {"species": "Y"}),
+            Sequence("c", "ATTT", {"species": "X"}),
+            Sequence("d", "TTTT", {"species": "Z"}),
+    ])
+
+    select_by_minimum_distance(
+        sequences,
+        tmp_path / "distance_report.txt" if distance_report else None,
+        mean_report_output,
+    )
+
+    assert mean_report_output.read_text() == (
+        "id\tspecies\tmean\na\tX\t0.5\nb\tY\t0.5625\nc\tX\t0.3125\nd\tZ\t0.625\n"
+    )
+
+
 def test_fuse_by_filling_gaps_uneven_lengths():
     with pytest.raises(Exception, match="same length.*'Y'"):
         sequences = Sequences([
@@ -332,3 +362,51 @@ def test_fuse_by_filling_gaps_uneven_lengths():
             Sequence("id4", "TGGTGGT", {"species": "Y"}),
         ])
         fuse_by_filling_gaps(sequences)
+
+
+@pytest.mark.parametrize(
+    "x, y",
+    [
+        ("ACGT", "ACGA"),
+        ("ACGT", "acga"),
+        ("AC-T", "ACGA"),
+        ("ACNT", "ACNA"),
+        ("ACRT", "ACRA"),
+        ("ACRT", "ACYA"),
+        ("A*GT", "A*GA"),
+        ("ACGTAC", "ACGAA"),
+        ("----", "ACGT"),
+    ],
+)
+def test_uncorrected_distances(x: str, y: str):
+    metric = DistanceMetric.Uncorrected()
+    expected = metric.calculate(Sequence("x", x), Sequence("y", y)).d
+
+    matrix = _encode_sequences([Sequence("x", x), Sequence("y", y)])
+    distance = _calculate_uncorrected_block(matrix, np.array([0]))[0, 1]
+    column = _calculate_uncorrected_block(matrix, np.array([0]), np.array([1]))[0, 0]
+
+    if expected is None:
+        assert np.isnan(distance)
+        assert np.isnan(column)
+    else:
+        assert distance == expected
+        assert column == expected
+
+
+@pytest.mark.parametrize("ambiguous", [False, True])
+@pytest.mark.parametrize(
+    "seqs",
+    [
+        ["ACGT", "ACGT", "TCGA"],
+        ["AC-T", "GCTT", "?C*A"],
+        ["acgt", "ACGT", "aCgT"],
+        ["RYN-", "AYNX", "GC ."],
+        ["----", "????", "-?*-"],
+        ["A", "C", "G", "T"],
+    ],
+)
+def test_assemble_sequence_from_most_common_characters(seqs: list[str], ambiguous: bool):
+    func = _get_ambiguity_character if ambiguous else _get_most_common_character
+    expected = "".join(func(characters) for characters in zip(*seqs))
+    assert _assemble_sequence_from_most_common_characters(seqs, ambiguous) == expected
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from itaxotools.blastax import core
+from itaxotools.blastax.core import (
+    TAXO_OUTFMT_COLUMNS,
+    assign_taxonomy,
+    write_best_hits_report,
+    write_organism_report,
+    write_taxonomy_outputs,
+)
+from itaxotools.blastax.tasks.common.process import StagingArea
+from itaxotools.blastax.tasks.taxo.process import execute_single
+
+QUERY = ">query_1\nACGT\n>query_2\nACGT\n>query_3\nACGT\n"
+
+BLAST = (
+    "query_1\t100\t95.000\t9606\tHomo sapiens\n"
+    "query_1\t120\t97.500\t10090\tMus musculus\n"
+    "query_1\t150\t96.000\t9606\tHomo sapiens\n"
+    "query_2\t80\t99.000\t9606\tHomo sapiens\n"
+    "query_3\t20\t100.000\t7227\tDrosophila melanogaster\n"
+)
+
+EXPECTED_TAXONOMY = (
+    ">query_1 [pident=97.5] [taxid=10090] [organism=Mus musculus]\nACGT\n"
+    ">query_2 [pident=99.0] [taxid=9606] [organism=Homo sapiens]\nACGT\n"
+    ">query_3 [pident=0.0] [taxid=N/A] [organism=N/A]\nACGT\n"
+)
+
+EXPECTED_BEST_HITS = (
+    "qseqid\tlength\tpident\tstaxids\tsscinames\n"
+    "query_1\t120\t97.500\t10090\tMus musculus\n"
+    "query_2\t80\t99.000\t9606\tHomo sapiens\n"
+)
+
+EXPECTED_ORGANISMS = "Nmatches\ttaxID\torganism\n1\t10090\tMus musculus\n1\t9606\tHomo sapiens\n"
+
+
+def write_inputs(tmp_path: Path) -> tuple[Path, Path]:
+    query_path = tmp_path / "query.fas"
+    blast_path = tmp_path / "blast.tsv"
+    query_path.write_text(QUERY)
+    blast_path.write_text(BLAST)
+    return query_path, blast_path
+
+
+def test_write_taxonomy_outputs(tmp_path: Path) -> None:
+    query_path, blast_path = write_inputs(tmp_path)
+
+    write_taxonomy_outputs(
+        blast_path=blast_path,
+        outfmt_columns=TAXO_OUTFMT_COLUMNS,
+        query_path=query_path,
+        output_path=tmp_path / "taxonomy.fas",
+        best_hits_report_path=tmp_path / "best_hits.tsv",
+        organism_report_path=tmp_path / "organisms.tsv",
+        min_length=50,
+    )
+
+    assert (tmp_path / "taxonomy.fas").read_text() == EXPECTED_TAXONOMY
+    assert (tmp_path / "best_hits.tsv").read_text() == EXPECTED_BEST_HITS
+    assert (tmp_path / "organisms.tsv").read_text() == EXPECTED_ORGANISMS
+
+
+def test_taxonomy_outputs_separately(tmp_path: Path) -> None:
+    query_path, blast_path = write_inputs(tmp_path)
+
+    assign_taxonomy(query_path, blast_path, tmp_path / "taxonomy.fas", min_length=50)
+    write_best_hits_report(blast_path, tmp_path / "best_hits.tsv", TAXO_OUTFMT_COLUMNS, min_length=50)
+    write_organism_report(blast_path, tmp_path / "organisms.tsv", TAXO_OUTFMT_COLUMNS, min_length=50)
+
+    assert (tmp_path / "taxonomy.fas").read_text() == EXPECTED_TAXONOMY
+    assert (tmp_path / "best_hits.tsv").read_text() == EXPECTED_BEST_HITS
+    assert (tmp_path / "organisms.tsv").read_text() == EXPECTED_ORGANISMS
+
+
+def test_taxo_fastq_query(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def fake_run_blast(**kwargs):
+        assert Path(kwargs["query_path"]).read_text() == ">query_1\nACGT\n>query_2\nACGT\n>query_3\nACGT\n"
+        Path(kwargs["output_path"]).write_text(BLAST)
+
+    monkeypatch.setattr(core, "run_blast", fake_run_blast)
+
+    query_path = tmp_path / "query.fastq"
+    query_path.write_text("".join(f"@query_{i}\nAC-GT\n+\nIIIII\n" for i in range(1, 4)))
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+    staging = StagingArea(work_dir)
+
+    execute_single(
+        work_dir=work_dir,
+        staging=staging,
+        input_query_path=query_path,
+        input_database_path=tmp_path / "database",
+        blast_output_path=tmp_path / "blast.tsv",
+        taxo_output_path=tmp_path / "taxonomy.fas",
+        best_hits_report_path=tmp_path / "best_hits.tsv",
+        organism_report_path=None,
+        blast_method="blastn",
+        blast_outfmt=6,
+        blast_outfmt_options=" ".join(TAXO_OUTFMT_COLUMNS),
+        blast_evalue=1e-5,
+        blast_num_threads=1,
+        blast_taxdb_path=None,
+        write_blast_headers=False,
+        match_pident=0,
+        match_length=50,
+        blast_use_cache=False,
+    )
+
+    assert (tmp_path / "taxonomy.fas").read_text() == EXPECTED_TAXONOMY.replace("ACGT", "AC-GT")
+    assert (tmp_path / "best_hits.tsv").read_text() == EXPECTED_BEST_HITS
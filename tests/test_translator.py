@@ -5,6 +5,7 @@ from typing import Literal, NamedTuple
 
 import pytest
 
+from itaxotools.blastax import translator
 from itaxotools.blastax.translator import Options, translate
 
 TEST_DATA_DIR = Path(__file__).parent / Path(__file__).stem
@@ -21,7 +22,7 @@ class TranslatorTest(NamedTuple):
     code: str | int
 
 
-    def validate(self, tmp_path: Path) -> None:
+    def validate(self, tmp_path: Path, num_workers: int = 1) -> None:
         input_path = TEST_DATA_DIR / self.input_filename
         output_expected = TEST_DATA_DIR / self.output_filename
         output_path = tmp_path / self.output_filename
@@ -49,6 +50,7 @@ class TranslatorTest(NamedTuple):
             input_type=self.input_type,
             frame=self.frame,
             code=self.code,
+            num_workers=num_workers,
         )
 
         translate(options)
@@ -92,3 +94,9 @@ translator_tests = [
 @pytest.mark.parametrize("test", translator_tests)
 def test_run_translator(test: TranslatorTest, tmp_path: Path) -> None:
     test.validate(tmp_path)
+
+
+@pytest.mark.parametrize("test", translator_tests)
+def test_run_translator_parallel(test: TranslatorTest, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(translator, "TRANSLATION_CHUNK_SIZE", 2)
+    test.validate(tmp_path, num_workers=2)